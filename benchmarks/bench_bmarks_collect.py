@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+bench_bmarks_collect.py
+
+Benchmark bookmark collection in recurdump.core.bmarks against the previous
+implementation on a synthetic places.sqlite.
+
+The previous path loaded all of moz_bookmarks into Python, recursed over it,
+and fetched bookmark rows through a single IN (?,?,...) list, using a fresh
+connection per step. The current path is one recursive CTE streamed from a
+shared connection.
+
+Optional arguments:
+  --depth        Folder nesting depth below the exported folder (default: 4)
+  --fanout       Subfolders per folder (default: 6)
+  --per-folder   Bookmarks per folder (default: 40)
+  --noise        Unrelated bookmarks elsewhere in the profile (default: 100000)
+  --repeat       Timed runs per implementation; the best is reported (default: 3)
+
+Example usage:
+  python benchmarks/bench_bmarks_collect.py --depth 5 --fanout 6 --per-folder 20
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'src'))
+
+from generators import EXPORT_FOLDER, make_places_db
+
+def legacy_collect(places_path, folder_id):
+    # Previous implementation, kept here verbatim as the baseline
+    conn = sqlite3.connect(places_path)
+    cur = conn.cursor()
+    cur.execute("SELECT id, parent, type FROM moz_bookmarks")
+    items = {row[0]: {'parent': row[1], 'type': row[2]} for row in cur.fetchall()}
+    children = {}
+    for item_id, item in items.items():
+        children.setdefault(item['parent'], []).append(item_id)
+    result = []
+
+    def recurse(fid):
+        for cid in children.get(fid, []):
+            if items[cid]['type'] == 1:
+                result.append(cid)
+            elif items[cid]['type'] == 2:
+                recurse(cid)
+    recurse(folder_id)
+    conn.close()
+    conn = sqlite3.connect(places_path)
+    cur = conn.cursor()
+    qmarks = ','.join('?' for _ in result)
+    cur.execute(f"""
+        SELECT b.id, b.title, p.url, b.dateAdded, b.lastModified, b.parent
+        FROM moz_bookmarks b
+        LEFT JOIN moz_places p ON b.fk = p.id
+        WHERE b.id IN ({qmarks}) AND b.type=1
+    """, result)
+    bookmarks = [{'id': r[0], 'title': r[1] or '', 'url': r[2] or '', 'dateAdded': r[3],
+                  'lastModified': r[4], 'parent': r[5]} for r in cur.fetchall()]
+    conn.close()
+    return len(bookmarks)
+
+def current_collect(bmarks, places_path, folder_id):
+    conn = sqlite3.connect(places_path)
+    try:
+        return sum(1 for _ in bmarks.iter_bookmarks_under_folder(conn, folder_id))
+    finally:
+        conn.close()
+
+def best_time(fn, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rdump bmarks bookmark collection on a synthetic places.sqlite")
+    parser.add_argument('--depth', type=int, default=4)
+    parser.add_argument('--fanout', type=int, default=6)
+    parser.add_argument('--per-folder', type=int, default=40)
+    parser.add_argument('--noise', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    from recurdump.core import bmarks
+    with tempfile.TemporaryDirectory(prefix='rdump-bench-') as tmp_dir:
+        places_path = os.path.join(tmp_dir, 'places.sqlite')
+        expected = make_places_db(places_path, args.depth, args.fanout, args.per_folder, args.noise)
+        conn = sqlite3.connect(places_path)
+        folder_id = bmarks.find_folders_by_name(bmarks.fetch_bookmark_folders(conn), EXPORT_FOLDER)[0]
+        conn.close()
+        print(f"Synthetic profile: {expected} bookmarks under '{EXPORT_FOLDER}', {args.noise} elsewhere")
+        try:
+            legacy_time, legacy_count = best_time(lambda: legacy_collect(places_path, folder_id), args.repeat)
+            print(f"  legacy  (dict recursion + IN list): {legacy_time * 1000:9.1f} ms  {legacy_count} bookmarks")
+        except sqlite3.OperationalError as e:
+            legacy_time = None
+            print(f"  legacy  (dict recursion + IN list): failed ({e})")
+        current_time, current_count = best_time(lambda: current_collect(bmarks, places_path, folder_id), args.repeat)
+        print(f"  current (recursive CTE, streamed):  {current_time * 1000:9.1f} ms  {current_count} bookmarks")
+        if current_count != expected:
+            print(f"Error: expected {expected} bookmarks, got {current_count}")
+            sys.exit(1)
+        if legacy_time:
+            print(f"  speedup: {legacy_time / current_time:.1f}x")
+
+if __name__ == "__main__":
+    main()
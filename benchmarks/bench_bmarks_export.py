@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+bench_bmarks_export.py
+
+Benchmark the streamed folder export of recurdump.core.bmarks against the
+previous implementation on a synthetic places.sqlite.
+
+The previous path built the whole nested tree in memory (build_export_tree)
+and wrote it with json.dump(..., indent=2). The streamed path writes each
+bookmark as it is read, as nested JSON or NDJSON, optionally compressed.
+Reported per variant: best wall time, bookmarks per second, peak Python
+memory (tracemalloc, measured in a separate run) and output size.
+
+Optional arguments:
+  --depth        Folder nesting depth below the exported folder (default: 4)
+  --fanout       Subfolders per folder (default: 6)
+  --per-folder   Bookmarks per folder (default: 40)
+  --repeat       Timed runs per variant; the best is reported (default: 3)
+
+Example usage:
+  python benchmarks/bench_bmarks_export.py --depth 5 --fanout 6 --per-folder 20
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'src'))
+
+from generators import EXPORT_FOLDER, make_places_db
+from recurdump.core import bmarks
+
+def legacy_export(conn, folders, folder_ids, dir_path, base_name):
+    # Previous implementation, kept here verbatim as the baseline
+    export_trees = []
+    for folder_id in folder_ids:
+        bookmarks = bmarks.iter_bookmarks_under_folder(conn, folder_id)
+        export_trees.append(bmarks.build_export_tree(folders, bookmarks, folder_id))
+    json_path = os.path.join(dir_path, base_name + '.json')
+    export_data = export_trees[0] if len(export_trees) == 1 else export_trees
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(export_data, f, indent=2, ensure_ascii=False)
+    return json_path
+
+def streamed_export(output_format, compress):
+    def export(conn, folders, folder_ids, dir_path, base_name):
+        bmarks.export_folder_json(conn, folders, folder_ids, dir_path, base_name, output_format, compress)
+        return os.path.join(dir_path, base_name + '.' + output_format + bmarks.COMPRESS_SUFFIXES.get(compress, ''))
+    return export
+
+VARIANTS = [
+    ('legacy json (indent=2)', legacy_export),
+    ('streamed json', streamed_export('json', None)),
+    ('streamed ndjson', streamed_export('ndjson', None)),
+    ('streamed ndjson.gz', streamed_export('ndjson', 'gzip')),
+    ('streamed ndjson.xz', streamed_export('ndjson', 'xz')),
+]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the streamed bookmark export against the in-memory tree")
+    parser.add_argument('--depth', type=int, default=4)
+    parser.add_argument('--fanout', type=int, default=6)
+    parser.add_argument('--per-folder', type=int, default=40)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    work = tempfile.mkdtemp(prefix='rdump-bench-export-')
+    # Exports print a line per run
+    stdout = sys.stdout
+    try:
+        places_path = os.path.join(work, 'places.sqlite')
+        count = make_places_db(places_path, args.depth, args.fanout, args.per_folder, noise=0)
+        conn = bmarks.open_live_places(places_path)
+        folders = bmarks.fetch_bookmark_folders(conn)
+        folder_ids = bmarks.find_folders_by_name(folders, EXPORT_FOLDER)
+        print(f"{count} bookmarks in {len(folders)} folders")
+        print(f"  {'variant':<24} {'time':>9} {'bookmarks/s':>12} {'peak mem':>10} {'size':>10}")
+        for name, export in VARIANTS:
+            best = None
+            with open(os.devnull, 'w') as devnull:
+                sys.stdout = devnull
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    out_path = export(conn, folders, folder_ids, work, 'export')
+                    elapsed = time.perf_counter() - start
+                    best = elapsed if best is None else min(best, elapsed)
+                tracemalloc.start()
+                export(conn, folders, folder_ids, work, 'export')
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                sys.stdout = stdout
+            size = os.path.getsize(out_path)
+            print(f"  {name:<24} {best:8.3f}s {count / best:12.0f} {peak / 2 ** 20:8.1f}MB {size / 2 ** 20:8.1f}MB")
+        conn.close()
+    finally:
+        sys.stdout = stdout
+        shutil.rmtree(work, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+bench_link_store.py
+
+Compare recurdump.core.links.LinkStore with a plain set of str on synthetic
+'<host>/<model>/video/<id>' links: memory held, build time, set operations
+and serialized size.
+
+Optional arguments:
+  --links      Links per side; the two sides overlap by half (default: 1000000)
+  --models     Distinct models in the generated links (default: 500)
+  --seed       Random seed (default: 1)
+
+Example usage:
+  python benchmarks/bench_link_store.py --links 2000000 --models 2000
+"""
+import argparse
+import os
+import pickle
+import random
+import sys
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'src'))
+
+from recurdump.core.links import LinkStore
+
+def make_links(count, models, rng):
+    suffixes = ['', '/play']
+    return [
+        f"https://www.recu.me/model{rng.randrange(models)}/video/{rng.randrange(10 ** 8)}{rng.choice(suffixes)}"
+        for _ in range(count)
+    ]
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+def traced(fn):
+    # Bytes still allocated by fn's result, measured with tracemalloc
+    tracemalloc.start()
+    result = fn()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LinkStore against a set of str")
+    parser.add_argument('--links', type=int, default=1000000)
+    parser.add_argument('--models', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    half = args.links // 2
+    left = make_links(args.links, args.models, rng)
+    right = left[half:] + make_links(half, args.models, rng)
+    print(f"{args.links} links per side, {args.models} models")
+    # Memory: each side generates its own strings, as if read from a file; the
+    # temporary list is freed before the measurement
+    set_bytes, _ = traced(lambda: set(make_links(args.links, args.models, random.Random(args.seed))))
+    store_bytes, _ = traced(lambda: LinkStore(make_links(args.links, args.models, random.Random(args.seed))))
+    print(f"  memory     set: {set_bytes / 2 ** 20:8.1f} MB   store: {store_bytes / 2 ** 20:8.1f} MB")
+    set_build, set_left = timed(lambda: set(left))
+    store_build, store_left = timed(lambda: LinkStore(left))
+    print(f"  build      set: {set_build:8.2f} s    store: {store_build:8.2f} s")
+    set_right, store_right = set(right), LinkStore(right)
+    for name, op in (('union', '__or__'), ('difference', '__sub__'), ('intersection', '__and__')):
+        set_time, set_result = timed(lambda: getattr(set_left, op)(set_right))
+        store_time, store_result = timed(lambda: getattr(store_left, op)(store_right))
+        if len(set_result) != len(store_result):
+            print(f"Error: {name} gave {len(store_result)} links, expected {len(set_result)}")
+            sys.exit(1)
+        print(f"  {name:<10} set: {set_time:8.2f} s    store: {store_time:8.2f} s   ({len(store_result)} links)")
+    set_blob = len(pickle.dumps(list(set_left)))
+    store_blob = len(store_left.dumps())
+    print(f"  serialized set: {set_blob / 2 ** 20:8.1f} MB   store: {store_blob / 2 ** 20:8.1f} MB")
+
+if __name__ == "__main__":
+    main()
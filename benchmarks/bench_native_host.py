@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+bench_native_host.py
+
+Stub extension for the native-messaging host: starts scripts/rdump-native-host.py
+against a temporary history store, sends synthetic extraction results in
+batches over the length-prefixed stdio protocol, checks every reply and the
+resulting store, and reports the throughput.
+
+Optional arguments:
+  --records    Records to send (default: 20000)
+  --batch      Records per 'records' message (default: 25, as the extension sends)
+  --model      Model name for the session (default: 'stub_model')
+
+Example usage:
+  python benchmarks/bench_native_host.py --records 100000 --batch 100
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'src'))
+
+from recurdump.core.ingest import iter_catalog, open_history_store
+from recurdump.core.native_host import read_message, write_message
+
+HOST = os.path.join(REPO_ROOT, 'scripts', 'rdump-native-host.py')
+
+def make_batches(model, count, batch_size):
+    now = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+    batch = []
+    for i in range(count):
+        batch.append({'url': f'https://www.recu.me/{model}/video/{i + 1}/play', 'filename': f'{model}_{i + 1}.mp4', 'extractedAt': now})
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def expect(reply, kind, context):
+    if not reply or reply.get('type') != kind:
+        print(f"Error: expected '{kind}' reply to {context}, got {reply}")
+        sys.exit(1)
+    return reply
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub extension for the rdump native-messaging host")
+    parser.add_argument('--records', type=int, default=20000)
+    parser.add_argument('--batch', type=int, default=25)
+    parser.add_argument('--model', default='stub_model')
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory(prefix='rdump-native-') as tmp_dir:
+        store_path = os.path.join(tmp_dir, 'history.sqlite')
+        # Firefox passes the manifest path and extension ID; the host must ignore them
+        host = subprocess.Popen([sys.executable, HOST, '--store', store_path, '/path/to/manifest.json', 'recurtrack@recurdump'],
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        write_message(host.stdin, {'type': 'hello'})
+        hello = expect(read_message(host.stdout), 'hello', 'hello')
+        print(f"Host {hello['version']} writing to {hello['store']}")
+        started_at = datetime.now(timezone.utc).isoformat()
+        start = time.perf_counter()
+        message_id = 0
+        for batch in make_batches(args.model, args.records, args.batch):
+            message_id += 1
+            write_message(host.stdin, {'type': 'records', 'id': message_id, 'session': 'stub-1', 'model': args.model,
+                                       'startedAt': started_at, 'records': batch})
+            ack = expect(read_message(host.stdout), 'ack', f"records message {message_id}")
+            if ack['id'] != message_id or ack['stored'] != len(batch):
+                print(f"Error: unexpected ack {ack}")
+                sys.exit(1)
+        message_id += 1
+        write_message(host.stdin, {'type': 'end', 'id': message_id, 'session': 'stub-1'})
+        total = expect(read_message(host.stdout), 'ack', 'end')['total']
+        elapsed = time.perf_counter() - start
+        write_message(host.stdin, {'type': 'bogus', 'id': 0})
+        expect(read_message(host.stdout), 'error', 'an unknown message')
+        host.stdin.close()
+        host.wait(timeout=10)
+        conn = open_history_store(store_path)
+        stored = sum(1 for _ in iter_catalog(conn, args.model))
+        conn.close()
+        print(f"  {args.records} records in {message_id - 1} messages: {elapsed:.2f} s ({args.records / elapsed:,.0f} records/s)")
+        print(f"  session total acknowledged: {total}, catalog rows in store: {stored}")
+        if stored != args.records or total != args.records or host.returncode != 0:
+            print("Error: store does not match what was sent")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
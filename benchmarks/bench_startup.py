@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+bench_startup.py
+
+Measure the startup time of the rdump command line. Each command is run in a
+fresh interpreter and the best of several runs is reported, next to a bare
+'python -c pass' for reference.
+
+Optional arguments:
+  --repeat       Runs per command; the best is reported (default: 10)
+  --budget-ms    Fail when 'rdump --help' takes longer than this (default: 50)
+
+Example usage:
+  python benchmarks/bench_startup.py --repeat 20
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RDUMP = os.path.join(REPO_ROOT, 'rdump')
+SCRIPTS = os.path.join(REPO_ROOT, 'scripts')
+
+CASES = [
+    ('python -c pass', [sys.executable, '-c', 'pass']),
+    ('rdump --help', [sys.executable, RDUMP, '--help']),
+    ('rdump --version', [sys.executable, RDUMP, '--version']),
+    ('rdump sync --help', [sys.executable, RDUMP, 'sync', '--help']),
+    ('rdump bmarks --help', [sys.executable, RDUMP, 'bmarks', '--help']),
+    ('rdump merge --help', [sys.executable, RDUMP, 'merge', '--help']),
+    ('scripts/rdump-sync.py --help', [sys.executable, os.path.join(SCRIPTS, 'rdump-sync.py'), '--help']),
+]
+
+def best_time(cmd, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rdump startup time")
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--budget-ms', type=float, default=50.0)
+    args = parser.parse_args()
+    results = {}
+    for label, cmd in CASES:
+        results[label] = best_time(cmd, args.repeat) * 1000
+        print(f"  {label:<30} {results[label]:8.1f} ms")
+    help_ms = results['rdump --help']
+    print(f"  rdump --help overhead over bare interpreter: {help_ms - results['python -c pass']:.1f} ms")
+    if help_ms > args.budget_ms:
+        print(f"Error: 'rdump --help' took {help_ms:.1f} ms, budget is {args.budget_ms:.0f} ms")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+bench_suite.py
+
+Time the phases of every rdump tool on deterministic synthetic data (see
+generators.py) at one or more scales, compare them with the JSON baselines in
+benchmarks/baselines/ and fail when a phase got slower than allowed.
+
+  bmarks   places.sqlite with nested folders: open, snapshot, folder list,
+           collect, JSON export, link comparison
+  sync     one export of N rows against a sparse fake video directory:
+           cold and indexed directory scans, filter, export, sorted export
+  merge    tree of CSV files with N rows in total: cold and cached merge
+  ingest   export history with N rows in total: cold ingest, rerun, catalog
+
+Scales: 10k, 1m and 10m items. Data is generated in a temporary directory and
+the tools' caches and history store are redirected there
+(RECURDUMP_CACHE_DIR, RECURDUMP_DATA_DIR).
+
+Optional arguments:
+  --scale          Comma-separated scales (default: 10k)
+  --tools          Comma-separated tools (default: bmarks,sync,merge,ingest)
+  --repeat         Timed runs per phase; the best is kept (default: 5 at 10k, else 1)
+  --threshold      Allowed slowdown against the baseline, as a fraction (default: 0.25)
+  --min-delta      Slowdowns below this many seconds never fail (default: 0.05)
+  --max-video-files  Cap on fake video files for sync (default: 200000)
+  --save-baseline  Write the results as the new baseline instead of comparing
+  --output         Also write this run's results to a JSON file
+
+Baselines depend on the machine; record one with --save-baseline before
+comparing changes on a new machine. A scale without a baseline, or a phase
+the baseline and the run do not both have, fails the gate too: only 10k and
+1m baselines are committed, so a 10m run needs --save-baseline first.
+
+Example usage:
+  python benchmarks/bench_suite.py --scale 10k,1m
+  python benchmarks/bench_suite.py --scale 1m --tools merge --save-baseline
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, os.path.join(REPO_ROOT, 'src'))
+
+import generators
+
+BASELINE_DIR = os.path.join(BENCH_DIR, 'baselines')
+SCALES = {'10k': 10_000, '1m': 1_000_000, '10m': 10_000_000}
+TOOLS = ('bmarks', 'sync', 'merge', 'ingest')
+# Folder tree of the synthetic places.sqlite: 1555 folders
+BMARKS_DEPTH = 4
+BMARKS_FANOUT = 6
+
+def best_time(fn, repeat, setup=None):
+    # Best of 'repeat' runs of fn (tool output is discarded); setup runs untimed before each
+    best = None
+    result = None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = fn()
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def reset_dir(path):
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+
+def settle_mtime(path):
+    # Backdate a directory so the sync index trusts its mtime at once
+    past = time.time() - 60
+    os.utime(path, (past, past))
+
+def bench_bmarks(work, items, repeat):
+    from recurdump.core import bmarks
+    setup = {}
+    results = {}
+    places_path = os.path.join(work, 'places.sqlite')
+    per_folder = max(1, items // generators.folder_count(BMARKS_DEPTH, BMARKS_FANOUT))
+    start = time.perf_counter()
+    expected = generators.make_places_db(places_path, BMARKS_DEPTH, BMARKS_FANOUT, per_folder, noise=items // 10)
+    setup['bmarks.generate'] = time.perf_counter() - start
+    cache_dir = os.environ['RECURDUMP_CACHE_DIR']
+
+    results['bmarks.open'], conn = best_time(lambda: bmarks.open_live_places(places_path), 1)
+    conn.close()
+    results['bmarks.snapshot'], _ = best_time(
+        lambda: bmarks.open_cached_snapshot(places_path, cache_dir)[0].close(), repeat, setup=lambda: reset_dir(cache_dir))
+    conn = bmarks.open_live_places(places_path)
+    try:
+        results['bmarks.folders'], folders = best_time(lambda: bmarks.fetch_bookmark_folders(conn), repeat)
+        folder_ids = bmarks.find_folders_by_name(folders, generators.EXPORT_FOLDER)
+        results['bmarks.collect'], count = best_time(
+            lambda: sum(1 for _ in bmarks.iter_bookmarks_under_folder(conn, folder_ids[0])), repeat)
+        if count != expected:
+            raise RuntimeError(f"bmarks collected {count} bookmarks, expected {expected}")
+        out_dir = os.path.join(work, 'bmarks-out')
+        os.makedirs(out_dir)
+        results['bmarks.export_json'], _ = best_time(
+            lambda: bmarks.export_folder_json(conn, folders, folder_ids, out_dir, 'export'), repeat)
+        # Half of the input links are bookmarked, half are not
+        links_path = os.path.join(work, 'links.txt')
+        with open(links_path, 'w', encoding='utf-8') as f:
+            for i, bookmark in enumerate(bmarks.iter_bookmarks_under_folder(conn, folder_ids[0])):
+                f.write((bookmark['url'] if i % 2 else bookmark['url'].replace('/play', '/new')) + '\n')
+
+        def compare():
+            # compare_links leaves its temp tables behind, so each run gets its own connection
+            compare_conn = bmarks.open_live_places(places_path)
+            try:
+                bmarks.compare_links(compare_conn, folder_ids, links_path, out_dir, 'compare')
+            finally:
+                compare_conn.close()
+
+        results['bmarks.compare'], _ = best_time(compare, repeat)
+    finally:
+        conn.close()
+    return setup, results
+
+def bench_sync(work, items, repeat, max_video_files):
+    from recurdump.core import sync
+    setup = {}
+    results = {}
+    model = generators.model_name(0)
+    video_ids = range(generators.VIDEO_ID_BASE, generators.VIDEO_ID_BASE + items)
+    db_path = os.path.join(work, generators.export_filename(model, generators.BASE_TIME))
+    video_dir = os.path.join(work, 'videos')
+    start = time.perf_counter()
+    generators.write_export_csv(db_path, model, video_ids, generators.BASE_TIME)
+    # Sparse: every other video is downloaded, up to the cap
+    present = video_ids[::2][:max_video_files]
+    generators.make_video_dir(video_dir, model, present)
+    settle_mtime(video_dir)
+    setup['sync.generate'] = time.perf_counter() - start
+
+    results['sync.scan_cold'], files = best_time(lambda: sync.load_present_files(video_dir, reindex=True), repeat)
+    if len(files) != len(present):
+        raise RuntimeError(f"sync found {len(files)} files, expected {len(present)}")
+    results['sync.scan_indexed'], _ = best_time(lambda: sync.load_present_files(video_dir), repeat)
+    results['sync.filter'], missing = best_time(
+        lambda: sum(1 for _ in sync.filter_missing_files(sync.iter_csv_database(db_path), files)), repeat)
+    if missing != items - len(present):
+        raise RuntimeError(f"sync found {missing} missing rows, expected {items - len(present)}")
+    out_path = os.path.join(work, 'need.csv')
+    results['sync.export'], _ = best_time(lambda: sync.sync_database(db_path, video_dir, out_path), repeat)
+    results['sync.export_sorted'], _ = best_time(
+        lambda: sync.sync_database(db_path, video_dir, out_path, sort_col='Filename'), repeat)
+    return setup, results
+
+def bench_merge(work, items, repeat):
+    from recurdump.core import merge
+    setup = {}
+    results = {}
+    tree = os.path.join(work, 'csv-tree')
+    start = time.perf_counter()
+    _, distinct = generators.make_csv_tree(tree, items)
+    setup['merge.generate'] = time.perf_counter() - start
+    cache_path = os.path.join(os.environ['RECURDUMP_CACHE_DIR'], merge.CACHE_FILENAME)
+    out_path = os.path.join(work, 'merged.txt')
+
+    def drop_cache():
+        for suffix in ('', '-wal', '-shm'):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(cache_path + suffix)
+
+    results['merge.cold'], count = best_time(lambda: merge.merge_models(tree, out_path), repeat, setup=drop_cache)
+    if count != distinct:
+        raise RuntimeError(f"merge wrote {count} links, expected {distinct}")
+    results['merge.cached'], _ = best_time(lambda: merge.merge_models(tree, out_path), repeat)
+    results['merge.cached_sorted'], _ = best_time(lambda: merge.merge_models(tree, out_path, sort_links=True), repeat)
+    return setup, results
+
+def bench_ingest(work, items, repeat):
+    from recurdump.core import ingest
+    setup = {}
+    results = {}
+    exports = os.path.join(work, 'exports')
+    start = time.perf_counter()
+    generators.make_export_history(exports, items)
+    setup['ingest.generate'] = time.perf_counter() - start
+    store_path = os.path.join(work, 'history.sqlite')
+
+    def drop_store():
+        for suffix in ('', '-wal', '-shm'):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(store_path + suffix)
+
+    results['ingest.cold'], _ = best_time(lambda: ingest.ingest_exports([exports], store_path), repeat, setup=drop_store)
+    results['ingest.rerun'], _ = best_time(lambda: ingest.ingest_exports([exports], store_path), repeat)
+    conn = ingest.open_history_store(store_path)
+    try:
+        model = generators.model_name(0)
+        results['ingest.catalog'], _ = best_time(lambda: sum(1 for _ in ingest.iter_catalog(conn, model)), repeat)
+        as_of = (generators.BASE_TIME.date().replace(month=3)).isoformat()
+        results['ingest.catalog_as_of'], _ = best_time(
+            lambda: sum(1 for _ in ingest.iter_catalog(conn, model, ingest.parse_time(as_of, end_of_day=True))), repeat)
+    finally:
+        conn.close()
+    return setup, results
+
+def machine_info():
+    return {
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+def run_scale(scale, tools, repeat, max_video_files):
+    items = SCALES[scale]
+    setup = {}
+    results = {}
+    with tempfile.TemporaryDirectory(prefix=f'rdump-suite-{scale}-') as tmp_dir:
+        os.environ['RECURDUMP_CACHE_DIR'] = os.path.join(tmp_dir, 'cache')
+        os.environ['RECURDUMP_DATA_DIR'] = os.path.join(tmp_dir, 'data')
+        for tool in tools:
+            work = os.path.join(tmp_dir, tool)
+            os.makedirs(work)
+            print(f"[{scale}] {tool}...", flush=True)
+            if tool == 'bmarks':
+                tool_setup, tool_results = bench_bmarks(work, items, repeat)
+            elif tool == 'sync':
+                tool_setup, tool_results = bench_sync(work, items, repeat, max_video_files)
+            elif tool == 'merge':
+                tool_setup, tool_results = bench_merge(work, items, repeat)
+            else:
+                tool_setup, tool_results = bench_ingest(work, items, repeat)
+            setup.update(tool_setup)
+            results.update(tool_results)
+            # Free the disk space of large scales before the next tool
+            shutil.rmtree(work, ignore_errors=True)
+    return {
+        'scale': scale,
+        'items': items,
+        'repeat': repeat,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'machine': machine_info(),
+        'setup': setup,
+        'results': results,
+    }
+
+def baseline_path(scale):
+    return os.path.join(BASELINE_DIR, f'{scale}.json')
+
+def load_baseline(scale):
+    try:
+        with open(baseline_path(scale), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def compare(run, baseline, threshold, min_delta, tools):
+    # Prints one line per phase; returns the phases that regressed or that
+    # only one of the run and the baseline has (for the tools run)
+    regressions = []
+    old = baseline['results'] if baseline else {}
+    for name, seconds in run['results'].items():
+        line = f"  {name:<22} {seconds * 1000:10.1f} ms"
+        if name in old:
+            change = seconds / old[name] - 1 if old[name] else 0.0
+            line += f"   baseline {old[name] * 1000:10.1f} ms  {change:+7.1%}"
+            if change > threshold and seconds - old[name] > min_delta:
+                line += "  REGRESSION"
+                regressions.append(name)
+        elif baseline:
+            line += "   not in the baseline"
+            regressions.append(name)
+        print(line)
+    for name in sorted(old):
+        if name not in run['results'] and name.split('.')[0] in tools:
+            print(f"  {name:<22} {'missing':>13}   baseline {old[name] * 1000:10.1f} ms")
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark suite for the rdump tools with JSON baselines")
+    parser.add_argument('--scale', default='10k')
+    parser.add_argument('--tools', default=','.join(TOOLS))
+    parser.add_argument('--repeat', type=int, default=None)
+    parser.add_argument('--threshold', type=float, default=0.25)
+    parser.add_argument('--min-delta', type=float, default=0.05)
+    parser.add_argument('--max-video-files', type=int, default=200000)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+    scales = [s.strip().lower() for s in args.scale.split(',') if s.strip()]
+    tools = [t.strip() for t in args.tools.split(',') if t.strip()]
+    for scale in scales:
+        if scale not in SCALES:
+            parser.error(f"unknown scale '{scale}' (choose from {', '.join(SCALES)})")
+    for tool in tools:
+        if tool not in TOOLS:
+            parser.error(f"unknown tool '{tool}' (choose from {', '.join(TOOLS)})")
+
+    runs = []
+    failed = []
+    for scale in scales:
+        repeat = args.repeat or (5 if SCALES[scale] <= 10_000 else 1)
+        run = run_scale(scale, tools, repeat, args.max_video_files)
+        runs.append(run)
+        baseline = load_baseline(scale)
+        print(f"Scale {scale} ({run['items']} items), best of {repeat}:")
+        if baseline and baseline['machine'] != run['machine']:
+            print(f"  Note: baseline was recorded on {baseline['machine']}")
+        regressions = compare(run, None if args.save_baseline else baseline, args.threshold, args.min_delta, tools)
+        if args.save_baseline:
+            # Keep phases of tools not run this time
+            if baseline:
+                run = dict(run, results={**baseline['results'], **run['results']}, setup={**baseline.get('setup', {}), **run['setup']})
+            os.makedirs(BASELINE_DIR, exist_ok=True)
+            with open(baseline_path(scale), 'w', encoding='utf-8') as f:
+                json.dump(run, f, indent=2, sort_keys=True)
+                f.write('\n')
+            print(f"  Baseline written: {os.path.relpath(baseline_path(scale), REPO_ROOT)}")
+        elif baseline is None:
+            print(f"  No baseline for {scale}; record one with --save-baseline")
+            regressions.append('baseline')
+        failed += [f"{scale}:{name}" for name in regressions]
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(runs if len(runs) > 1 else runs[0], f, indent=2, sort_keys=True)
+            f.write('\n')
+    if failed:
+        print(f"Error: {len(failed)} phase(s) slower than the baseline by more than {args.threshold:.0%}, "
+              f"or without a baseline to compare with: {', '.join(failed)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+bench_tab_pool.py
+
+Throughput of the extension's filename extraction against the number of worker
+tabs. A local HTTP server stands in for the video pages: each page answers
+after a random latency, and a share of them first shows a CloudFlare
+"Just a moment..." page that clears after a while. Worker threads play the
+tabs: they pull links from a shared queue, load the page, wait for a challenge
+to clear (at most --cloudflare-waits at a time) and read the filename from the
+meta description the way content.js does.
+
+Two wait strategies are compared:
+  fixed   sleep --fixed-delay seconds after every navigation (the old behaviour)
+  ready   continue as soon as the page has loaded (PAGE_READY / tab 'complete')
+
+All server latencies and sleeps are multiplied by --time-scale so a run takes
+seconds; the reported rates are converted back to real time.
+
+Optional arguments:
+  --links             Video links to extract (default: 200)
+  --concurrency       Comma-separated worker tab counts (default: 1,2,4,8)
+  --latency-ms        Median page latency in milliseconds (default: 400)
+  --fixed-delay       Sleep after each navigation in 'fixed' mode, seconds (default: 3)
+  --challenge-rate    Share of pages that show a CloudFlare challenge first (default: 0.02)
+  --challenge-seconds Time until a challenge clears, seconds (default: 8)
+  --cloudflare-waits  Concurrent challenge waits allowed (default: 1)
+  --time-scale        Factor applied to every latency and sleep (default: 0.05)
+  --seed              Random seed (default: 1)
+
+Example usage:
+  python benchmarks/bench_tab_pool.py --links 500 --concurrency 1,3,6
+"""
+import argparse
+import math
+import queue
+import random
+import re
+import sys
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MODEL = 'stub_model'
+# Same pattern as extractFilename() in content.js
+META_PATTERN = re.compile(r'(.*?) show from.* on (\d{4}-\d{2}-\d{2}) (\d{2}):(\d{2})')
+META_TAG = re.compile(r'<meta name="description" content="([^"]*)"')
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, args):
+        super().__init__(('127.0.0.1', 0), StandInHandler)
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.lock = threading.Lock()
+        self.challenged = {}    # video id -> time the challenge started
+
+    def page_latency(self):
+        # Log-normal around the median, as real page loads have a long tail
+        with self.lock:
+            factor = self.rng.lognormvariate(0, 0.5)
+        return self.args.latency_ms / 1000 * factor * self.args.time_scale
+
+    def has_challenge(self, video_id):
+        # Decided once per page; a challenge clears --challenge-seconds after the first visit
+        with self.lock:
+            if video_id not in self.challenged:
+                chance = random.Random(self.args.seed * 1000003 + video_id).random()
+                self.challenged[video_id] = time.monotonic() if chance < self.args.challenge_rate else None
+            started = self.challenged[video_id]
+        if started is None:
+            return False
+        return time.monotonic() - started < self.args.challenge_seconds * self.args.time_scale
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def send_page(self, body):
+        data = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        match = re.fullmatch(rf'/{MODEL}/video/(\d+)/play', self.path)
+        if not match:
+            self.send_error(404)
+            return
+        video_id = int(match.group(1))
+        time.sleep(self.server.page_latency())
+        if self.server.has_challenge(video_id):
+            self.send_page('<html><head><title>Just a moment...</title></head><body><div id="cf-wrapper"></div></body></html>')
+            return
+        day = 1 + video_id % 28
+        description = f"{MODEL} show from Stub on 2025-07-{day:02d} {video_id % 24:02d}:{video_id % 60:02d}"
+        self.send_page(f'<html><head><meta name="description" content="{description}"><title>{video_id}</title></head><body></body></html>')
+
+def load_page(url):
+    with urllib.request.urlopen(url, timeout=60) as response:
+        return response.read().decode('utf-8')
+
+def extract_filename(html):
+    meta = META_TAG.search(html)
+    if not meta:
+        return None
+    match = META_PATTERN.match(meta.group(1))
+    if not match:
+        return None
+    username, date, hour, minute = match.groups()
+    return f"{username}_{date}_{hour}-{minute}.mp4"
+
+def run_pool(links, concurrency, strategy, args):
+    # Returns (seconds, filenames, challenges waited on)
+    pending = queue.Queue()
+    for index, link in enumerate(links):
+        pending.put((index, link))
+    results = [None] * len(links)
+    cloudflare_slots = threading.BoundedSemaphore(args.cloudflare_waits)
+    challenges = []
+    fixed_delay = args.fixed_delay * args.time_scale
+    poll = 2 * args.time_scale
+
+    def worker():
+        while True:
+            try:
+                index, link = pending.get_nowait()
+            except queue.Empty:
+                return
+            html = load_page(link)
+            if strategy == 'fixed':
+                time.sleep(fixed_delay)
+            if 'Just a moment...' in html:
+                challenges.append(link)
+                with cloudflare_slots:
+                    while 'Just a moment...' in html:
+                        time.sleep(poll)
+                        html = load_page(link)
+            results[index] = extract_filename(html)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, results, len(challenges)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark filename extraction throughput against worker tab count")
+    parser.add_argument('--links', type=int, default=200)
+    parser.add_argument('--concurrency', default='1,2,4,8')
+    parser.add_argument('--latency-ms', type=float, default=400)
+    parser.add_argument('--fixed-delay', type=float, default=3)
+    parser.add_argument('--challenge-rate', type=float, default=0.02)
+    parser.add_argument('--challenge-seconds', type=float, default=8)
+    parser.add_argument('--cloudflare-waits', type=int, default=1)
+    parser.add_argument('--time-scale', type=float, default=0.05)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    counts = [int(value) for value in args.concurrency.split(',') if value.strip()]
+    server = StandInServer(args)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    links = [f"{base}/{MODEL}/video/{video_id}/play" for video_id in range(1, args.links + 1)]
+    print(f"{args.links} links, median latency {args.latency_ms:.0f} ms, "
+          f"{args.challenge_rate:.0%} CloudFlare pages, time scale {args.time_scale}")
+    baseline = None
+    try:
+        for strategy in ('fixed', 'ready'):
+            for concurrency in counts:
+                # Challenges restart for every run
+                server.challenged.clear()
+                elapsed, results, challenges = run_pool(links, concurrency, strategy, args)
+                missing = sum(1 for filename in results if not filename)
+                if missing:
+                    print(f"Error: {missing} pages gave no filename")
+                    sys.exit(1)
+                real = elapsed / args.time_scale
+                rate = args.links / real * 60
+                baseline = baseline or rate
+                estimate = 2000 / rate
+                print(f"  {strategy:<5} {concurrency:>2} tab(s): {rate:8.1f} links/min  "
+                      f"{rate / baseline:6.1f}x  ({challenges} challenges, 2000 links in ~{math.ceil(estimate)} min)")
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+bench_walker.py
+
+Time recurdump.utils.walker.walk_files() on a generated local directory tree
+with network latency injected into every directory listing and every stat, as
+on an NFS/SMB-mounted video library. One thread is the serial walk; the other
+thread counts show how much of the latency the parallel walk hides.
+
+Optional arguments:
+  --models         Model folders in the tree (default: 50)
+  --subfolders     Subfolders per model folder (default: 4)
+  --files          Files per subfolder (default: 20)
+  --list-latency   Milliseconds added to every directory listing (default: 5)
+  --stat-latency   Milliseconds added to every stat (default: 0.5)
+  --threads        Comma-separated thread counts to compare (default: 1,2,4,8,16,32)
+  --repeat         Runs per setting; the best is reported (default: 1)
+
+Example usage:
+  python benchmarks/bench_walker.py --list-latency 10 --threads 1,16,64
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'src'))
+
+from recurdump.utils.walker import walk_files
+
+def make_tree(root, models, subfolders, files):
+    for model in range(models):
+        for sub in range(subfolders):
+            path = os.path.join(root, f"model{model}", f"{2020 + sub}")
+            os.makedirs(path)
+            for i in range(files):
+                open(os.path.join(path, f"model{model}_{2020 + sub}-01-01_{i:04d}.mp4"), 'wb').close()
+    return models * subfolders * files
+
+class SlowEntry:
+    # os.DirEntry whose stat() waits like a network file system
+    def __init__(self, entry, latency):
+        self.entry = entry
+        self.latency = latency
+        self.name = entry.name
+        self.path = entry.path
+
+    def is_dir(self, follow_symlinks=True):
+        return self.entry.is_dir(follow_symlinks=follow_symlinks)
+
+    def is_file(self, follow_symlinks=True):
+        return self.entry.is_file(follow_symlinks=follow_symlinks)
+
+    def stat(self, follow_symlinks=True):
+        time.sleep(self.latency)
+        return self.entry.stat(follow_symlinks=follow_symlinks)
+
+class SlowListing:
+    def __init__(self, entries):
+        self.entries = entries
+
+    def __enter__(self):
+        return iter(self.entries)
+
+    def __exit__(self, *exc):
+        return False
+
+    def __iter__(self):
+        return iter(self.entries)
+
+def slow_scandir(real_scandir, list_latency, stat_latency):
+    def scandir(path='.'):
+        time.sleep(list_latency)
+        with real_scandir(path) as entries:
+            return SlowListing([SlowEntry(entry, stat_latency) for entry in entries])
+    return scandir
+
+def best_time(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the parallel directory walker with injected latency")
+    parser.add_argument('--models', type=int, default=50)
+    parser.add_argument('--subfolders', type=int, default=4)
+    parser.add_argument('--files', type=int, default=20)
+    parser.add_argument('--list-latency', type=float, default=5.0)
+    parser.add_argument('--stat-latency', type=float, default=0.5)
+    parser.add_argument('--threads', default='1,2,4,8,16,32')
+    parser.add_argument('--repeat', type=int, default=1)
+    args = parser.parse_args()
+    thread_counts = [int(value) for value in args.threads.split(',')]
+    root = tempfile.mkdtemp(prefix='rdump-bench-walker-')
+    real_scandir = os.scandir
+    try:
+        total = make_tree(root, args.models, args.subfolders, args.files)
+        directories = 1 + args.models * (1 + args.subfolders)
+        print(f"{total} files in {directories} directories; latency {args.list_latency} ms per listing, "
+              f"{args.stat_latency} ms per stat")
+        os.scandir = slow_scandir(real_scandir, args.list_latency / 1000, args.stat_latency / 1000)
+        for with_stat in (False, True):
+            print(f"  {'with stat' if with_stat else 'names only'}:")
+            serial = None
+            for threads in thread_counts:
+                elapsed, count = best_time(
+                    lambda: sum(1 for _ in walk_files([root], threads=threads, with_stat=with_stat)), args.repeat)
+                if count != total:
+                    print(f"Error: walked {count} files, expected {total}")
+                    sys.exit(1)
+                serial = serial or elapsed
+                print(f"    {threads:>3} threads: {elapsed:7.3f} s  ({serial / elapsed:5.1f}x)")
+    finally:
+        os.scandir = real_scandir
+        shutil.rmtree(root, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
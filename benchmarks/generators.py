@@ -0,0 +1,177 @@
+"""
+generators.py
+
+Deterministic synthetic data for the benchmarks. The same arguments (and
+seed) always produce the same files, so timings of two runs are comparable.
+
+  make_places_db      places.sqlite with the moz_bookmarks/moz_places schema
+  write_export_csv    RecurTrack filename database export (URL, Filename, Extracted At)
+  make_export_history Exports of several models taken at different dates
+  make_csv_tree       Tree of CSV files with a 'reurb_link' column, for rdump merge
+  make_video_dir      Directory of sparse fake video files named like the exports
+"""
+import csv
+import os
+import random
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+EXPORT_FOLDER = 'RECURBATE'
+BASE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+VIDEO_ID_BASE = 10_000_000
+
+def model_name(index):
+    return f"model{index:04d}"
+
+def video_url(model, video_id):
+    return f"https://www.recu.me/{model}/video/{video_id}/play"
+
+def video_filename(model, video_id):
+    # Like extractFilename() in the extension (<user>_<date>_<hh>-<mm>.mp4), plus
+    # the video ID so that every name is unique
+    when = BASE_TIME + timedelta(minutes=video_id % 1_000_000 * 7)
+    return f"{model}_{when:%Y-%m-%d_%H-%M}_{video_id}.mp4"
+
+def make_places_db(path, depth, fanout, per_folder, noise, batch=50000):
+    # Minimal moz_bookmarks/moz_places schema with the indexes Firefox ships.
+    # The export folder has 'depth' levels of 'fanout' subfolders with
+    # 'per_folder' bookmarks each; 'noise' bookmarks live elsewhere. Returns
+    # the number of bookmarks under the export folder.
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        PRAGMA journal_mode=OFF;
+        PRAGMA synchronous=OFF;
+        CREATE TABLE moz_places (id INTEGER PRIMARY KEY, url LONGVARCHAR, title LONGVARCHAR, url_hash INTEGER DEFAULT 0 NOT NULL);
+        CREATE TABLE moz_bookmarks (id INTEGER PRIMARY KEY, type INTEGER, fk INTEGER DEFAULT NULL, parent INTEGER,
+                                    position INTEGER, title LONGVARCHAR, dateAdded INTEGER, lastModified INTEGER);
+        CREATE INDEX moz_bookmarks_itemindex ON moz_bookmarks (fk, type);
+        CREATE INDEX moz_bookmarks_parentindex ON moz_bookmarks (parent, position);
+    """)
+    state = {'next_id': 1, 'bookmarks': 0}
+    places = []
+    items = []
+
+    def flush():
+        conn.executemany("INSERT INTO moz_places (id, url, title) VALUES (?, ?, ?)", places)
+        conn.executemany(
+            "INSERT INTO moz_bookmarks (id, type, fk, parent, position, title, dateAdded, lastModified) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            items)
+        places.clear()
+        items.clear()
+
+    def add_item(item_type, parent, position, title, url=None):
+        item_id = state['next_id']
+        state['next_id'] += 1
+        fk = None
+        if url is not None:
+            places.append((item_id, url, title))
+            fk = item_id
+            state['bookmarks'] += 1
+        items.append((item_id, item_type, fk, parent, position, title, item_id * 1000, item_id * 1000))
+        if len(items) >= batch:
+            flush()
+        return item_id
+
+    root = add_item(2, 0, 0, '')
+    menu = add_item(2, root, 0, 'menu')
+    other = add_item(2, root, 1, 'unfiled')
+    for i in range(noise):
+        add_item(1, other, i, f'noise {i}', f'https://example.com/noise/{i}')
+
+    def add_folder(parent, position, title, level):
+        folder_id = add_item(2, parent, position, title)
+        for i in range(per_folder):
+            add_item(1, folder_id, i, f'video {i}', video_url(f'model{folder_id}', VIDEO_ID_BASE + i))
+        if level < depth:
+            for i in range(fanout):
+                add_folder(folder_id, per_folder + i, f'{title}-{i}', level + 1)
+        return folder_id
+
+    add_folder(menu, 0, EXPORT_FOLDER, 0)
+    flush()
+    conn.commit()
+    conn.close()
+    return state['bookmarks'] - noise
+
+def folder_count(depth, fanout):
+    return sum(fanout ** level for level in range(depth + 1))
+
+def export_filename(model, exported_at):
+    # As generateDatabaseFilename() names them: <model>_Database_MM-DD-YYYY_<ms>.csv
+    return f"{model}_Database_{exported_at:%m-%d-%Y}_{int(exported_at.timestamp() * 1000)}.csv"
+
+def write_export_csv(path, model, video_ids, exported_at):
+    # One RecurTrack export; returns the number of rows written
+    stamp = exported_at.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+    rows = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['URL', 'Filename', 'Extracted At'])
+        for video_id in video_ids:
+            writer.writerow([video_url(model, video_id), video_filename(model, video_id), stamp])
+            rows += 1
+    return rows
+
+def make_export_history(root, total_rows, models=10, exports=5, seed=1):
+    # 'exports' successive exports per model. Each export lists the model's
+    # catalog so far: earlier videos plus new ones, with a few removed, as the
+    # site does. total_rows is spread over all files. Returns the file paths.
+    rng = random.Random(seed)
+    os.makedirs(root, exist_ok=True)
+    per_file = max(1, total_rows // (models * exports))
+    paths = []
+    for m in range(models):
+        model = model_name(m)
+        # The last export has per_file rows; each earlier one a share of them
+        catalog = list(range(VIDEO_ID_BASE, VIDEO_ID_BASE + per_file))
+        for e in range(exports):
+            size = per_file * (e + 1) // exports
+            ids = catalog[:size]
+            if e < exports - 1 and ids:
+                # Removed later: a few videos only appear in older exports
+                ids = [i for i in ids if rng.random() > 0.01]
+            exported_at = BASE_TIME + timedelta(days=30 * e + m)
+            path = os.path.join(root, export_filename(model, exported_at))
+            write_export_csv(path, model, ids, exported_at)
+            paths.append(path)
+    return paths
+
+def make_csv_tree(root, total_rows, rows_per_file=10000, depth=2, fanout=4, duplicates=0.2, seed=1):
+    # CSV files with a 'reurb_link' column spread over nested directories.
+    # A share of the links ('duplicates') repeats links of other files.
+    # Returns (file count, distinct links).
+    rng = random.Random(seed)
+    files = max(1, -(-total_rows // rows_per_file))
+    dirs = ['']
+    level_dirs = ['']
+    for level in range(depth):
+        level_dirs = [os.path.join(d, f'd{level}_{i}') for d in level_dirs for i in range(fanout)]
+        dirs += level_dirs
+    next_id = VIDEO_ID_BASE
+    for n in range(files):
+        directory = os.path.join(root, dirs[n % len(dirs)])
+        os.makedirs(directory, exist_ok=True)
+        rows = min(rows_per_file, total_rows - n * rows_per_file)
+        with open(os.path.join(directory, f'links_{n:05d}.csv'), 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['title', 'reurb_link', 'added'])
+            for _ in range(rows):
+                if next_id > VIDEO_ID_BASE and rng.random() < duplicates:
+                    video_id = rng.randrange(VIDEO_ID_BASE, next_id)
+                else:
+                    video_id = next_id
+                    next_id += 1
+                model = model_name(video_id % 500)
+                writer.writerow([f'video {video_id}', video_url(model, video_id), '2025-01-01'])
+    # Repeats only pick IDs already written, so every issued ID is one distinct link
+    return files, next_id - VIDEO_ID_BASE
+
+def make_video_dir(root, model, video_ids, size=64 * 1024 * 1024):
+    # Sparse files: the reported size is 'size' but no data blocks are written
+    os.makedirs(root, exist_ok=True)
+    count = 0
+    for video_id in video_ids:
+        with open(os.path.join(root, video_filename(model, video_id)), 'wb') as f:
+            f.truncate(size)
+        count += 1
+    return count
@@ -28,7 +28,10 @@
         defaultDirectory: '',
         autoSaveDatabase: true,
         askWhereToSave: true,
-        filenameFormat: '[Model Name]_Database_[MONTH]-[DAY]-[YEAR].csv'
+        filenameFormat: '[Model Name]_Database_[MONTH]-[DAY]-[YEAR].csv',
+        streamToNativeHost: false,
+        extractionConcurrency: 3,
+        maxCloudflareWaits: 1
     };
 
     // Function to initialize settings if not present
@@ -617,59 +620,366 @@
         throw lastError;
     }
 
-    async function processLinksWithFilenames(links, tabId) {
-        const processedData = [];
-        // Get current extraction state for progress tracking
-        const result = await browser.storage.local.get(['extractionState']);
-        const extractionState = result.extractionState;
-        for (let i = 0; i < links.length; i++) {
-            const link = links[i];
-            console.log(`RecurTrack Background: Processing link ${i + 1}/${links.length}:`, link);
-            // Update progress for filename extraction
-            if (extractionState) {
-                await updateExtractionProgress(extractionState, {
-                    progress: {
-                        filenamesProcessed: i + 1,
-                        stepName: `Extracting filename ${i + 1}/${links.length}`
-                    }
+    // Native messaging host ('rdump native-host') that stores results in the RecurDump history store
+    const NATIVE_HOST_NAME = 'recurdump_ingest';
+    const NATIVE_BATCH_SIZE = 25;
+    const NATIVE_ACK_TIMEOUT = 30000; // 30 seconds
+
+    // Function to open a sink that streams {url, filename, extractedAt} records to the native host.
+    // Returns null if the host cannot be reached, so callers fall back to the CSV download.
+    async function openNativeSink(model) {
+        let port;
+        try {
+            port = browser.runtime.connectNative(NATIVE_HOST_NAME);
+        } catch (error) {
+            console.error('RecurTrack Background: Cannot connect to native host:', error);
+            return null;
+        }
+        const pending = new Map();
+        let nextId = 1;
+        let connected = true;
+        port.onMessage.addListener((message) => {
+            const waiter = pending.get(message.id);
+            if (waiter) {
+                pending.delete(message.id);
+                waiter(message);
+            }
+        });
+        port.onDisconnect.addListener(() => {
+            connected = false;
+            const reason = port.error ? port.error.message : 'disconnected';
+            console.error('RecurTrack Background: Native host disconnected:', reason);
+            for (const waiter of pending.values()) {
+                waiter({ type: 'error', message: reason });
+            }
+            pending.clear();
+        });
+
+        function request(message) {
+            if (!connected) {
+                return Promise.resolve({ type: 'error', message: 'disconnected' });
+            }
+            message.id = nextId++;
+            return new Promise((resolve) => {
+                const timer = setTimeout(() => {
+                    pending.delete(message.id);
+                    resolve({ type: 'error', message: 'timed out' });
+                }, NATIVE_ACK_TIMEOUT);
+                pending.set(message.id, (reply) => {
+                    clearTimeout(timer);
+                    resolve(reply);
                 });
+                port.postMessage(message);
+            });
+        }
+
+        const hello = await new Promise((resolve) => {
+            const timer = setTimeout(() => resolve(null), NATIVE_ACK_TIMEOUT);
+            port.onMessage.addListener(function onHello(message) {
+                if (message.type === 'hello') {
+                    clearTimeout(timer);
+                    port.onMessage.removeListener(onHello);
+                    resolve(message);
+                }
+            });
+            port.onDisconnect.addListener(() => resolve(null));
+            port.postMessage({ type: 'hello' });
+        });
+        if (!hello) {
+            // Close the port so a host that started but never answered is not left running
+            connected = false;
+            try {
+                port.disconnect();
+            } catch (error) {
+                // Already disconnected
+            }
+            return null;
+        }
+        console.log('RecurTrack Background: Streaming results to native host, store:', hello.store);
+
+        const session = `${model}-${Date.now()}`;
+        const startedAt = new Date().toISOString();
+        const acks = [];
+        let batch = [];
+        let sent = 0;
+        let stored = 0;
+        let failed = false;
+
+        function flush() {
+            if (batch.length === 0) {
+                return;
+            }
+            const records = batch;
+            batch = [];
+            sent += records.length;
+            acks.push(request({ type: 'records', session, model, startedAt, records }).then((reply) => {
+                if (reply.type === 'ack') {
+                    stored += reply.stored;
+                } else {
+                    failed = true;
+                    console.error('RecurTrack Background: Native host rejected batch:', reply.message);
+                }
+            }));
+        }
+
+        return {
+            add(url, filename) {
+                batch.push({ url, filename, extractedAt: new Date().toISOString() });
+                if (batch.length >= NATIVE_BATCH_SIZE) {
+                    flush();
+                }
+            },
+            // Resolves to true when the host acknowledged every record
+            async close() {
+                flush();
+                await Promise.all(acks);
+                const end = await request({ type: 'end', session });
+                port.disconnect();
+                return !failed && end.type === 'ack' && stored === sent;
+            }
+        };
+    }
+
+    // Pending page-ready waits by tab: resolved by the content script's PAGE_READY
+    // message for the requested URL or by the tab reaching 'complete' after a navigation started
+    const pageReadyWaiters = new Map();
+
+    function resolvePageReady(tabId, source, url = null) {
+        const waiter = pageReadyWaiters.get(tabId);
+        if (waiter && (url === null || url === waiter.url)) {
+            pageReadyWaiters.delete(tabId);
+            waiter(source);
+        }
+    }
+
+    browser.tabs.onUpdated.addListener((tabId, changeInfo) => {
+        const waiter = pageReadyWaiters.get(tabId);
+        if (!waiter) return;
+        if (changeInfo.status === 'loading') {
+            waiter.loading = true;
+        } else if (changeInfo.status === 'complete' && waiter.loading) {
+            resolvePageReady(tabId, 'complete');
+        }
+    });
+
+    browser.tabs.onRemoved.addListener((tabId) => {
+        resolvePageReady(tabId, 'removed');
+    });
+
+    // Function to navigate a tab and wait until the new page is ready, at most maxWaitMs.
+    // Resolves to 'ready', 'complete', 'removed' or 'timeout'.
+    function navigateAndWait(tabId, url, maxWaitMs) {
+        return new Promise((resolve, reject) => {
+            const timer = setTimeout(() => resolvePageReady(tabId, 'timeout'), maxWaitMs);
+            const waiter = (source) => {
+                clearTimeout(timer);
+                resolve(source);
+            };
+            waiter.url = url;
+            waiter.loading = false;
+            pageReadyWaiters.set(tabId, waiter);
+            browser.tabs.update(tabId, { url: url }).catch((error) => {
+                clearTimeout(timer);
+                pageReadyWaiters.delete(tabId);
+                reject(error);
+            });
+        });
+    }
+
+    // Counting semaphore, used to cap concurrent CloudFlare waits across worker tabs
+    function createSemaphore(limit) {
+        let active = 0;
+        const queue = [];
+        return {
+            async acquire() {
+                if (active < limit) {
+                    active++;
+                    return;
+                }
+                await new Promise(resolve => queue.push(resolve));
+            },
+            release() {
+                const next = queue.shift();
+                if (next) {
+                    next();
+                } else {
+                    active--;
+                }
+            }
+        };
+    }
+
+    // Function to extract the filename of one video link in a worker tab
+    async function extractFilenameInTab(tabId, link, settings, cloudflareSlots, onWaiting) {
+        let filename = null;
+        // Retry navigation and extraction up to 3 times
+        await retryAsync(async (attempt) => {
+            const source = await navigateAndWait(tabId, link, (settings.pageLoadDelay || 3) * 1000);
+            if (source === 'removed') {
+                throw new Error('Worker tab was closed');
             }
-            let filename = 'Unknown';
-            let errorOccurred = false;
             try {
-                // Retry navigation and extraction up to 3 times
-                await retryAsync(async (attempt) => {
-                    await browser.tabs.update(tabId, { url: link });
-                    await new Promise(resolve => setTimeout(resolve, 3000));
+                const cloudFlareResult = await checkForCloudFlareChallenge(tabId);
+                if (cloudFlareResult.hasChallenge) {
+                    onWaiting();
+                    await cloudflareSlots.acquire();
                     try {
-                        const cloudFlareResult = await checkForCloudFlareChallenge(tabId);
-                        if (cloudFlareResult.hasChallenge) {
-                            if (extractionState) {
-                                await updateExtractionProgress(extractionState, {
-                                    progress: {
-                                        stepName: `Waiting for CloudFlare completion (${i + 1}/${links.length})`
-                                    }
-                                });
-                            }
-                            await waitForCloudFlareCompletion(tabId);
-                        }
-                    } catch (cfError) {
-                        // CloudFlare timeout or error
-                        notifyComponents({
-                            type: 'EXTRACTION_ERROR',
-                            error: cfError.message || 'CloudFlare challenge wait timed out.'
-                        });
-                        throw cfError;
+                        await waitForCloudFlareCompletion(tabId);
+                    } finally {
+                        cloudflareSlots.release();
                     }
-                    filename = await extractFilenameFromPage(tabId);
-                    if (!filename) throw new Error('Filename extraction failed');
-                }, 3, 2000);
-                console.log('RecurTrack Background: Extracted filename:', filename);
-                processedData.push({ url: link, filename });
-            } catch (error) {
-                errorOccurred = true;
-                console.error('RecurTrack Background: Error processing link:', link, error);
-                processedData.push({ url: link, filename: 'Error' });
+                }
+            } catch (cfError) {
+                // CloudFlare timeout or error
+                notifyComponents({
+                    type: 'EXTRACTION_ERROR',
+                    error: cfError.message || 'CloudFlare challenge wait timed out.'
+                });
+                throw cfError;
+            }
+            filename = await extractFilenameFromPage(tabId);
+            if (!filename) throw new Error('Filename extraction failed');
+        }, 3, 2000);
+        return filename;
+    }
+
+    // Filename database checkpoint: one storage key per entry plus a small index, so every
+    // filename is persisted as soon as it is found instead of in one array at the end
+    const DATABASE_INDEX_KEY = 'filenameDatabaseIndex';
+    const DATABASE_ENTRY_PREFIX = 'filenameEntry_';
+    const PROGRESS_WRITE_INTERVAL = 1000; // 1 second between throttled progress writes
+
+    function databaseEntryKeys(start, end) {
+        const keys = [];
+        for (let i = start; i < end; i++) {
+            keys.push(DATABASE_ENTRY_PREFIX + i);
+        }
+        return keys;
+    }
+
+    // Function to remove the stored filename database (index and entries)
+    async function clearDatabaseCheckpoint() {
+        const result = await browser.storage.local.get([DATABASE_INDEX_KEY]);
+        const index = result[DATABASE_INDEX_KEY];
+        const keys = index ? databaseEntryKeys(0, index.total) : [];
+        await browser.storage.local.remove([DATABASE_INDEX_KEY, 'filenameDatabase', ...keys]);
+    }
+
+    // Function to start a checkpoint for links of a model. Filenames already stored for the
+    // same model are returned in 'done' (url -> filename) so a rerun can skip those URLs.
+    async function openDatabaseCheckpoint(model, links) {
+        const done = new Map();
+        const result = await browser.storage.local.get([DATABASE_INDEX_KEY]);
+        const previous = result[DATABASE_INDEX_KEY];
+        if (previous && previous.model === model) {
+            const stored = await browser.storage.local.get(databaseEntryKeys(0, previous.total));
+            for (const entry of Object.values(stored)) {
+                if (entry && entry.filename && entry.filename !== 'Error' && entry.filename !== 'Unknown') {
+                    done.set(entry.url, entry.filename);
+                }
+            }
+        }
+        await clearDatabaseCheckpoint();
+
+        const index = { model: model, total: links.length, done: 0, complete: false, updatedAt: new Date().toISOString() };
+        const reused = {};
+        links.forEach((url, i) => {
+            if (done.has(url)) {
+                reused[DATABASE_ENTRY_PREFIX + i] = { url: url, filename: done.get(url) };
+                index.done++;
+            }
+        });
+        await browser.storage.local.set({ ...reused, [DATABASE_INDEX_KEY]: index });
+        if (index.done > 0) {
+            console.log('RecurTrack Background: Resuming extraction,', index.done, 'of', links.length, 'filenames already stored');
+        }
+
+        return {
+            done: done,
+            // Persist one entry together with the small index; nothing else is rewritten
+            async record(i, entry) {
+                index.done++;
+                index.updatedAt = new Date().toISOString();
+                await browser.storage.local.set({ [DATABASE_ENTRY_PREFIX + i]: entry, [DATABASE_INDEX_KEY]: index });
+            },
+            async finish() {
+                index.complete = true;
+                index.updatedAt = new Date().toISOString();
+                await browser.storage.local.set({ [DATABASE_INDEX_KEY]: index });
+            }
+        };
+    }
+
+    async function processLinksWithFilenames(links, tabId, sink = null, checkpoint = null) {
+        const processedData = new Array(links.length);
+        // Get current extraction state for progress tracking
+        const result = await browser.storage.local.get(['extractionState', 'settings']);
+        const extractionState = result.extractionState;
+        const settings = { ...defaultSettings, ...(result.settings || {}) };
+        const concurrency = Math.max(1, Math.min(parseInt(settings.extractionConcurrency) || 1, links.length || 1));
+        const cloudflareSlots = createSemaphore(Math.max(1, parseInt(settings.maxCloudflareWaits) || 1));
+        console.log('RecurTrack Background: Extracting filenames with', concurrency, 'worker tab(s)');
+
+        // The extraction tab is the first worker; the others are opened in the background
+        const workerTabs = [tabId];
+        for (let i = 1; i < concurrency; i++) {
+            const tab = await browser.tabs.create({ url: 'about:blank', active: false });
+            workerTabs.push(tab.id);
+        }
+
+        let nextIndex = 0;
+        let processed = 0;
+        async function worker(workerTabId) {
+            // Pull links from the shared queue until it is empty
+            while (nextIndex < links.length) {
+                const i = nextIndex++;
+                const link = links[i];
+                // Filenames stored by an earlier, interrupted run are reused as they are
+                if (checkpoint && checkpoint.done.has(link)) {
+                    processedData[i] = { url: link, filename: checkpoint.done.get(link) };
+                    if (sink) sink.add(link, processedData[i].filename);
+                    processed++;
+                    continue;
+                }
+                console.log(`RecurTrack Background: Processing link ${i + 1}/${links.length} in tab ${workerTabId}:`, link);
+                let filename;
+                try {
+                    filename = await extractFilenameInTab(workerTabId, link, settings, cloudflareSlots, () => {
+                        if (extractionState) {
+                            updateExtractionProgress(extractionState, {
+                                progress: {
+                                    stepName: `Waiting for CloudFlare completion (${i + 1}/${links.length})`
+                                }
+                            });
+                        }
+                    });
+                    console.log('RecurTrack Background: Extracted filename:', filename);
+                } catch (error) {
+                    console.error('RecurTrack Background: Error processing link:', link, error);
+                    filename = 'Error';
+                }
+                processedData[i] = { url: link, filename };
+                if (sink) sink.add(link, filename);
+                if (checkpoint) await checkpoint.record(i, processedData[i]);
+                processed++;
+                // Update progress for filename extraction; written at most once per interval
+                if (extractionState) {
+                    await updateExtractionProgress(extractionState, {
+                        progress: {
+                            filenamesProcessed: processed,
+                            stepName: `Extracting filename ${processed}/${links.length}`
+                        }
+                    }, true);
+                }
+            }
+        }
+
+        try {
+            await Promise.all(workerTabs.map(worker));
+        } finally {
+            const extraTabs = workerTabs.slice(1);
+            if (extraTabs.length > 0) {
+                await browser.tabs.remove(extraTabs).catch(() => {});
             }
         }
         return processedData;
@@ -798,11 +1108,24 @@
                 type: 'FILENAME_EXTRACTION_STARTED'
             });
             
+            // Stream results to the native host as they are produced, if enabled
+            const settingsResult = await browser.storage.local.get(['settings']);
+            const settings = settingsResult.settings || {};
+            let sink = null;
+            if (settings.streamToNativeHost && extractionState) {
+                sink = await openNativeSink(extractionState.model);
+            }
+            
+            // Each filename is stored as soon as it is found; filenames already stored for
+            // this model by an interrupted run are not extracted again
+            const checkpoint = await openDatabaseCheckpoint(extractionState ? extractionState.model : '', links);
+            
             // Process links and extract filenames
-            const database = await processLinksWithFilenames(links, tabId);
+            const database = await processLinksWithFilenames(links, tabId, sink, checkpoint);
+            const streamed = sink ? await sink.close() : false;
             
-            // Store the database
-            await browser.storage.local.set({ filenameDatabase: database });
+            // Mark the stored database as complete
+            await checkpoint.finish();
             
             // Update extraction state
             if (extractionState) {
@@ -820,13 +1143,13 @@
                 });
                 
                 // Auto-save database if enabled
-                await autoSaveDatabase(extractionState.model, database);
+                await autoSaveDatabase(extractionState.model, database, streamed);
             }
             
             // Notify components about completion
             notifyComponents({
                 type: 'FILENAME_EXTRACTION_COMPLETED',
-                database: database
+                count: database.length
             });
             
             console.log('RecurTrack Background: Filename extraction completed with', database.length, 'entries');
@@ -867,7 +1190,7 @@
     }
 
     // Function to auto-save database to file
-    async function autoSaveDatabase(model, filenameDatabase) {
+    async function autoSaveDatabase(model, filenameDatabase, streamed = false) {
         try {
             console.log('RecurTrack Background: Auto-saving database for model:', model);
             console.log('RecurTrack Background: Database structure:', typeof filenameDatabase, Array.isArray(filenameDatabase) ? 'Array' : 'Object');
@@ -883,6 +1206,17 @@
                 return;
             }
             
+            // The native host already stored every record; no CSV file is needed
+            if (streamed) {
+                console.log('RecurTrack Background: Database streamed to RecurDump, skipping CSV download');
+                notifyComponents({
+                    type: 'DATABASE_AUTO_SAVED',
+                    filename: 'RecurDump history store',
+                    model: model
+                });
+                return;
+            }
+            
             // Generate filename using the format from settings
             const filename = generateDatabaseFilename(model, settings.filenameFormat);
             console.log('RecurTrack Background: Generated filename:', filename);
@@ -999,7 +1333,7 @@
             await browser.storage.local.remove(['extractionState']);
             
             // Clear filename database
-            await browser.storage.local.remove(['filenameDatabase']);
+            await clearDatabaseCheckpoint();
             
             // Clear debug logs
             await browser.storage.local.remove(['debugLogs']);
@@ -1037,8 +1371,29 @@
         }
     }
 
-    // Function to update extraction progress and notify components
-    async function updateExtractionProgress(extractionState, updates) {
+    let lastProgressWrite = 0;
+    let progressWriteTimer = null;
+
+    // Function to write the extraction state and notify components
+    async function writeExtractionProgress(extractionState) {
+        clearTimeout(progressWriteTimer);
+        progressWriteTimer = null;
+        lastProgressWrite = Date.now();
+        
+        // Update extraction state in storage
+        await browser.storage.local.set({ extractionState: extractionState });
+        
+        // Send progress update to components
+        notifyComponents({
+            type: 'EXTRACTION_PROGRESS_UPDATE',
+            data: extractionState
+        });
+    }
+
+    // Function to update extraction progress and notify components. With throttle set,
+    // the state is written at most once per PROGRESS_WRITE_INTERVAL; a trailing write
+    // picks up the latest values.
+    async function updateExtractionProgress(extractionState, updates, throttle = false) {
         try {
             // Update the progress object with new values
             if (updates.progress) {
@@ -1079,14 +1434,14 @@
                 }
             }
             
-            // Update extraction state in storage
-            await browser.storage.local.set({ extractionState: extractionState });
-            
-            // Send progress update to components
-            notifyComponents({
-                type: 'EXTRACTION_PROGRESS_UPDATE',
-                data: extractionState
-            });
+            const wait = lastProgressWrite + PROGRESS_WRITE_INTERVAL - Date.now();
+            if (throttle && wait > 0) {
+                if (!progressWriteTimer) {
+                    progressWriteTimer = setTimeout(() => writeExtractionProgress(extractionState), wait);
+                }
+                return;
+            }
+            await writeExtractionProgress(extractionState);
             
             console.log('RecurTrack Background: Progress updated:', {
                 step: progress.currentStep,
@@ -1115,6 +1470,13 @@
         }
         
         switch (message.type) {
+            case 'PAGE_READY':
+                if (sender.tab) {
+                    resolvePageReady(sender.tab.id, 'ready', message.url);
+                }
+                sendResponse({ success: true });
+                break;
+                
             case 'CLOUDFLARE_CHECK_DETECTED':
                 handleCloudFlareDetection(message.data);
                 sendResponse({ success: true });
@@ -0,0 +1,127 @@
+/**
+ * RecurTrack List Rendering Benchmark
+ * Open bench_virtual_list.html (from the extension or as a local file) and press Run
+ */
+
+(function() {
+    'use strict';
+
+    const rowCountInput = document.getElementById('row-count');
+    const runBtn = document.getElementById('run-btn');
+    const fullList = document.getElementById('full-list');
+    const virtualContainer = document.getElementById('virtual-list');
+    const results = document.getElementById('results');
+
+    function makeLinks(count) {
+        const links = [];
+        for (let i = 0; i < count; i++) {
+            links.push(`https://www.recu.me/stub_model/video/${10000000 + i}/play`);
+        }
+        return links;
+    }
+
+    function renderLink(link) {
+        const row = document.createElement('div');
+        row.className = 'extraction-link-item virtual-row';
+        row.textContent = link;
+        return row;
+    }
+
+    function report(line) {
+        results.textContent += line + '\n';
+    }
+
+    function nextFrame() {
+        return new Promise(resolve => requestAnimationFrame(resolve));
+    }
+
+    // Time fn including the style and layout work it causes
+    function timed(fn, container) {
+        const start = performance.now();
+        fn();
+        void container.scrollHeight;
+        void container.lastChild;
+        return performance.now() - start;
+    }
+
+    // The old updateExtractionLinks(): clear innerHTML and rebuild every row
+    function fullRebuild(links) {
+        fullList.innerHTML = '';
+        links.forEach(link => {
+            fullList.appendChild(renderLink(link));
+        });
+    }
+
+    async function run() {
+        runBtn.disabled = true;
+        results.textContent = '';
+        const count = parseInt(rowCountInput.value) || 50000;
+        const links = makeLinks(count);
+        const deltaSize = 100;
+        report(`${count} rows`);
+        await nextFrame();
+
+        // Full rebuild, once from empty and once more as on the next progress message
+        const fullFirst = timed(() => fullRebuild(links), fullList);
+        await nextFrame();
+        const fullAgain = timed(() => fullRebuild(links), fullList);
+        report(`full rebuild        first ${fullFirst.toFixed(1)} ms, again ${fullAgain.toFixed(1)} ms (${fullList.childElementCount} rows in DOM)`);
+        fullList.innerHTML = '';
+        await nextFrame();
+
+        // Virtualized: all rows at once
+        const view = new VirtualList(virtualContainer, { rowHeight: 30, renderRow: renderLink });
+        const virtualAll = timed(() => {
+            view.setItems(links);
+            view.render();
+        }, virtualContainer);
+        report(`virtual setItems    ${virtualAll.toFixed(1)} ms (${view.rows.childElementCount} rows in DOM)`);
+
+        // Virtualized: rows arriving as deltas, one delta per frame
+        view.clear();
+        view.render();
+        let worstFrame = 0;
+        let totalAppend = 0;
+        for (let start = 0; start < count; start += deltaSize * 50) {
+            // 50 deltas between two frames, as a burst of realtime updates would bring
+            const frameTime = timed(() => {
+                for (let i = start; i < Math.min(start + deltaSize * 50, count); i += deltaSize) {
+                    view.append(links.slice(i, i + deltaSize));
+                }
+                view.render();
+            }, virtualContainer);
+            worstFrame = Math.max(worstFrame, frameTime);
+            totalAppend += frameTime;
+            await nextFrame();
+        }
+        report(`virtual appends     ${totalAppend.toFixed(1)} ms total in deltas of ${deltaSize}, worst frame ${worstFrame.toFixed(2)} ms`);
+
+        // Coalescing: many updates in one task cause a single render
+        let renders = 0;
+        const render = view.render;
+        view.render = function() {
+            renders++;
+            return render.call(this);
+        };
+        for (let i = 0; i < 1000; i++) {
+            view.set(i % 20, links[i]);
+        }
+        await nextFrame();
+        await nextFrame();
+        view.render = render;
+        report(`virtual coalescing  1000 updates in one task -> ${renders} render(s)`);
+
+        // Scrolling to random positions
+        const scrollTimes = [];
+        for (let i = 0; i < 100; i++) {
+            virtualContainer.scrollTop = Math.floor(Math.random() * count) * 30;
+            scrollTimes.push(timed(() => view.render(), virtualContainer));
+        }
+        const meanScroll = scrollTimes.reduce((a, b) => a + b, 0) / scrollTimes.length;
+        report(`virtual scroll      mean ${meanScroll.toFixed(2)} ms, worst ${Math.max(...scrollTimes).toFixed(2)} ms per jump`);
+        runBtn.disabled = false;
+    }
+
+    runBtn.addEventListener('click', run);
+
+})();
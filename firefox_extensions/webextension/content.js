@@ -340,6 +340,15 @@
                 return true; // Keep message channel open
             }
         });
+        
+        // Tell the background script the page can be queried, so filename
+        // extraction does not have to sleep for a fixed time after navigating
+        browser.runtime.sendMessage({
+            type: 'PAGE_READY',
+            url: window.location.href
+        }).catch(() => {
+            // Background script not listening; it falls back to the tab status
+        });
     }
 
     // Start the content script
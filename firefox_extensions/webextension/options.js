@@ -23,7 +23,10 @@
         defaultDirectory: '',
         autoSaveDatabase: true, // changed from false
         askWhereToSave: true, // changed from false
-        filenameFormat: '[Model Name]_Database_[MONTH]-[DAY]-[YEAR].csv'
+        filenameFormat: '[Model Name]_Database_[MONTH]-[DAY]-[YEAR].csv',
+        streamToNativeHost: false,
+        extractionConcurrency: 3,
+        maxCloudflareWaits: 1
     };
 
     // DOM elements
@@ -33,6 +36,8 @@
     const autoClearAfterExtractionCheckbox = document.getElementById('auto-clear-after-extraction');
     const pageLoadDelaySelect = document.getElementById('page-load-delay');
     const cloudflareTimeoutSelect = document.getElementById('cloudflare-timeout');
+    const extractionConcurrencySelect = document.getElementById('extraction-concurrency');
+    const maxCloudflareWaitsSelect = document.getElementById('max-cloudflare-waits');
     const maxPagesSelect = document.getElementById('max-pages');
     const csvSeparatorSelect = document.getElementById('csv-separator');
     const csvIncludeHeadersCheckbox = document.getElementById('csv-include-headers');
@@ -42,6 +47,7 @@
     // Database settings elements
     const autoSaveDatabaseCheckbox = document.getElementById('auto-save-database');
     const askWhereToSaveCheckbox = document.getElementById('ask-where-to-save');
+    const streamToNativeHostCheckbox = document.getElementById('stream-to-native-host');
     const filenameFormatInput = document.getElementById('filename-format');
     const filenamePreviewText = document.getElementById('filename-preview-text');
     
@@ -103,6 +109,8 @@
             autoClearAfterExtractionCheckbox.checked = (typeof settings.autoClearAfterExtraction === 'boolean') ? settings.autoClearAfterExtraction : defaultSettings.autoClearAfterExtraction;
             pageLoadDelaySelect.value = settings.pageLoadDelay || 3;
             cloudflareTimeoutSelect.value = settings.cloudflareTimeout || 5;
+            extractionConcurrencySelect.value = settings.extractionConcurrency || defaultSettings.extractionConcurrency;
+            maxCloudflareWaitsSelect.value = settings.maxCloudflareWaits || defaultSettings.maxCloudflareWaits;
             maxPagesSelect.value = settings.maxPages || 10;
             csvSeparatorSelect.value = settings.csvSeparator || ',';
             csvIncludeHeadersCheckbox.checked = settings.csvIncludeHeaders !== false;
@@ -112,6 +120,7 @@
             // Database settings
             autoSaveDatabaseCheckbox.checked = (typeof settings.autoSaveDatabase === 'boolean') ? settings.autoSaveDatabase : defaultSettings.autoSaveDatabase;
             askWhereToSaveCheckbox.checked = (typeof settings.askWhereToSave === 'boolean') ? settings.askWhereToSave : defaultSettings.askWhereToSave;
+            streamToNativeHostCheckbox.checked = (typeof settings.streamToNativeHost === 'boolean') ? settings.streamToNativeHost : defaultSettings.streamToNativeHost;
             filenameFormatInput.value = settings.filenameFormat || defaultSettings.filenameFormat;
             updateFilenamePreview();
             
@@ -133,6 +142,8 @@
                 autoClearAfterExtraction: autoClearAfterExtractionCheckbox.checked,
                 pageLoadDelay: parseInt(pageLoadDelaySelect.value),
                 cloudflareTimeout: parseInt(cloudflareTimeoutSelect.value),
+                extractionConcurrency: parseInt(extractionConcurrencySelect.value),
+                maxCloudflareWaits: parseInt(maxCloudflareWaitsSelect.value),
                 maxPages: parseInt(maxPagesSelect.value),
                 csvSeparator: csvSeparatorSelect.value,
                 csvIncludeHeaders: csvIncludeHeadersCheckbox.checked,
@@ -140,6 +151,7 @@
                 customLinkPattern: customLinkPatternTextarea.value.trim(),
                 autoSaveDatabase: autoSaveDatabaseCheckbox.checked,
                 askWhereToSave: askWhereToSaveCheckbox.checked,
+                streamToNativeHost: streamToNativeHostCheckbox.checked,
                 filenameFormat: filenameFormatInput.value.trim() || defaultSettings.filenameFormat
             };
             
@@ -238,15 +250,26 @@
         }
     }
 
+    // Keys of the stored filename database: an index plus one key per entry (see background.js)
+    async function getFilenameDatabaseKeys() {
+        const result = await browser.storage.local.get(['filenameDatabaseIndex']);
+        const index = result.filenameDatabaseIndex;
+        const keys = ['filenameDatabaseIndex', 'filenameDatabase'];
+        for (let i = 0; index && i < index.total; i++) {
+            keys.push('filenameEntry_' + i);
+        }
+        return keys;
+    }
+
     // Function to clear all data
     async function clearAllData() {
         if (confirm('Are you sure you want to clear all data? This will remove all extraction results, filename database, and debug logs. This cannot be undone.')) {
             try {
                 await browser.storage.local.remove([
                     'extractionState',
-                    'filenameDatabase',
                     'currentDetection',
-                    'detectionHistory'
+                    'detectionHistory',
+                    ...await getFilenameDatabaseKeys()
                 ]);
                 
                 showStatus('All data cleared successfully!');
@@ -264,12 +287,18 @@
         try {
             const result = await browser.storage.local.get([
                 'extractionState',
-                'filenameDatabase',
                 'currentDetection',
                 'detectionHistory',
                 'settings'
             ]);
             
+            // Export the filename database as one array, in link order
+            const entries = await browser.storage.local.get(await getFilenameDatabaseKeys());
+            result.filenameDatabase = Object.keys(entries)
+                .filter(key => key.startsWith('filenameEntry_'))
+                .sort((a, b) => parseInt(a.slice(14)) - parseInt(b.slice(14)))
+                .map(key => entries[key]);
+            
             const dataBlob = new Blob([JSON.stringify(result, null, 2)], {
                 type: 'application/json'
             });
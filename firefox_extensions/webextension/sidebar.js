@@ -61,7 +61,36 @@
     let currentDetection = null;
     let detectionHistory = [];
     let currentExtraction = null;
-    let filenameDatabase = [];
+    let databaseIndex = null;
+    const loadedDatabasePages = new Set();
+
+    // Filename database storage layout (same keys as background.js): a small index
+    // plus one key per entry, read a page at a time as rows scroll into view
+    const DATABASE_INDEX_KEY = 'filenameDatabaseIndex';
+    const DATABASE_ENTRY_PREFIX = 'filenameEntry_';
+    const DATABASE_PAGE_SIZE = 50;
+
+    // Only the visible rows of the link and database lists are in the DOM
+    const linksView = new VirtualList(extractionLinksList, {
+        rowHeight: 30,
+        renderRow: (link) => {
+            const row = document.createElement('div');
+            row.className = 'extraction-link-item virtual-row';
+            row.textContent = link;
+            return row;
+        }
+    });
+    const databaseView = new VirtualList(databaseList, {
+        rowHeight: 44,
+        renderRow: renderDatabaseRow,
+        renderPlaceholder: () => {
+            const row = document.createElement('div');
+            row.className = 'database-row virtual-row pending';
+            row.textContent = 'Waiting for filename…';
+            return row;
+        },
+        loadRange: loadDatabaseRange
+    });
 
     // Debug logging function
     function addDebugLog(message, type = 'info') {
@@ -218,12 +247,8 @@
                 updateExtractionDisplay(currentExtraction);
             }
 
-            // Get current filename database
-            const databaseResponse = await browser.storage.local.get(['filenameDatabase']);
-            if (databaseResponse.filenameDatabase) {
-                filenameDatabase = databaseResponse.filenameDatabase;
-                updateFilenameDatabaseDisplay(filenameDatabase);
-            }
+            // Get the filename database index; entries are loaded as they scroll into view
+            await loadDatabaseIndex();
 
         } catch (error) {
             console.error('RecurTrack Sidebar: Error loading state:', error);
@@ -325,9 +350,11 @@
                                 hideErrorMessage();
                                 // Clear all data and reset state
                                 browser.runtime.sendMessage({ type: 'CLEAR_DETECTION' });
-                                browser.storage.local.remove(['extractionState', 'filenameDatabase', 'debugLogs']);
+                                browser.storage.local.remove(['extractionState', 'debugLogs']);
+                                removeFilenameDatabase();
+                                resetDatabaseView();
                                 updateExtractionDisplay(null);
-                                updateFilenameDatabaseDisplay([]);
+                                updateFilenameDatabaseDisplay(null);
                                 debugLogs.innerHTML = '';
                             }
                         }
@@ -353,11 +380,9 @@
                 break;
                 
             case 'FILENAME_EXTRACTION_COMPLETED':
-                addDebugLog(`Filename extraction completed! Found ${message.database.length} entries`, 'success');
+                addDebugLog(`Filename extraction completed! Found ${message.count} entries`, 'success');
                 console.log('RecurTrack Sidebar: FILENAME_EXTRACTION_COMPLETED message received:', message);
-                filenameDatabase = message.database;
-                updateFilenameDatabaseDisplay(filenameDatabase);
-                databaseStatusText.textContent = 'Completed';
+                loadDatabaseIndex();
                 break;
                 
             case 'DATABASE_AUTO_SAVED':
@@ -378,9 +403,9 @@
                 addDebugLog('Auto-clearing sidebar data after successful extraction', 'info');
                 // Clear all data displays
                 currentExtraction = null;
-                filenameDatabase = [];
+                resetDatabaseView();
                 updateExtractionDisplay(null);
-                updateFilenameDatabaseDisplay([]);
+                updateFilenameDatabaseDisplay(null);
                 // Clear debug logs
                 debugLogs.innerHTML = '';
                 addDebugLog('Sidebar data cleared automatically', 'info');
@@ -570,19 +595,14 @@
 
     // Update extraction links display to mark failed/skipped items
     function updateExtractionLinks(links) {
-        extractionLinksList.innerHTML = '';
-        links.forEach(link => {
-            const li = document.createElement('div');
-            li.className = 'extraction-link-item';
-            li.textContent = link;
-            // Mark as warning if link is "Error" or contains error marker
-            if (typeof link === 'object' && link.filename === 'Error') {
-                li.style.color = '#dc3545';
-                li.style.fontWeight = 'bold';
-                li.title = 'Extraction failed for this item';
-            }
-            extractionLinksList.appendChild(li);
-        });
+        // Progress updates carry the whole list, which only grows during an
+        // extraction; pass just the new links to the view in that case
+        const shown = linksView.count;
+        if (shown > 0 && links.length >= shown && links[shown - 1] === linksView.items[shown - 1] && links[0] === linksView.items[0]) {
+            linksView.append(links.slice(shown));
+        } else {
+            linksView.setItems(links);
+        }
     }
 
     // Function to copy all extracted links
@@ -622,11 +642,91 @@
         }
     }
 
+    function databaseEntryKeys(start, end) {
+        const keys = [];
+        for (let i = start; i < end; i++) {
+            keys.push(DATABASE_ENTRY_PREFIX + i);
+        }
+        return keys;
+    }
+
+    // Function to load the filename database index and size the list to it
+    async function loadDatabaseIndex() {
+        try {
+            const result = await browser.storage.local.get([DATABASE_INDEX_KEY]);
+            applyDatabaseIndex(result[DATABASE_INDEX_KEY] || null);
+        } catch (error) {
+            console.error('RecurTrack Sidebar: Error loading filename database:', error);
+        }
+    }
+
+    function applyDatabaseIndex(index) {
+        // A new extraction rewrites the entries; drop rows of the previous one
+        if (!index || !databaseIndex || index.model !== databaseIndex.model || index.total !== databaseIndex.total) {
+            resetDatabaseView();
+        }
+        databaseIndex = index;
+        if (index) {
+            databaseView.setCount(index.total);
+        }
+        updateFilenameDatabaseDisplay(index);
+    }
+
+    function resetDatabaseView() {
+        databaseIndex = null;
+        loadedDatabasePages.clear();
+        databaseView.clear();
+    }
+
+    // Function to fetch the pages of entries covering rows start..end that are not loaded yet
+    async function loadDatabaseRange(start, end) {
+        const firstPage = Math.floor(start / DATABASE_PAGE_SIZE);
+        const lastPage = Math.floor((end - 1) / DATABASE_PAGE_SIZE);
+        for (let page = firstPage; page <= lastPage; page++) {
+            if (loadedDatabasePages.has(page) || !databaseIndex) continue;
+            // Entries written later arrive through storage.onChanged
+            loadedDatabasePages.add(page);
+            const pageStart = page * DATABASE_PAGE_SIZE;
+            const keys = databaseEntryKeys(pageStart, Math.min(pageStart + DATABASE_PAGE_SIZE, databaseIndex.total));
+            try {
+                const entries = await browser.storage.local.get(keys);
+                keys.forEach((key, i) => {
+                    if (entries[key]) databaseView.set(pageStart + i, entries[key]);
+                });
+            } catch (error) {
+                loadedDatabasePages.delete(page);
+                console.error('RecurTrack Sidebar: Error loading filename database entries:', error);
+            }
+        }
+    }
+
+    // Function to read every stored entry, a chunk of keys at a time
+    async function loadAllDatabaseEntries() {
+        const result = await browser.storage.local.get([DATABASE_INDEX_KEY]);
+        const index = result[DATABASE_INDEX_KEY];
+        const all = [];
+        if (!index) return all;
+        for (let start = 0; start < index.total; start += 500) {
+            const keys = databaseEntryKeys(start, Math.min(start + 500, index.total));
+            const entries = await browser.storage.local.get(keys);
+            keys.forEach(key => {
+                if (entries[key]) all.push(entries[key]);
+            });
+        }
+        return all;
+    }
+
+    // Function to remove the filename database index and entries from storage
+    async function removeFilenameDatabase() {
+        const result = await browser.storage.local.get([DATABASE_INDEX_KEY]);
+        const index = result[DATABASE_INDEX_KEY];
+        const keys = index ? databaseEntryKeys(0, index.total) : [];
+        await browser.storage.local.remove([DATABASE_INDEX_KEY, 'filenameDatabase', ...keys]);
+    }
+
     // Function to update filename database display
-    function updateFilenameDatabaseDisplay(database) {
-        console.log('RecurTrack Sidebar: updateFilenameDatabaseDisplay called with:', database);
-        
-        if (!database || database.length === 0) {
+    function updateFilenameDatabaseDisplay(index) {
+        if (!index || index.done === 0) {
             filenameDatabaseSection.style.display = 'none';
             return;
         }
@@ -635,37 +735,37 @@
         filenameDatabaseSection.style.display = 'block';
         
         // Update database info
-        databaseEntryCount.textContent = database.length;
-        databaseStatusText.textContent = 'Ready';
+        databaseEntryCount.textContent = index.done;
+        databaseStatusText.textContent = index.complete ? 'Ready' : `Extracting ${index.done}/${index.total}`;
         
         // Show database container
         databaseContainer.style.display = 'block';
-        updateDatabaseList(database);
-        
-        console.log('RecurTrack Sidebar: Filename database section should now be visible');
     }
 
-    // Update filename database display to mark failed/skipped items
-    function updateFilenameDatabaseDisplay(database) {
-        databaseList.innerHTML = '';
-        database.forEach(entry => {
-            const row = document.createElement('div');
-            row.className = 'database-row';
-            row.innerHTML = `<span class="database-url">${entry.url}</span> <span class="database-filename">${entry.filename}</span>`;
-            if (entry.filename === 'Error') {
-                row.querySelector('.database-filename').style.color = '#dc3545';
-                row.querySelector('.database-filename').style.fontWeight = 'bold';
-                row.title = 'Filename extraction failed for this item';
-            }
-            databaseList.appendChild(row);
-        });
-        databaseEntryCount.textContent = database.length;
+    // Function to build a database row; failed items are marked
+    function renderDatabaseRow(entry) {
+        const row = document.createElement('div');
+        row.className = 'database-row virtual-row';
+        const filename = document.createElement('div');
+        filename.className = 'database-filename';
+        filename.textContent = entry.filename;
+        const url = document.createElement('div');
+        url.className = 'database-url';
+        url.textContent = entry.url;
+        if (entry.filename === 'Error') {
+            filename.style.color = '#dc3545';
+            filename.style.fontWeight = 'bold';
+            row.title = 'Filename extraction failed for this item';
+        }
+        row.append(filename, url);
+        return row;
     }
 
     // Function to copy database as CSV
     async function copyDatabaseAsCSV() {
         try {
-            if (!filenameDatabase || filenameDatabase.length === 0) {
+            const allEntries = await loadAllDatabaseEntries();
+            if (allEntries.length === 0) {
                 addDebugLog('No database to copy', 'error');
                 return;
             }
@@ -689,13 +789,13 @@
             csvContent += `,\n`; // Empty row for spacing
             csvContent += 'URL,Filename\n';
             
-            const csvRows = filenameDatabase.map(entry => 
+            const csvRows = allEntries.map(entry => 
                 `"${entry.url}","${entry.filename}"`
             ).join('\n');
             csvContent += csvRows;
             
             await navigator.clipboard.writeText(csvContent);
-            addDebugLog(`Copied ${filenameDatabase.length} database entries as CSV!`, 'success');
+            addDebugLog(`Copied ${allEntries.length} database entries as CSV!`, 'success');
             
         } catch (error) {
             addDebugLog(`Failed to copy database: ${error.message}`, 'error');
@@ -706,10 +806,10 @@
     async function clearFilenameDatabase() {
         try {
             // Clear the database state from storage
-            await browser.storage.local.remove(['filenameDatabase']);
+            await removeFilenameDatabase();
             
             // Clear the current database state
-            filenameDatabase = [];
+            resetDatabaseView();
             
             // Hide the database section
             filenameDatabaseSection.style.display = 'none';
@@ -732,8 +832,8 @@
             extractionResultsSection.style.display = 'none';
             
             // Clear filename database
-            await browser.storage.local.remove(['filenameDatabase']);
-            filenameDatabase = [];
+            await removeFilenameDatabase();
+            resetDatabaseView();
             filenameDatabaseSection.style.display = 'none';
             
             // Clear debug logs (keep one entry)
@@ -803,11 +903,14 @@
                 updateStatus(currentDetection);
             }
             
-            // Update filename database if it changed
-            if (changes.filenameDatabase) {
-                filenameDatabase = changes.filenameDatabase.newValue || [];
-                updateFilenameDatabaseDisplay(filenameDatabase);
-                addDebugLog(`Filename database updated: ${filenameDatabase.length} entries`, 'info');
+            // Apply filename database changes as deltas: new entries go straight into the list
+            if (changes[DATABASE_INDEX_KEY]) {
+                applyDatabaseIndex(changes[DATABASE_INDEX_KEY].newValue || null);
+            }
+            for (const [key, change] of Object.entries(changes)) {
+                if (key.startsWith(DATABASE_ENTRY_PREFIX) && change.newValue && databaseIndex) {
+                    databaseView.set(parseInt(key.slice(DATABASE_ENTRY_PREFIX.length)), change.newValue);
+                }
             }
         }
     });
@@ -0,0 +1,144 @@
+/**
+ * RecurTrack Virtual List
+ * Renders only the visible rows of long sidebar lists
+ */
+
+(function() {
+    'use strict';
+
+    // A scrolling list of fixed-height rows. Only the rows in view (plus a few
+    // above and below) exist in the DOM; a spacer keeps the scrollbar right.
+    // Changes are collected and rendered at most once per animation frame.
+    class VirtualList {
+        // container: the scrolling element (it needs a height or max-height)
+        // options.rowHeight: row height in pixels; longer content is clipped
+        // options.renderRow(item, index): returns the element for a row
+        // options.renderPlaceholder(index): element for rows without an item yet
+        // options.loadRange(start, end): called when rows in view have no item yet
+        constructor(container, options) {
+            this.container = container;
+            this.rowHeight = options.rowHeight;
+            this.renderRow = options.renderRow;
+            this.renderPlaceholder = options.renderPlaceholder || (() => document.createElement('div'));
+            this.loadRange = options.loadRange || null;
+            this.overscan = options.overscan || 8;
+            this.items = [];
+            this.count = 0;
+            this.renderedStart = 0;
+            this.renderedEnd = 0;
+            this.dirty = true;
+            this.frame = null;
+
+            this.spacer = document.createElement('div');
+            this.rows = document.createElement('div');
+            this.rows.style.position = 'absolute';
+            this.rows.style.top = '0';
+            this.rows.style.left = '0';
+            this.rows.style.right = '0';
+            container.style.position = 'relative';
+            container.replaceChildren(this.spacer, this.rows);
+            container.addEventListener('scroll', () => this.scheduleRender(false), { passive: true });
+        }
+
+        // Replace all items
+        setItems(items) {
+            this.items = items.slice();
+            this.count = this.items.length;
+            this.scheduleRender();
+        }
+
+        // Add items at the end; rows out of view cost nothing until scrolled to
+        append(items) {
+            if (items.length === 0) return;
+            const start = this.count;
+            for (const item of items) {
+                this.items.push(item);
+            }
+            this.count = this.items.length;
+            this.scheduleRender(start < this.renderedEnd + this.overscan);
+        }
+
+        // Set the item at index, growing the list if needed
+        set(index, item) {
+            this.items[index] = item;
+            if (index >= this.count) {
+                this.count = index + 1;
+            }
+            this.scheduleRender(index >= this.renderedStart && index < this.renderedEnd + this.overscan);
+        }
+
+        // Set the number of rows; rows without an item show the placeholder
+        setCount(count) {
+            if (this.items.length > count) {
+                this.items.length = count;
+            }
+            this.count = count;
+            this.scheduleRender();
+        }
+
+        clear() {
+            this.items = [];
+            this.count = 0;
+            this.scheduleRender();
+        }
+
+        // Render on the next animation frame; with rowsChanged false the rows are only
+        // rebuilt if the range in view has changed (scrolling, appends out of view)
+        scheduleRender(rowsChanged = true) {
+            if (rowsChanged) {
+                this.dirty = true;
+            }
+            if (this.frame !== null) return;
+            this.frame = requestAnimationFrame(() => {
+                this.frame = null;
+                this.render();
+            });
+        }
+
+        // Render now (also used by the benchmark page)
+        render() {
+            if (this.frame !== null) {
+                cancelAnimationFrame(this.frame);
+                this.frame = null;
+            }
+            this.spacer.style.height = `${this.count * this.rowHeight}px`;
+            // A hidden container has no height yet; render a screenful anyway
+            const viewport = this.container.clientHeight || this.rowHeight * 10;
+            const scrollTop = this.container.scrollTop;
+            const start = Math.max(0, Math.floor(scrollTop / this.rowHeight) - this.overscan);
+            const end = Math.min(this.count, Math.ceil((scrollTop + viewport) / this.rowHeight) + this.overscan);
+            if (!this.dirty && start === this.renderedStart && end === this.renderedEnd) return;
+
+            const fragment = document.createDocumentFragment();
+            let missingStart = -1;
+            let missingEnd = -1;
+            for (let i = start; i < end; i++) {
+                const item = this.items[i];
+                let row;
+                if (item === undefined) {
+                    row = this.renderPlaceholder(i);
+                    if (missingStart < 0) missingStart = i;
+                    missingEnd = i + 1;
+                } else {
+                    row = this.renderRow(item, i);
+                }
+                row.style.height = `${this.rowHeight}px`;
+                row.style.boxSizing = 'border-box';
+                row.style.overflow = 'hidden';
+                fragment.appendChild(row);
+            }
+            this.rows.style.transform = `translateY(${start * this.rowHeight}px)`;
+            this.rows.replaceChildren(fragment);
+            this.renderedStart = start;
+            this.renderedEnd = end;
+            this.dirty = false;
+
+            if (missingStart >= 0 && this.loadRange) {
+                this.loadRange(missingStart, missingEnd);
+            }
+        }
+    }
+
+    window.VirtualList = VirtualList;
+
+})();
@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""
+rdump-native-host.py
+Started by Firefox for the RecurTrack extension; see recurdump/core/native_host.py.
+Register it with 'rdump native-host --install'.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'src'))
+
+from recurdump.core.native_host import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1229 @@
+"""
+rdump bmarks (also available as scripts/rdump-bmarks.py)
+
+Export all bookmarks from a single specified folder (and its subfolders) in the locally installed Firefox web browser to a JSON file.
+
+Required arguments:
+  --dir, -d      Path to the directory where exported bookmarks will be saved (use '.' for current directory)
+  --folder, -f   Name of the folder to search for and export (case-sensitive, matches any folder with this name), or its full path such as 'Bookmarks Menu/Videos/RECURBATE'
+
+Optional arguments:
+  --export-name, -e  Base filename for the exported bookmarks (default: 'firefox_bookmarks')
+  --input-links, -i   Path to a text file with one link per line to compare against the folder. If used, the script will output three text files: links found in the folder, links found only after URL normalization, and links not found.
+  --incremental      Write only what changed since the last incremental export to '<export-name>_delta_NNNNN.json'
+  --compact          Fold all delta files into '<export-name>_snapshot.json' and remove them (no --folder needed)
+  --format           json (default): the nested folder tree; ndjson: one bookmark per line with its folder path
+  --compress         Compress the export with gzip or xz ('.gz'/'.xz' is appended to the filename)
+  --path             Glob of full folder paths to export instead of --folder, e.g. 'Bookmarks Menu/RECURBATE/2025*'
+  --search, -q       Full-text query over bookmark titles and URLs; matches (within --path, if given) are written to '<export-name>_search.ndjson'
+  --reindex          Rebuild the search index even if places.sqlite is unchanged
+  --profiles, -P     Comma-separated Firefox profile names, or 'all': read the folder from each profile concurrently and write one merged '<export-name>_profiles.json'
+  --list-profiles    List the Firefox profiles and exit
+  --list-folders     Print the bookmark folder tree of the --profiles (default: all) and exit
+  --help, -h     Show this help message and exit
+
+If the user provides '.', the script will use the current working directory.
+
+In-process use: export_bookmarks() runs the same export as the command line, export_profiles_bookmarks() the multi-profile export, and compact_deltas() folds delta files.
+
+The folder export is streamed from the database to the output, as nested JSON or NDJSON (--format), optionally gzip- or xz-compressed (--compress).
+
+With --profiles, each profile's places.sqlite is read on its own worker thread. Bookmarks are merged by URL: each appears once, with the folder path it was found under and the names of the profiles that have it.
+
+--path and --search use a search index cached in 'data/cache/': the full path of every folder and an SQLite FTS5 table over bookmark titles and URLs. It is rebuilt only when places.sqlite or its WAL changes, so lookups take milliseconds.
+
+places.sqlite is read in place through a read-only connection. If Firefox holds a lock on it, a consolidated snapshot (database plus WAL) is cached in 'data/cache/' and reused until the database or its WAL changes.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import configparser
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import quote
+import sqlite3
+import tempfile
+import shutil
+import time
+
+from recurdump.utils.paths import default_cache_dir
+from recurdump.utils.profiling import timed_phase
+
+CYAN = '\033[36m'
+BOLD = '\033[1m'
+RESET = '\033[0m'
+HELP_TEXT = f"""
+rdump bmarks
+
+Export all bookmarks from a single specified folder (and its subfolders)
+in the locally installed Firefox web browser to a JSON file, or compare a
+list of links to the folder.
+
+{CYAN}{BOLD}Required arguments:{RESET}
+  --dir, -d           Path to the directory where exported bookmarks will be
+                      saved (use '.' for current directory)
+  --folder, -f        Name of the folder to search for and export
+                      (case-sensitive, matches any folder with this name),
+                      or its full path, e.g. 'Bookmarks Menu/Videos/RECURBATE'
+
+{CYAN}{BOLD}Optional arguments:{RESET}
+  --export-name, -e   Base filename for the exported bookmarks
+                      (default: 'firefox_bookmarks')
+  --input-links, -i   Path to a text file with one link per line to compare
+                      against the folder. If used, the script will output
+                      three text files: links found in the folder, links
+                      found only after URL normalization, and links not found.
+  --incremental       Export only bookmarks added, modified or removed since
+                      the last incremental run, as '<export-name>_delta_NNNNN.json'
+  --compact           Fold all delta files into '<export-name>_snapshot.json'
+                      and remove them (--folder is not needed)
+  --format            json (default): the nested folder tree, '<export-name>.json';
+                      ndjson: one bookmark per line with its folder path,
+                      '<export-name>.ndjson'
+  --compress          gzip or xz: compress the export ('.gz' or '.xz' is
+                      appended to the filename)
+  --path              Glob of full folder paths to export instead of --folder,
+                      e.g. 'Bookmarks Menu/RECURBATE/2025*' ('*' also matches '/')
+  --search, -q        Full-text query over bookmark titles and URLs; the matches
+                      (inside --path, if given) are written, best first, to
+                      '<export-name>_search.ndjson'
+  --reindex           Rebuild the search index even if places.sqlite is unchanged
+  --profiles, -P      Comma-separated Firefox profile names, or 'all': export
+                      the folder from each of them into one merged
+                      '<export-name>_profiles.json'
+  --list-profiles     List the Firefox profiles and exit
+  --list-folders      Print the folder tree of the --profiles (default: all)
+                      and exit
+  --help, -h          Show this help message and exit
+
+{CYAN}{BOLD}Examples:{RESET}
+  rdump bmarks --dir . --folder FAVORITES
+  rdump bmarks -d /path/to/exports -f RECURBATE -e recur_links
+  rdump bmarks -d . -f FAVORITES -i my_links.txt
+  rdump bmarks -d . -f RECURBATE --incremental
+  rdump bmarks -d . -f RECURBATE --format ndjson --compress gzip
+  rdump bmarks -d . --compact
+  rdump bmarks -d . --path "Bookmarks Menu/RECURBATE/2025*"
+  rdump bmarks -d . --search "model14 video*" --path "Bookmarks Menu/RECURBATE"
+  rdump bmarks -d . -f "Bookmarks Menu/Videos/RECURBATE" --profiles all
+  rdump bmarks --list-folders --profiles default-release,work
+
+Incremental exports keep a watermark (the newest dateAdded/lastModified seen)
+and the known bookmark IDs per folder in '<export-name>_state.json'. Each run
+only fetches rows changed since the watermark; removals are found by comparing
+IDs. The first incremental run lists every bookmark as added.
+
+The input file for --input-links should have one link per line, with no
+commas or extra characters. The script will generate '<export-name>_found.txt',
+'<export-name>_normalized.txt' and '<export-name>_not_found.txt' in the output
+directory. Normalization ignores the scheme (http/https), a leading 'www.',
+host case, default ports, trailing slashes, query strings and fragments.
+Each line of '_normalized.txt' is '<input link><TAB><bookmarked link>'. The
+input file is streamed into an on-disk temp table, so memory use does not
+grow with its size.
+
+Exports are written while the bookmarks are read, folder by folder, so memory
+use does not grow with the size of the folder. The JSON has one bookmark per
+line; NDJSON lines are {"id", "title", "url", "dateAdded", "lastModified",
+"folder"}, where "folder" is the path from the exported folder down.
+
+--path and --search read a search index cached in 'data/cache/': the full
+path of every folder and an SQLite FTS5 table over bookmark titles and URLs.
+It is rebuilt only when places.sqlite or its WAL changes, so repeated lookups
+take milliseconds. Every word of a --search query must match; 'word*' matches
+prefixes.
+
+With --profiles, the places.sqlite of every selected profile is read on its
+own worker thread, and the results are merged by URL: each bookmark appears
+once, with its folder path and the list of profiles that have it. The export
+also records what was read from each profile.
+
+places.sqlite is read in place through a read-only connection. If Firefox
+holds a lock on it, a snapshot (database plus WAL) is cached in 'data/cache/'
+and reused until the database or its WAL changes.
+"""
+
+def sqlite_uri(path, **params):
+    query = '&'.join(f"{k}={v}" for k, v in params.items())
+    return f"file:{quote(os.path.abspath(path))}?{query}"
+
+def places_fingerprint(places_path):
+    # Identifies one state of the database: its own and its WAL's mtime and size
+    def stat_key(path):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return [st.st_mtime_ns, st.st_size]
+    return {
+        'path': os.path.abspath(places_path),
+        'db': stat_key(places_path),
+        'wal': stat_key(places_path + '-wal')
+    }
+
+@timed_phase()
+def open_live_places(places_path):
+    # Read-only connection to the live database; raises sqlite3.OperationalError if locked
+    conn = sqlite3.connect(sqlite_uri(places_path, mode='ro'), uri=True, timeout=1.0)
+    try:
+        # Hold one read transaction so every query sees the same state
+        conn.execute("BEGIN")
+        conn.execute("SELECT 1 FROM moz_bookmarks LIMIT 1").fetchall()
+    except sqlite3.Error:
+        conn.close()
+        raise
+    return conn
+
+@timed_phase()
+def build_places_snapshot(places_path, snapshot_path):
+    # Copy the database together with its WAL, let SQLite fold the WAL in, then
+    # write one self-contained file with the online backup API
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(snapshot_path)) as tmp_dir:
+        tmp_db = os.path.join(tmp_dir, 'places.sqlite')
+        shutil.copy2(places_path, tmp_db)
+        if os.path.exists(places_path + '-wal'):
+            shutil.copy2(places_path + '-wal', tmp_db + '-wal')
+        src = sqlite3.connect(tmp_db)
+        dst = sqlite3.connect(snapshot_path + '.tmp')
+        try:
+            src.backup(dst)
+            # Keep the snapshot a single file that opens cleanly read-only
+            dst.execute("PRAGMA journal_mode=DELETE")
+        finally:
+            dst.close()
+            src.close()
+    os.replace(snapshot_path + '.tmp', snapshot_path)
+
+def open_cached_snapshot(places_path, cache_dir):
+    # Returns (connection, reused) for a snapshot keyed on the DB and WAL fingerprint
+    fingerprint = places_fingerprint(places_path)
+    key = hashlib.sha1(fingerprint['path'].encode('utf-8')).hexdigest()[:12]
+    snapshot_path = os.path.join(cache_dir, f"places-snapshot-{key}.sqlite")
+    meta_path = snapshot_path + '.json'
+    reused = False
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            reused = json.load(f) == fingerprint and os.path.exists(snapshot_path)
+    except (OSError, ValueError):
+        pass
+    if not reused:
+        build_places_snapshot(places_path, snapshot_path)
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(fingerprint, f)
+    conn = sqlite3.connect(sqlite_uri(snapshot_path, mode='ro'), uri=True)
+    return conn, reused
+
+def open_places_db(places_path):
+    # Returns a read-only connection without copying the database when possible
+    try:
+        return open_live_places(places_path), 'live database (read-only)'
+    except sqlite3.OperationalError as e:
+        print(f"Note: places.sqlite is locked ({e}); using a cached snapshot")
+    conn, reused = open_cached_snapshot(places_path, default_cache_dir())
+    return conn, 'cached snapshot (reused)' if reused else 'cached snapshot (refreshed)'
+
+def find_firefox_profiles():
+    # Determine platform-specific Firefox config directory
+    if sys.platform.startswith('darwin'):
+        base = Path.home() / 'Library' / 'Application Support' / 'Firefox'
+    elif sys.platform.startswith('win'):
+        base = Path(os.environ.get('APPDATA', '')) / 'Mozilla' / 'Firefox'
+    else:
+        base = Path.home() / '.mozilla' / 'firefox'
+    profiles_ini = base / 'profiles.ini'
+    if not profiles_ini.exists():
+        return []
+    config = configparser.ConfigParser()
+    config.read(profiles_ini)
+    profiles = []
+    for section in config.sections():
+        if section.startswith('Profile'):
+            name = config.get(section, 'Name', fallback='(unknown)')
+            path = config.get(section, 'Path', fallback=None)
+            is_relative = config.getboolean(section, 'IsRelative', fallback=True)
+            abs_path = (base / path) if is_relative and path else (Path(path) if path else None)
+            places = abs_path / 'places.sqlite' if abs_path else None
+            profiles.append({
+                'name': name,
+                'path': str(abs_path) if abs_path else '(unknown)',
+                'places': str(places) if places and places.exists() else None,
+                'exists': abs_path.exists() if abs_path else False
+            })
+    return profiles
+
+def print_profiles_list(profiles):
+    if not profiles:
+        print("No Firefox profiles found.")
+        return
+    name_w = 20
+    path_w = 48
+    db_w = 5
+    # ANSI color codes
+    CYAN = '\033[36m'
+    YELLOW = '\033[33m'
+    RESET = '\033[0m'
+    BOLD = '\033[1m'
+    # Legend
+    print("\nLegend: yes = DB found, no = DB not found\n")
+    # Header (cyan)
+    header = f"{CYAN}{BOLD}{'Profile Name':<{name_w}}  {'Profile Path':<{path_w}}  {'DB':^{db_w}}{RESET}"
+    print(header)
+    # Rows
+    for p in profiles:
+        db = 'yes' if p['places'] else 'no'
+        path_disp = p['path']
+        if len(path_disp) > path_w:
+            path_disp = '...' + path_disp[-(path_w-3):]
+        print(f"{YELLOW}{p['name']:<{name_w}}{RESET}  {path_disp:<{path_w}}  {db:^{db_w}}")
+    print()
+
+def get_profile_by_name(profiles, name):
+    for p in profiles:
+        if p['name'] == name:
+            return p
+    return None
+
+@timed_phase(count=len)
+def fetch_bookmark_folders(conn):
+    # Returns a dict: {folder_id: {'title': ..., 'parent': ..., 'children': [...]}}
+    cur = conn.cursor()
+    # Get all folders
+    cur.execute("""
+        SELECT id, parent, title
+        FROM moz_bookmarks
+        WHERE type=2
+        ORDER BY parent, id
+    """)
+    folders = {}
+    for row in cur.fetchall():
+        folder_id, parent, title = row
+        folders[folder_id] = {'title': title or '(no name)', 'parent': parent, 'children': []}
+    # Build tree
+    for fid, f in folders.items():
+        parent = f['parent']
+        if parent in folders:
+            folders[parent]['children'].append(fid)
+    return folders
+
+def print_folder_tree(folders, root_id=1, prefix="", is_last=True):
+    # Skip '(no name)' root in listings
+    if root_id not in folders or folders[root_id]['title'] == '(no name)':
+        return
+    title = folders[root_id]['title']
+    connector = "└── " if is_last else "├── "
+    print(prefix + connector + title)
+    children = [cid for cid in folders[root_id]['children'] if folders[cid]['title'] != '(no name)']
+    for i, child_id in enumerate(children):
+        last = (i == len(children) - 1)
+        new_prefix = prefix + ("    " if is_last else "│   ")
+        print_folder_tree(folders, child_id, new_prefix, last)
+
+def find_folder_id_by_path(folders, path_parts):
+    # Accept both user-facing and internal names for root folders
+    # Map user-friendly names to internal names
+    name_map = {
+        "Bookmarks Menu": ["Bookmarks Menu", "menu"],
+        "Bookmarks Toolbar": ["Bookmarks Toolbar", "toolbar"],
+        "Other Bookmarks": ["Other Bookmarks", "(unfiled)", "unfiled"],
+        "Mobile Bookmarks": ["Mobile Bookmarks", "mobile"],
+    }
+    if not path_parts:
+        return None, None
+    # Normalize root name
+    root_name = path_parts[0]
+    aliases = [root_name]
+    # Try mapping user-friendly to internal
+    for friendly, names in name_map.items():
+        if root_name in names:
+            root_name = friendly
+            aliases = names
+            break
+    # Root folders are found by title under the places root: their IDs differ
+    # between Firefox versions
+    current_id = None
+    for places_root in (fid for fid, f in folders.items() if f['parent'] not in folders):
+        for child_id in folders[places_root]['children']:
+            if folders[child_id]['title'] in aliases:
+                current_id = child_id
+                break
+    if current_id is None:
+        return None, None
+    current_title = root_name
+    for part in path_parts[1:]:
+        found = False
+        for child_id in folders[current_id]['children']:
+            # Skip '(no name)'
+            if folders[child_id]['title'] == '(no name)':
+                continue
+            if folders[child_id]['title'] == part:
+                current_id = child_id
+                current_title = part
+                found = True
+                break
+        if not found:
+            return None, None
+    return current_id, current_title
+
+# Every folder under the bound folder ID, including the folder itself
+SUBFOLDERS_CTE = """
+    WITH RECURSIVE subfolders(id) AS (
+        SELECT ?
+        UNION ALL
+        SELECT b.id
+        FROM moz_bookmarks b
+        JOIN subfolders s ON b.parent = s.id
+        WHERE b.type = 2
+    )
+"""
+# Compact JSON for streamed exports; one encoder instead of one per json.dumps() call
+JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+EXPORT_FORMATS = ('json', 'ndjson')
+COMPRESS_SUFFIXES = {'gzip': '.gz', 'xz': '.xz'}
+# Newest of a bookmark's dateAdded/lastModified, used as the delta watermark
+BOOKMARK_STAMP_SQL = "max(coalesce(b.dateAdded, 0), coalesce(b.lastModified, 0))"
+
+@timed_phase()
+def iter_bookmarks_under_folder(conn, folder_id, since=None):
+    # Yield every bookmark (type=1) under folder_id and its subfolders as a dict:
+    # {id, title, url, dateAdded, lastModified, parent}. The folder subtree is
+    # resolved by a recursive CTE, so nothing is loaded up front and there is no
+    # bound-parameter list to overflow on large folders. With 'since', only
+    # bookmarks added or modified after that timestamp are returned.
+    sql = SUBFOLDERS_CTE + """
+        SELECT b.id, b.title, p.url, b.dateAdded, b.lastModified, b.parent
+        FROM subfolders s
+        JOIN moz_bookmarks b ON b.parent = s.id
+        LEFT JOIN moz_places p ON b.fk = p.id
+        WHERE b.type = 1
+    """
+    params = [folder_id]
+    if since is not None:
+        sql += f" AND {BOOKMARK_STAMP_SQL} > ?"
+        params.append(since)
+    for row in conn.execute(sql, params):
+        yield {
+            'id': row[0],
+            'title': row[1] or '',
+            'url': row[2] or '',
+            'dateAdded': row[3],
+            'lastModified': row[4],
+            'parent': row[5]
+        }
+
+def fetch_bookmark_stamps(conn, folder_id):
+    # Returns {bookmark_id: stamp} for the folder subtree without touching moz_places
+    cur = conn.execute(SUBFOLDERS_CTE + f"""
+        SELECT b.id, {BOOKMARK_STAMP_SQL}
+        FROM subfolders s
+        JOIN moz_bookmarks b ON b.parent = s.id
+        WHERE b.type = 1
+    """, (folder_id,))
+    return dict(cur)
+
+def normalize_url(url):
+    # Canonical form used to match variants of the same link:
+    # 'https://www.recu.me/m/video/1/?a=b#c' -> 'recu.me/m/video/1'
+    url = url.strip()
+    scheme_end = url.find('://')
+    if scheme_end != -1:
+        url = url[scheme_end + 3:]
+    url = url.split('#', 1)[0].split('?', 1)[0]
+    host, _, path = url.partition('/')
+    host = host.lower()
+    if host.endswith(':80') or host.endswith(':443'):
+        host = host.rsplit(':', 1)[0]
+    if host.startswith('www.'):
+        host = host[4:]
+    path = path.rstrip('/')
+    return host + '/' + path if path else host
+
+def url_key(text):
+    # Signed 64-bit digest so it fits an SQLite INTEGER column
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little', signed=True)
+
+def iter_input_links(input_path):
+    with open(input_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            link = line.strip()
+            if link:
+                yield link
+
+def write_lines(lines, out_path):
+    count = 0
+    with open(out_path, 'w', encoding='utf-8') as f:
+        for line in lines:
+            f.write(line + '\n')
+            count += 1
+    return count
+
+@timed_phase()
+def compare_links(conn, folder_ids, input_path, dir_path, base_name):
+    # Both sides go into temp tables keyed on the exact URL and indexed on the
+    # normalized key, so SQLite does the dedup, the joins and the sorting on disk
+    conn.execute("PRAGMA temp_store=FILE")
+    conn.execute("CREATE TEMP TABLE folder_urls (url TEXT PRIMARY KEY, norm_key INTEGER NOT NULL) WITHOUT ROWID")
+    conn.execute("CREATE TEMP TABLE input_links (url TEXT PRIMARY KEY, norm_key INTEGER NOT NULL) WITHOUT ROWID")
+    for folder_id in folder_ids:
+        bookmark_urls = (bm['url'] for bm in iter_bookmarks_under_folder(conn, folder_id) if bm['url'])
+        conn.executemany("INSERT OR IGNORE INTO temp.folder_urls VALUES (?, ?)",
+                         ((url, url_key(normalize_url(url))) for url in bookmark_urls))
+    conn.execute("CREATE INDEX temp.folder_urls_norm ON folder_urls (norm_key)")
+    conn.executemany("INSERT OR IGNORE INTO temp.input_links VALUES (?, ?)",
+                     ((link, url_key(normalize_url(link))) for link in iter_input_links(input_path)))
+    exact_match = "EXISTS (SELECT 1 FROM temp.folder_urls f WHERE f.url = i.url)"
+    norm_match = "(SELECT min(f.url) FROM temp.folder_urls f WHERE f.norm_key = i.norm_key)"
+    found_path = os.path.join(dir_path, base_name + '_found.txt')
+    normalized_path = os.path.join(dir_path, base_name + '_normalized.txt')
+    not_found_path = os.path.join(dir_path, base_name + '_not_found.txt')
+    cur = conn.execute(f"SELECT i.url FROM temp.input_links i WHERE {exact_match} ORDER BY i.url")
+    found = write_lines((row[0] for row in cur), found_path)
+    cur = conn.execute(f"""
+        SELECT url, match FROM (
+            SELECT i.url, {norm_match} AS match FROM temp.input_links i WHERE NOT {exact_match}
+        ) WHERE match IS NOT NULL ORDER BY url
+    """)
+    normalized = write_lines((f"{url}\t{match}" for url, match in cur), normalized_path)
+    cur = conn.execute(f"""
+        SELECT url FROM (
+            SELECT i.url, {norm_match} AS match FROM temp.input_links i WHERE NOT {exact_match}
+        ) WHERE match IS NULL ORDER BY url
+    """)
+    not_found = write_lines((row[0] for row in cur), not_found_path)
+    print(f"Exported {found} found links to: {found_path}")
+    print(f"Exported {normalized} links matched after normalization to: {normalized_path}")
+    print(f"Exported {not_found} not found links to: {not_found_path}")
+
+def write_json_atomic(data, path):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def load_delta_state(state_path):
+    # {'sequence': int, 'folders': {folder_id: {'title', 'watermark', 'ids'}}}
+    if not os.path.exists(state_path):
+        return {'sequence': 0, 'folders': {}}
+    with open(state_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def compute_folder_delta(conn, folder_id, folder_state):
+    # Returns (delta, new_folder_state) for one exported folder
+    stamps = fetch_bookmark_stamps(conn, folder_id)
+    known_ids = set(folder_state.get('ids', []))
+    watermark = folder_state.get('watermark')
+    added = []
+    modified = []
+    for bm in iter_bookmarks_under_folder(conn, folder_id, since=watermark):
+        (modified if bm['id'] in known_ids else added).append(bm)
+    # Bookmarks that appeared without a newer timestamp (e.g. restored from backup)
+    unseen = set(stamps) - known_ids - set(bm['id'] for bm in added)
+    if unseen:
+        added.extend(bm for bm in iter_bookmarks_under_folder(conn, folder_id) if bm['id'] in unseen)
+    removed = sorted(known_ids - set(stamps))
+    new_watermark = max(max(stamps.values(), default=0), watermark or 0)
+    delta = {
+        'since': watermark,
+        'watermark': new_watermark,
+        'added': added,
+        'modified': modified,
+        'removed': removed
+    }
+    return delta, {'watermark': new_watermark, 'ids': sorted(stamps)}
+
+@timed_phase()
+def export_bookmarks_delta(conn, folders, folder_ids, dir_path, base_name):
+    state_path = os.path.join(dir_path, base_name + '_state.json')
+    state = load_delta_state(state_path)
+    folder_deltas = []
+    changes = 0
+    for folder_id in folder_ids:
+        key = str(folder_id)
+        delta, folder_state = compute_folder_delta(conn, folder_id, state['folders'].get(key, {}))
+        folder_state['title'] = folders[folder_id]['title']
+        state['folders'][key] = folder_state
+        delta = {'id': folder_id, 'title': folders[folder_id]['title'], **delta}
+        folder_deltas.append(delta)
+        changes += len(delta['added']) + len(delta['modified']) + len(delta['removed'])
+        print(f"Folder '{delta['title']}' ({folder_id}): {len(delta['added'])} added, "
+              f"{len(delta['modified'])} modified, {len(delta['removed'])} removed")
+    if not changes:
+        print("No bookmark changes since the last incremental export.")
+        return
+    state['sequence'] += 1
+    delta_path = os.path.join(dir_path, f"{base_name}_delta_{state['sequence']:05d}.json")
+    write_json_atomic({
+        'sequence': state['sequence'],
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'folders': folder_deltas
+    }, delta_path)
+    # The state only advances once the delta is safely on disk
+    write_json_atomic(state, state_path)
+    print(f"Exported delta: {delta_path}")
+
+@timed_phase()
+def compact_deltas(dir_path, base_name):
+    # Apply every delta newer than the snapshot, in sequence order, then remove them
+    snapshot_path = os.path.join(dir_path, base_name + '_snapshot.json')
+    snapshot = {'sequence': 0, 'folders': []}
+    if os.path.exists(snapshot_path):
+        with open(snapshot_path, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+    folders = {}
+    for folder in snapshot['folders']:
+        folders[folder['id']] = {**folder, 'bookmarks': {bm['id']: bm for bm in folder['bookmarks']}}
+    # Exactly '<base_name>_delta_<n>.json', in numeric order: another export
+    # name sharing the prefix must not match, and sequences may pass 99999
+    pattern = re.compile(re.escape(base_name) + r'_delta_(\d+)\.json')
+    matches = (pattern.fullmatch(name) for name in os.listdir(dir_path))
+    delta_files = [m.group(0) for m in sorted((m for m in matches if m), key=lambda m: int(m.group(1)))]
+    applied = []
+    for name in delta_files:
+        path = os.path.join(dir_path, name)
+        with open(path, 'r', encoding='utf-8') as f:
+            delta = json.load(f)
+        if delta['sequence'] <= snapshot['sequence']:
+            applied.append(path)
+            continue
+        for fd in delta['folders']:
+            folder = folders.setdefault(fd['id'], {'id': fd['id'], 'title': fd['title'], 'bookmarks': {}})
+            folder['title'] = fd['title']
+            folder['watermark'] = fd['watermark']
+            for bm in fd['added'] + fd['modified']:
+                folder['bookmarks'][bm['id']] = bm
+            for bm_id in fd['removed']:
+                folder['bookmarks'].pop(bm_id, None)
+        snapshot['sequence'] = delta['sequence']
+        applied.append(path)
+    if not applied:
+        print("No delta files to compact.")
+        return
+    snapshot = {
+        'sequence': snapshot['sequence'],
+        'compacted': datetime.now().isoformat(timespec='seconds'),
+        'folders': [
+            {**folder, 'bookmarks': [folder['bookmarks'][k] for k in sorted(folder['bookmarks'])]}
+            for folder in folders.values()
+        ]
+    }
+    write_json_atomic(snapshot, snapshot_path)
+    for path in applied:
+        os.remove(path)
+    total = sum(len(folder['bookmarks']) for folder in snapshot['folders'])
+    print(f"Compacted {len(applied)} delta files into: {snapshot_path} ({total} bookmarks)")
+
+def export_bookmarks_json(bookmarks, out_path):
+    import json
+    with open(out_path, 'w', encoding='utf-8') as f:
+        json.dump(bookmarks, f, indent=2, ensure_ascii=False)
+    print(f"Exported JSON: {out_path}")
+
+def build_folder_tree(folders, bookmarks, root_ids):
+    # Build a nested dict structure for JSON export
+    bookmark_by_parent = {}
+    for bm in bookmarks:
+        bookmark_by_parent.setdefault(bm['parent'], []).append({
+            'id': bm['id'],
+            'title': bm['title'],
+            'url': bm['url'],
+            'dateAdded': bm['dateAdded'],
+            'lastModified': bm['lastModified'],
+        })
+    def build_node(folder_id):
+        folder = folders[folder_id]
+        node = {
+            'id': folder_id,
+            'title': folder['title'],
+            'folders': [],
+            'bookmarks': bookmark_by_parent.get(folder_id, [])
+        }
+        for child_id in folder['children']:
+            node['folders'].append(build_node(child_id))
+        return node
+    return [build_node(root_id) for root_id in root_ids if root_id in folders]
+
+def export_bookmarks_json_with_folders(bookmarks, folders, out_path, root_ids):
+    import json
+    tree = build_folder_tree(folders, bookmarks, root_ids)
+    with open(out_path, 'w', encoding='utf-8') as f:
+        json.dump(tree, f, indent=2, ensure_ascii=False)
+    print(f"Exported JSON: {out_path}")
+
+def find_folders_by_name(folders, name):
+    # Return a list of folder IDs whose title matches 'name' (case-sensitive)
+    return [fid for fid, f in folders.items() if f['title'] == name]
+
+def resolve_folder_ids(folders, folder):
+    # A full path ('Bookmarks Menu/Videos/RECURBATE') selects that one folder;
+    # otherwise every folder named 'folder' is selected
+    if '/' in folder:
+        folder_id, _ = find_folder_id_by_path(folders, [part for part in folder.split('/') if part])
+        if folder_id is not None:
+            return [folder_id]
+    return find_folders_by_name(folders, folder)
+
+# Search index: a cached copy of the folder tree with full paths and an FTS5
+# table over bookmark titles and URLs, rebuilt when places.sqlite changes
+SEARCH_INDEX_VERSION = 1
+# User-facing names of the root folders in full paths
+ROOT_FOLDER_TITLES = {
+    'menu': 'Bookmarks Menu',
+    'toolbar': 'Bookmarks Toolbar',
+    'unfiled': 'Other Bookmarks',
+    'mobile': 'Mobile Bookmarks',
+    'tags': 'Tags',
+}
+SEARCH_INDEX_SCHEMA = """
+    CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+    CREATE TABLE folders (id INTEGER PRIMARY KEY, parent INTEGER, title TEXT NOT NULL, path TEXT NOT NULL);
+    CREATE INDEX folders_path ON folders (path);
+    CREATE TABLE bookmarks (
+        id INTEGER PRIMARY KEY,
+        folder_id INTEGER NOT NULL,
+        title TEXT NOT NULL,
+        url TEXT NOT NULL,
+        dateAdded INTEGER,
+        lastModified INTEGER
+    );
+    CREATE INDEX bookmarks_folder ON bookmarks (folder_id);
+    CREATE VIRTUAL TABLE bookmarks_fts USING fts5(
+        title, url, content='bookmarks', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    );
+"""
+
+def folder_full_paths(folders):
+    # {folder_id: 'Bookmarks Menu/RECURBATE/2025'} for every folder below the places root
+    paths = {}
+    for folder_id in folders:
+        chain = []
+        current = folder_id
+        while current in folders and current not in paths and folders[current]['parent'] in folders:
+            chain.append(current)
+            current = folders[current]['parent']
+        base = paths.get(current)
+        for fid in reversed(chain):
+            title = folders[fid]['title']
+            base = f"{base}/{title}" if base is not None else ROOT_FOLDER_TITLES.get(title, title)
+            paths[fid] = base
+    return paths
+
+def search_index_path(places_path):
+    key = hashlib.sha1(os.path.abspath(places_path).encode('utf-8')).hexdigest()[:12]
+    return os.path.join(default_cache_dir(), f"rdump-bmarks-index-{key}.sqlite")
+
+def search_index_state(index_path):
+    # The fingerprint the index was built from, or None when it is missing or unreadable
+    if not os.path.exists(index_path):
+        return None
+    try:
+        index = sqlite3.connect(sqlite_uri(index_path, mode='ro'), uri=True)
+        try:
+            row = index.execute("SELECT value FROM meta WHERE key='state'").fetchone()
+        finally:
+            index.close()
+        return json.loads(row[0]) if row else None
+    except (sqlite3.Error, ValueError):
+        return None
+
+@timed_phase(count=lambda result: result)
+def build_search_index(conn, folders, index_path, state):
+    # Written to a temp file and moved into place, so readers never see half an index
+    tmp_path = index_path + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    paths = folder_full_paths(folders)
+    index = sqlite3.connect(tmp_path)
+    try:
+        index.execute("PRAGMA journal_mode=OFF")
+        index.execute("PRAGMA synchronous=OFF")
+        index.executescript(SEARCH_INDEX_SCHEMA)
+        index.executemany("INSERT INTO folders (id, parent, title, path) VALUES (?, ?, ?, ?)",
+                          ((fid, folders[fid]['parent'], folders[fid]['title'], path) for fid, path in paths.items()))
+        index.executemany("INSERT INTO bookmarks (id, folder_id, title, url, dateAdded, lastModified) VALUES (?, ?, ?, ?, ?, ?)", (
+            (row[0], row[1], row[2] or '', row[3] or '', row[4], row[5])
+            for row in conn.execute("""
+                SELECT b.id, b.parent, b.title, p.url, b.dateAdded, b.lastModified
+                FROM moz_bookmarks b
+                LEFT JOIN moz_places p ON b.fk = p.id
+                WHERE b.type = 1
+            """)
+        ))
+        index.execute("INSERT INTO bookmarks_fts (rowid, title, url) SELECT id, title, url FROM bookmarks")
+        index.execute("INSERT INTO bookmarks_fts (bookmarks_fts) VALUES ('optimize')")
+        index.execute("INSERT INTO meta (key, value) VALUES ('state', ?)", (json.dumps(state),))
+        count = index.execute("SELECT count(*) FROM bookmarks").fetchone()[0]
+        index.commit()
+    finally:
+        index.close()
+    os.replace(tmp_path, index_path)
+    return count
+
+def open_search_index(places_path, reindex=False, conn=None, folders=None):
+    # Read-only connection to the search index of places_path, rebuilt first
+    # when the database (or its WAL) changed since it was built. conn and
+    # folders, when the caller has them, save reopening places.sqlite.
+    index_path = search_index_path(places_path)
+    state = {'version': SEARCH_INDEX_VERSION, 'places': places_fingerprint(places_path)}
+    if reindex or search_index_state(index_path) != state:
+        start = time.perf_counter()
+        own_conn = conn is None
+        if own_conn:
+            conn, _ = open_places_db(places_path)
+        try:
+            count = build_search_index(conn, folders or fetch_bookmark_folders(conn), index_path, state)
+        finally:
+            if own_conn:
+                conn.close()
+        print(f"Search index: rebuilt ({count} bookmarks) in {time.perf_counter() - start:.2f}s: {index_path}")
+    return sqlite3.connect(sqlite_uri(index_path, mode='ro'), uri=True)
+
+def find_folders_by_glob(index, pattern):
+    # IDs of the folders whose full path matches pattern (SQLite GLOB: case-
+    # sensitive, '*' also matches '/'). Folders inside another selected folder
+    # are dropped, as exports include subfolders. Sibling folders may share a
+    # path, so every ID is kept.
+    folder_ids = []
+    selected_paths = set()
+    for folder_id, path in index.execute("SELECT id, path FROM folders WHERE path GLOB ? ORDER BY path", (pattern,)):
+        parts = path.split('/')
+        if not any('/'.join(parts[:i]) in selected_paths for i in range(1, len(parts))):
+            folder_ids.append(folder_id)
+            selected_paths.add(path)
+    return folder_ids
+
+def fts_query(text):
+    # Every word of the query must match; words are quoted so URLs need no
+    # escaping, and a trailing '*' keeps its prefix meaning ('model1*')
+    terms = []
+    for word in text.split():
+        prefix = word.endswith('*')
+        word = word.rstrip('*').replace('"', '""')
+        if word:
+            terms.append(f'"{word}"' + ('*' if prefix else ''))
+    return ' '.join(terms)
+
+@timed_phase()
+def search_bookmarks(index, query, folder_pattern=None, limit=None):
+    # Yield the bookmarks matching the full-text query, best first, each with
+    # the full path of its folder; folder_pattern limits them to the folders
+    # matching that path glob and their subfolders
+    sql = """
+        SELECT b.id, b.title, b.url, b.dateAdded, b.lastModified, f.path
+        FROM bookmarks_fts
+        JOIN bookmarks b ON b.id = bookmarks_fts.rowid
+        JOIN folders f ON f.id = b.folder_id
+        WHERE bookmarks_fts MATCH ?
+    """
+    params = [fts_query(query)]
+    if folder_pattern:
+        sql += " AND (f.path GLOB ? OR f.path GLOB ?)"
+        params += [folder_pattern, folder_pattern + '/*']
+    sql += " ORDER BY rank"
+    if limit:
+        sql += " LIMIT ?"
+        params.append(limit)
+    for row in index.execute(sql, params):
+        yield {'id': row[0], 'title': row[1], 'url': row[2], 'dateAdded': row[3], 'lastModified': row[4], 'folder': row[5]}
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Export all bookmarks from a single specified folder (and its subfolders) in the locally installed Firefox web browser to a JSON file, or compare a list of links to the folder.",
+        add_help=False,
+        usage=HELP_TEXT
+    )
+    parser.add_argument('--dir', '-d', required=False, help='Directory to save exported bookmarks (use "." for current directory)')
+    parser.add_argument('--folder', '-f', required=False, help='Name of the folder to search for and export (case-sensitive)')
+    parser.add_argument('--export-name', '-e', default='firefox_bookmarks', help='Base filename for exported bookmarks (default: firefox_bookmarks)')
+    parser.add_argument('--input-links', '-i', help='Path to a text file with one link per line to compare against the folder. If used, the script will output three text files: links found in the folder, links found after URL normalization, and links not found.')
+    parser.add_argument('--incremental', action='store_true', help='Export only bookmarks changed since the last incremental export')
+    parser.add_argument('--compact', action='store_true', help='Fold all delta files into a full snapshot and remove them')
+    parser.add_argument('--format', choices=EXPORT_FORMATS, default='json', help='Export as nested JSON or as NDJSON (one bookmark per line)')
+    parser.add_argument('--compress', choices=sorted(COMPRESS_SUFFIXES), default=None, help='Compress the export with gzip or xz')
+    parser.add_argument('--path', help="Glob of full folder paths to export, e.g. 'Bookmarks Menu/RECURBATE/2025*'")
+    parser.add_argument('--search', '-q', help='Full-text query over bookmark titles and URLs')
+    parser.add_argument('--reindex', action='store_true', help='Rebuild the search index even if places.sqlite is unchanged')
+    parser.add_argument('--profiles', '-P', help="Comma-separated Firefox profile names, or 'all', to export from concurrently")
+    parser.add_argument('--list-profiles', action='store_true', help='List the Firefox profiles and exit')
+    parser.add_argument('--list-folders', action='store_true', help='Print the bookmark folder tree of the profiles and exit')
+    parser.add_argument('--help', '-h', action='store_true', help='Show this help message and exit')
+    return parser.parse_args(argv)
+
+def build_export_tree(folders, bookmarks, folder_id):
+    # Build a nested dict structure for JSON export starting from folder_id
+    bookmark_by_parent = {}
+    for bm in bookmarks:
+        bookmark_by_parent.setdefault(bm['parent'], []).append({
+            'id': bm['id'],
+            'title': bm['title'],
+            'url': bm['url'],
+            'dateAdded': bm['dateAdded'],
+            'lastModified': bm['lastModified'],
+        })
+    def build_node(fid):
+        folder = folders[fid]
+        node = {
+            'id': fid,
+            'title': folder['title'],
+            'bookmarks': bookmark_by_parent.get(fid, []),
+            'folders': [build_node(cid) for cid in folder['children']]
+        }
+        return node
+    return build_node(folder_id)
+
+def find_default_places():
+    # The first profile that has a bookmarks database
+    for profile in find_firefox_profiles():
+        if profile['places']:
+            return profile['places']
+    return None
+
+def iter_folder_bookmarks(conn, folder_id):
+    # Bookmarks directly in folder_id, in Firefox's order (served by the parent index)
+    cur = conn.execute("""
+        SELECT b.id, b.title, p.url, b.dateAdded, b.lastModified
+        FROM moz_bookmarks b
+        LEFT JOIN moz_places p ON b.fk = p.id
+        WHERE b.parent = ? AND b.type = 1
+        ORDER BY b.position
+    """, (folder_id,))
+    for row in cur:
+        yield {'id': row[0], 'title': row[1] or '', 'url': row[2] or '', 'dateAdded': row[3], 'lastModified': row[4]}
+
+def open_export(path, compress=None):
+    # Text stream for an export file, gzip- or xz-compressed on request
+    if compress == 'gzip':
+        import gzip
+        return gzip.open(path, 'wt', encoding='utf-8', compresslevel=6)
+    if compress == 'xz':
+        import lzma
+        # Preset 1: a 1 MiB dictionary (~9 MB of encoder state) compresses exports
+        # nearly as well as the default preset 6 at over 10x the speed
+        return lzma.open(path, 'wt', encoding='utf-8', preset=1)
+    return open(path, 'w', encoding='utf-8')
+
+def write_folder_json(out, conn, folders, folder_id):
+    # One folder as {"id", "title", "bookmarks", "folders"} (the shape of
+    # build_export_tree()), written as its bookmarks are read, one per line
+    folder = folders[folder_id]
+    out.write(f'{{"id":{folder_id},"title":{JSON_ENCODER.encode(folder["title"])},"bookmarks":[')
+    separator = '\n'
+    for bm in iter_folder_bookmarks(conn, folder_id):
+        out.write(separator + JSON_ENCODER.encode(bm))
+        separator = ',\n'
+    out.write('],"folders":[')
+    separator = '\n'
+    for child_id in folder['children']:
+        out.write(separator)
+        write_folder_json(out, conn, folders, child_id)
+        separator = ',\n'
+    out.write(']}')
+
+def write_folder_ndjson(out, conn, folders, folder_id):
+    # One line per bookmark under folder_id, with its folder path; returns the count
+    paths = {}
+    count = 0
+    for bm in iter_bookmarks_under_folder(conn, folder_id):
+        bm['folder'] = folder_path_of(folders, bm.pop('parent'), folder_id, paths)
+        out.write(JSON_ENCODER.encode(bm) + '\n')
+        count += 1
+    return count
+
+@timed_phase()
+def export_folder_json(conn, folders, folder_ids, dir_path, base_name, output_format='json', compress=None):
+    # Stream the folders to '<base_name>.json' (nested, a list when several
+    # folders match) or '<base_name>.ndjson', plus '.gz'/'.xz' when compressed.
+    # Only the folder tree is held in memory, whatever the number of bookmarks.
+    json_path = os.path.join(dir_path, base_name + '.' + output_format + COMPRESS_SUFFIXES.get(compress, ''))
+    tmp_path = json_path + '.tmp'
+    try:
+        with open_export(tmp_path, compress) as out:
+            if output_format == 'ndjson':
+                for folder_id in folder_ids:
+                    write_folder_ndjson(out, conn, folders, folder_id)
+            elif len(folder_ids) == 1:
+                write_folder_json(out, conn, folders, folder_ids[0])
+                out.write('\n')
+            else:
+                out.write('[')
+                for i, folder_id in enumerate(folder_ids):
+                    out.write(',\n' if i else '\n')
+                    write_folder_json(out, conn, folders, folder_id)
+                out.write('\n]\n')
+    except BaseException:
+        # Never leave a partial export behind (query error, full disk, Ctrl-C)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, json_path)
+    print(f"Exported folder structure to: {json_path}")
+
+def export_search_results(query, dir_path, export_name='firefox_bookmarks', folder_pattern=None, places_path=None,
+                          compress=None, reindex=False):
+    # Write the bookmarks matching the full-text query to
+    # '<export_name>_search.ndjson', best match first. Returns the number written;
+    # places.sqlite is only opened when the search index has to be rebuilt.
+    places_path = places_path or find_default_places()
+    if not places_path:
+        raise FileNotFoundError("No Firefox profile with a bookmarks database found.")
+    index = open_search_index(places_path, reindex)
+    out_path = os.path.join(dir_path, export_name + '_search.ndjson' + COMPRESS_SUFFIXES.get(compress, ''))
+    start = time.perf_counter()
+    count = 0
+    try:
+        with open_export(out_path + '.tmp', compress) as out:
+            for bm in search_bookmarks(index, query, folder_pattern):
+                out.write(JSON_ENCODER.encode(bm) + '\n')
+                count += 1
+    except sqlite3.Error:
+        os.remove(out_path + '.tmp')
+        raise
+    finally:
+        index.close()
+    os.replace(out_path + '.tmp', out_path)
+    print(f"Found {count} bookmarks matching '{query}' in {(time.perf_counter() - start) * 1000:.1f} ms; exported to: {out_path}")
+    return count
+
+def export_bookmarks(folder, dir_path, export_name='firefox_bookmarks', input_links=None, incremental=False, places_path=None,
+                     output_format='json', compress=None, folder_pattern=None, reindex=False):
+    # In-process equivalent of the command line. Returns False when no folder
+    # named 'folder' (or, with folder_pattern, no folder whose full path matches
+    # that glob) exists; raises FileNotFoundError without a bookmarks database.
+    # output_format ('json' or 'ndjson') and compress (None, 'gzip' or 'xz')
+    # apply to the default JSON export.
+    places_path = places_path or find_default_places()
+    if not places_path:
+        raise FileNotFoundError("No Firefox profile with a bookmarks database found.")
+    # One read-only connection is shared by every query below
+    conn, source = open_places_db(places_path)
+    print(f"Reading bookmarks from {source}: {places_path}")
+    try:
+        folders = fetch_bookmark_folders(conn)
+        if folder_pattern:
+            index = open_search_index(places_path, reindex, conn, folders)
+            try:
+                folder_ids = find_folders_by_glob(index, folder_pattern)
+            finally:
+                index.close()
+        else:
+            folder_ids = resolve_folder_ids(folders, folder)
+        if not folder_ids:
+            return False
+        if incremental:
+            export_bookmarks_delta(conn, folders, folder_ids, dir_path, export_name)
+        elif input_links:
+            compare_links(conn, folder_ids, input_links, dir_path, export_name)
+        else:
+            # Default: export folder structure as JSON
+            export_folder_json(conn, folders, folder_ids, dir_path, export_name, output_format, compress)
+    finally:
+        conn.close()
+    return True
+
+def select_profiles(profiles, names):
+    # 'all' or comma-separated profile names. Returns (profiles with a bookmarks
+    # database, requested names that do not exist)
+    if names.strip().lower() == 'all':
+        wanted = list(profiles)
+        unknown = []
+    else:
+        requested = [name.strip() for name in names.split(',') if name.strip()]
+        wanted = [p for p in profiles if p['name'] in requested]
+        unknown = [name for name in requested if get_profile_by_name(profiles, name) is None]
+    for p in wanted:
+        if not p['places']:
+            print(f"Note: Profile '{p['name']}' has no bookmarks database; skipped")
+    return [p for p in wanted if p['places']], unknown
+
+def folder_path_of(folders, folder_id, top_id, cache):
+    # 'RECURBATE/sub/subsub' for a folder below the exported folder top_id
+    key = (folder_id, top_id)
+    if key not in cache:
+        if folder_id == top_id or folders.get(folder_id) is None:
+            cache[key] = folders[top_id]['title']
+        else:
+            parent = folder_path_of(folders, folders[folder_id]['parent'], top_id, cache)
+            cache[key] = parent + '/' + folders[folder_id]['title']
+    return cache[key]
+
+@timed_phase(count=lambda result: len(result['bookmarks']))
+def read_profile_bookmarks(profile, folder):
+    # Runs on a worker thread with its own connection. Returns the profile's
+    # bookmarks under the selected folders, each with its folder path.
+    conn, source = open_places_db(profile['places'])
+    try:
+        folders = fetch_bookmark_folders(conn)
+        folder_ids = resolve_folder_ids(folders, folder)
+        bookmarks = []
+        paths = {}
+        for folder_id in folder_ids:
+            for bm in iter_bookmarks_under_folder(conn, folder_id):
+                bm['folder'] = folder_path_of(folders, bm['parent'], folder_id, paths)
+                bookmarks.append(bm)
+    finally:
+        conn.close()
+    return {'profile': profile, 'source': source, 'folders': len(folder_ids), 'bookmarks': bookmarks}
+
+def merge_profile_bookmarks(results):
+    # One entry per URL, in profile order: the earliest dateAdded wins the title
+    # and folder, and 'profiles' lists every profile that has the bookmark
+    merged = {}
+    for result in results:
+        name = result['profile']['name']
+        for bm in result['bookmarks']:
+            if not bm['url']:
+                continue
+            entry = merged.get(bm['url'])
+            if entry is None:
+                merged[bm['url']] = {
+                    'url': bm['url'],
+                    'title': bm['title'],
+                    'folder': bm['folder'],
+                    'dateAdded': bm['dateAdded'],
+                    'lastModified': bm['lastModified'],
+                    'profiles': [name],
+                }
+                continue
+            if name not in entry['profiles']:
+                entry['profiles'].append(name)
+            if (bm['dateAdded'] or 0) < (entry['dateAdded'] or 0):
+                entry.update(title=bm['title'], folder=bm['folder'], dateAdded=bm['dateAdded'])
+            entry['lastModified'] = max(entry['lastModified'] or 0, bm['lastModified'] or 0) or None
+    return sorted(merged.values(), key=lambda entry: (entry['dateAdded'] or 0, entry['url']))
+
+@timed_phase()
+def export_profiles_bookmarks(folder, dir_path, profiles, export_name='firefox_bookmarks'):
+    # Read the folder from every profile on its own thread (SQLite releases the
+    # GIL while it reads) and write one merged export to
+    # '<export_name>_profiles.json'. Returns the number of bookmarks written, or
+    # None when no profile has the folder.
+    from concurrent.futures import ThreadPoolExecutor
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, len(profiles)), thread_name_prefix='rdump-profile') as pool:
+        futures = [pool.submit(read_profile_bookmarks, profile, folder) for profile in profiles]
+        for profile, future in zip(profiles, futures):
+            try:
+                result = future.result()
+            except sqlite3.Error as e:
+                print(f"Warning: Could not read profile '{profile['name']}' ({e})")
+                continue
+            print(f"Profile '{profile['name']}': {len(result['bookmarks'])} bookmarks in "
+                  f"{result['folders']} folders, from {result['source']}")
+            results.append(result)
+    if not any(result['folders'] for result in results):
+        return None
+    bookmarks = merge_profile_bookmarks(results)
+    json_path = os.path.join(dir_path, export_name + '_profiles.json')
+    write_json_atomic({
+        'folder': folder,
+        'exported': datetime.now().isoformat(timespec='seconds'),
+        'profiles': [
+            {
+                'name': result['profile']['name'],
+                'path': result['profile']['path'],
+                'folders': result['folders'],
+                'bookmarks': len(result['bookmarks']),
+            }
+            for result in results
+        ],
+        'bookmarks': bookmarks,
+    }, json_path)
+    read = sum(len(result['bookmarks']) for result in results)
+    print(f"Exported {len(bookmarks)} bookmarks ({read - len(bookmarks)} duplicates merged) "
+          f"from {len(results)} profiles to: {json_path}")
+    return len(bookmarks)
+
+def list_profile_folders(profiles):
+    for profile in profiles:
+        conn, source = open_places_db(profile['places'])
+        try:
+            folders = fetch_bookmark_folders(conn)
+        finally:
+            conn.close()
+        print(f"\n{CYAN}{BOLD}{profile['name']}{RESET} ({source})")
+        for places_root in (fid for fid, f in folders.items() if f['parent'] not in folders):
+            roots = [cid for cid in folders[places_root]['children'] if folders[cid]['title'] != '(no name)']
+            for i, root_id in enumerate(roots):
+                print_folder_tree(folders, root_id, "", i == len(roots) - 1)
+    print()
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.list_profiles:
+        print_profiles_list(find_firefox_profiles())
+        sys.exit(0)
+    if args.list_folders:
+        profiles, unknown = select_profiles(find_firefox_profiles(), args.profiles or 'all')
+        if unknown:
+            print(f"Error: Unknown Firefox profiles: {', '.join(unknown)}")
+            sys.exit(1)
+        list_profile_folders(profiles)
+        sys.exit(0)
+    if args.help or not args.dir or not (args.folder or args.path or args.search or args.compact):
+        print(HELP_TEXT)
+        sys.exit(0)
+    dir_path = args.dir
+    if dir_path == ".":
+        dir_path = os.getcwd()
+    if not os.path.isdir(dir_path):
+        print(f"Error: Directory not found: {dir_path}")
+        print(HELP_TEXT)
+        sys.exit(1)
+    base_name = args.export_name
+    if args.compact:
+        compact_deltas(dir_path, base_name)
+        sys.exit(0)
+    if args.folder and args.path:
+        print("Error: Use either --folder or --path")
+        sys.exit(1)
+    if (args.path or args.search) and args.profiles:
+        print("Error: --path and --search read the default profile; they cannot be combined with --profiles")
+        sys.exit(1)
+    if args.search:
+        if args.folder or args.incremental or args.input_links or args.format != 'json':
+            print("Error: --search writes NDJSON results; limit it to folders with --path (not --folder), without --incremental, --input-links or --format")
+            sys.exit(1)
+        try:
+            export_search_results(args.search, dir_path, base_name, args.path, compress=args.compress, reindex=args.reindex)
+        except FileNotFoundError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        except sqlite3.OperationalError as e:
+            print(f"Error: Search failed ({e})")
+            sys.exit(1)
+        sys.exit(0)
+    streamed = args.format != 'json' or args.compress
+    if streamed and (args.incremental or args.input_links or args.profiles):
+        print("Error: --format and --compress apply to the folder export only (not --incremental, --input-links or --profiles)")
+        sys.exit(1)
+    if args.profiles:
+        if args.incremental or args.input_links:
+            print("Error: --profiles cannot be combined with --incremental or --input-links")
+            sys.exit(1)
+        profiles, unknown = select_profiles(find_firefox_profiles(), args.profiles)
+        if unknown:
+            print(f"Error: Unknown Firefox profiles: {', '.join(unknown)}")
+            print_profiles_list(find_firefox_profiles())
+            sys.exit(1)
+        if not profiles:
+            print("Error: No selected Firefox profile has a bookmarks database.")
+            sys.exit(1)
+        if export_profiles_bookmarks(args.folder, dir_path, profiles, base_name) is None:
+            print(f"Error: No folder '{args.folder}' found in the bookmarks of the selected profiles.")
+            sys.exit(1)
+        sys.exit(0)
+    try:
+        found = export_bookmarks(args.folder, dir_path, base_name, args.input_links, args.incremental,
+                                 output_format=args.format, compress=args.compress, folder_pattern=args.path,
+                                 reindex=args.reindex)
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    if not found:
+        print(f"Error: No folder '{args.folder or args.path}' found in bookmarks.")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
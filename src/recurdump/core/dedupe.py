@@ -0,0 +1,334 @@
+"""
+rdump dedupe
+Find duplicate videos across one or more library directories.
+
+Arguments:
+  --dir, -p      Directory to scan recursively (use '.' for current directory); may be repeated
+  --output, -o   Duplicate report to write (default: 'data/rdump-duplicates.csv')
+  --ext          Comma-separated extensions to check (default: all files)
+  --exclude      Glob of files or folders to skip; may be repeated
+  --min-size     Smallest file size checked, in bytes (default: 1048576)
+  --jobs, -j     Worker processes used for hashing (default: CPU count)
+  --rehash       Ignore the hash cache and read every candidate again
+  --help, -h     Show this help message and exit
+
+Candidates are narrowed in three steps, each reading only the files still in doubt:
+  1. files are grouped by size; a file of unique size has no duplicate
+  2. files sharing a size get a partial hash of their head, tail and evenly
+     spaced chunks, read through mmap
+  3. files sharing a size and a partial hash get a full hash
+Hashing runs on a process pool. Hashes are cached under 'data/cache/' by
+(device, inode, size, mtime), so reruns and renamed files are not read again.
+
+The report lists every group of identical files. 'rdump sync --duplicates'
+reads it: a filename of a group then counts as present when any file of the
+group is present, so deleting the extra copies does not get them downloaded again.
+
+In-process use: find_duplicates() returns the groups, read_duplicate_groups() reads a report.
+"""
+import argparse
+import csv
+import hashlib
+import mmap
+import os
+import sqlite3
+import sys
+import time
+
+from recurdump.utils.paths import default_cache_dir, default_data_dir
+from recurdump.utils.profiling import timed_phase
+from recurdump.utils.walker import DEFAULT_THREADS, WalkOptions, walk_files
+
+REPORT_FILENAME = 'rdump-duplicates.csv'
+CACHE_FILENAME = 'rdump-dedupe-hashes.sqlite'
+# Bumped when the hashes table changes; an older cache is emptied
+CACHE_VERSION = 2
+REPORT_FIELDS = ['Group', 'Size', 'Hash', 'Filename', 'Path']
+DEFAULT_MIN_SIZE = 1024 * 1024
+# Partial hash: PARTIAL_CHUNKS chunks from the head to the tail of the file
+PARTIAL_CHUNK_BYTES = 64 * 1024
+PARTIAL_CHUNKS = 6
+# Files this small are hashed whole at the partial step
+PARTIAL_LIMIT = PARTIAL_CHUNK_BYTES * PARTIAL_CHUNKS
+FULL_CHUNK_BYTES = 8 * 1024 * 1024
+DIGEST_SIZE = 20
+# Hash results written to the cache per transaction
+CACHE_BATCH = 1000
+
+HELP_TEXT = """
+rdump dedupe - Find duplicate videos across one or more library directories.
+
+Arguments:
+  --dir, -p      Directory to scan recursively (use "." for current
+                 directory); may be repeated
+  --output, -o   Duplicate report to write
+                 (default: 'data/rdump-duplicates.csv')
+  --ext          Comma-separated extensions to check (default: all files)
+  --exclude      Glob of files or folders to skip; may be repeated
+  --min-size     Smallest file size checked, in bytes (default: 1048576)
+  --jobs, -j     Worker processes used for hashing (default: CPU count)
+  --rehash       Ignore the hash cache and read every candidate again
+  --help, -h     Show this help message and exit
+
+Files are first grouped by size. Files sharing a size get a partial hash of
+their head, tail and a few chunks in between; only those that still collide
+are hashed in full. Hashes are cached under 'data/cache/' by device, inode,
+size and mtime, so a rerun only reads new or changed files. Hard links of one
+file are not reported.
+
+The report lists each group of identical files with its size and hash.
+'rdump sync --duplicates' reads it: a filename of a group then counts as
+present when any file of the group is present, so removed copies are not
+downloaded again.
+
+Example usage:
+  rdump dedupe --dir /path/to/videos
+  rdump dedupe -p /mnt/nas1/videos -p /mnt/nas2/videos --ext mp4,ts,mkv -j 8
+  rdump sync --db my_model_Database_07-20-2025.csv --dir /path/to/videos --duplicates
+"""
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Find duplicate videos across one or more library directories.",
+        add_help=False,
+        usage=HELP_TEXT
+    )
+    parser.add_argument('--dir', '-p', action='append', default=[], help='Directory to scan recursively; may be repeated')
+    parser.add_argument('--output', '-o', default=None, help='Duplicate report to write (default: data/rdump-duplicates.csv)')
+    parser.add_argument('--ext', action='append', help='Comma-separated extensions to check')
+    parser.add_argument('--exclude', action='append', help='Glob of files or folders to skip (repeatable)')
+    parser.add_argument('--min-size', type=int, default=DEFAULT_MIN_SIZE, help='Smallest file size checked, in bytes')
+    parser.add_argument('--jobs', '-j', type=int, default=None, help='Worker processes used for hashing (default: CPU count)')
+    parser.add_argument('--rehash', action='store_true', help='Ignore the hash cache and read every candidate again')
+    parser.add_argument('--help', '-h', action='store_true', help='Show this help message and exit')
+    args = parser.parse_args(argv)
+    if args.help or not args.dir:
+        print(HELP_TEXT)
+        sys.exit(0)
+    return args
+
+def default_report_path():
+    return os.path.join(default_data_dir(), REPORT_FILENAME)
+
+def format_size(size):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+def open_hash_cache(cache_path=None):
+    conn = sqlite3.connect(cache_path or os.path.join(default_cache_dir(), CACHE_FILENAME))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    if conn.execute("PRAGMA user_version").fetchone()[0] != CACHE_VERSION:
+        # Version 1 was keyed without the device
+        conn.executescript(f"""
+            DROP TABLE IF EXISTS hashes;
+            PRAGMA user_version={CACHE_VERSION};
+        """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS hashes (
+            dev INTEGER NOT NULL,
+            inode INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            partial TEXT,
+            full TEXT,
+            PRIMARY KEY (dev, inode, size, mtime_ns)
+        ) WITHOUT ROWID
+    """)
+    return conn
+
+def advise(mapped, name):
+    # madvise() where the platform has it: MADV_RANDOM keeps the kernel from
+    # reading ahead around the sampled chunks, MADV_SEQUENTIAL helps full reads
+    advice = getattr(mmap, name, None)
+    if advice is not None and hasattr(mapped, 'madvise'):
+        mapped.madvise(advice)
+
+def partial_digest(mapped):
+    size = len(mapped)
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    last = size - PARTIAL_CHUNK_BYTES
+    # Chunk offsets from 0 (head) to last (tail), evenly spaced
+    for i in range(PARTIAL_CHUNKS):
+        offset = last * i // (PARTIAL_CHUNKS - 1)
+        digest.update(mapped[offset:offset + PARTIAL_CHUNK_BYTES])
+    return digest.hexdigest()
+
+def full_digest(mapped):
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    with memoryview(mapped) as view:
+        for offset in range(0, len(view), FULL_CHUNK_BYTES):
+            digest.update(view[offset:offset + FULL_CHUNK_BYTES])
+    return digest.hexdigest()
+
+def hash_file(task):
+    # Runs in a worker process. task: (path, size, full). Returns (path, partial,
+    # full, error); files up to PARTIAL_LIMIT are read whole at the partial step,
+    # so their full hash comes with it.
+    path, size, full = task
+    try:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if len(mapped) != size:
+                return path, None, None, "changed during the scan"
+            if full or size <= PARTIAL_LIMIT:
+                advise(mapped, 'MADV_SEQUENTIAL')
+                digest = full_digest(mapped)
+                return path, None if full else digest, digest, None
+            advise(mapped, 'MADV_RANDOM')
+            return path, partial_digest(mapped), None, None
+    except (OSError, ValueError) as e:
+        return path, None, None, str(e)
+
+def hash_files(tasks, jobs=None):
+    # Yield hash_file() results, on a process pool unless there is a single job or task
+    if jobs == 1 or len(tasks) < 2:
+        yield from map(hash_file, tasks)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    workers = jobs or os.cpu_count() or 1
+    chunksize = max(1, min(64, len(tasks) // (workers * 4)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(hash_file, tasks, chunksize=chunksize)
+
+@timed_phase(count=lambda by_size: sum(len(files) for files in by_size.values()))
+def collect_candidates(roots, walk, min_size):
+    # size -> [(path, dev, inode, mtime_ns)] for the sizes shared by several files
+    # (dev, inode, size, mtime_ns) -> path; hard links of one file are kept
+    # once, under their first path in sort order (the walk order varies).
+    # Inode numbers are only unique per device, hence dev in the key.
+    paths = {}
+    for record in walk_files(roots, *walk, with_stat=True):
+        if record.size < max(min_size, 1):
+            continue
+        key = (record.dev, record.inode, record.size, record.mtime_ns)
+        path = os.path.join(record.root, record.path)
+        if key not in paths or path < paths[key]:
+            paths[key] = path
+    by_size = {}
+    for (dev, inode, size, mtime_ns), path in paths.items():
+        by_size.setdefault(size, []).append((path, dev, inode, mtime_ns))
+    total = sum(size for _, _, size, _ in paths)
+    by_size = {size: files for size, files in by_size.items() if len(files) > 1}
+    shared = sum(len(files) for files in by_size.values())
+    print(f"Scanned {len(paths)} files ({format_size(total)}) in {len(roots)} directories; "
+          f"{shared} share their size with another file")
+    return by_size
+
+def store_hashes(conn, rows):
+    # rows: (dev, inode, size, mtime_ns, partial, full); a None keeps the cached value
+    with conn:
+        conn.executemany("""
+            INSERT INTO hashes (dev, inode, size, mtime_ns, partial, full) VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (dev, inode, size, mtime_ns) DO UPDATE SET
+                partial = coalesce(excluded.partial, partial),
+                full = coalesce(excluded.full, full)
+        """, rows)
+
+@timed_phase(count=len)
+def hash_step(conn, files, full, jobs=None, rehash=False):
+    # files: [(path, size, dev, inode, mtime_ns)]. Returns path -> (partial, full)
+    # for the files that could be read, from the cache where possible.
+    column = 'full' if full else 'partial'
+    digests = {}
+    tasks = []
+    keys = {}
+    for path, size, dev, inode, mtime_ns in files:
+        row = None
+        if not rehash:
+            row = conn.execute("SELECT partial, full FROM hashes WHERE dev=? AND inode=? AND size=? AND mtime_ns=?",
+                               (dev, inode, size, mtime_ns)).fetchone()
+        if row and row[1 if full else 0] is not None:
+            digests[path] = row
+            continue
+        tasks.append((path, size, full))
+        keys[path] = (dev, inode, size, mtime_ns)
+    cached = len(digests)
+    pending = []
+    for path, partial, full_hash, error in hash_files(tasks, jobs):
+        if error is not None:
+            print(f"Warning: Could not read {path} ({error})")
+            continue
+        digests[path] = (partial, full_hash)
+        pending.append(keys[path] + (partial, full_hash))
+        if len(pending) >= CACHE_BATCH:
+            store_hashes(conn, pending)
+            pending = []
+    if pending:
+        store_hashes(conn, pending)
+    print(f"Hashed {len(files)} files ({column}): {cached} from cache, {len(tasks)} read")
+    return digests
+
+def colliding(groups):
+    return [files for files in groups.values() if len(files) > 1]
+
+@timed_phase(count=len)
+def find_duplicates(roots, walk=None, jobs=None, min_size=DEFAULT_MIN_SIZE, cache_path=None, rehash=False):
+    # Returns the groups of identical files as lists of (path, size, full hash),
+    # largest reclaimable space first. walk (WalkOptions) filters the scan.
+    by_size = collect_candidates(roots, walk or WalkOptions(), min_size)
+    conn = open_hash_cache(cache_path)
+    try:
+        candidates = [(path, size, dev, inode, mtime_ns)
+                      for size, files in by_size.items() for path, dev, inode, mtime_ns in files]
+        partials = hash_step(conn, candidates, False, jobs, rehash)
+        by_partial = {}
+        for file in candidates:
+            if file[0] in partials:
+                by_partial.setdefault((file[1], partials[file[0]][0]), []).append(file)
+        suspects = [file for files in colliding(by_partial) for file in files]
+        fulls = hash_step(conn, suspects, True, jobs, rehash) if suspects else {}
+    finally:
+        conn.close()
+    by_full = {}
+    for path, size, _, _, _ in suspects:
+        if path in fulls:
+            by_full.setdefault((size, fulls[path][1]), []).append((path, size, fulls[path][1]))
+    groups = [sorted(files) for files in colliding(by_full)]
+    groups.sort(key=lambda files: (-files[0][1] * (len(files) - 1), files[0][0]))
+    return groups
+
+def write_report(groups, output_path):
+    with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=REPORT_FIELDS)
+        writer.writeheader()
+        for number, files in enumerate(groups, 1):
+            for path, size, digest in files:
+                writer.writerow({'Group': number, 'Size': size, 'Hash': digest,
+                                 'Filename': os.path.basename(path), 'Path': path})
+    print(f"Exported: {output_path}")
+
+def read_duplicate_groups(report_path):
+    # Filenames of each group in a report written by write_report()
+    groups = {}
+    with open(report_path, newline='', encoding='utf-8') as csvfile:
+        for row in csv.DictReader(csvfile):
+            groups.setdefault(row['Group'], set()).add(row['Filename'])
+    return [names for names in groups.values() if len(names) > 1]
+
+def main(argv=None):
+    args = parse_args(argv)
+    roots = [os.path.abspath(path) for path in args.dir]
+    for path in roots:
+        if not os.path.isdir(path):
+            print(f"Error: Directory not found: {path}")
+            print(HELP_TEXT)
+            sys.exit(1)
+    if args.jobs is not None and args.jobs < 1:
+        print("Error: --jobs must be 1 or more")
+        sys.exit(1)
+    extensions = [ext.strip() for value in args.ext or () for ext in value.split(',') if ext.strip()] or None
+    walk = WalkOptions(None, (), args.exclude or (), extensions, DEFAULT_THREADS)
+    output_path = args.output or default_report_path()
+    start = time.perf_counter()
+    groups = find_duplicates(roots, walk, args.jobs, args.min_size, rehash=args.rehash)
+    write_report(groups, output_path)
+    copies = sum(len(files) - 1 for files in groups)
+    reclaimable = sum(files[0][1] * (len(files) - 1) for files in groups)
+    print(f"Found {len(groups)} groups of duplicates: {copies} extra copies, "
+          f"{format_size(reclaimable)} reclaimable ({time.perf_counter() - start:.2f}s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,493 @@
+"""
+rdump ingest
+Load RecurTrack CSV exports into one deduplicated SQLite history store.
+
+Arguments:
+  --dir, -d      Directory (scanned recursively) or glob of RecurTrack '*_Database_*.csv' files; may be repeated
+  --store        Path to the history store (default: 'data/rdump-history.sqlite')
+  --model, -m    With --as-of or --seen: the model to export
+  --as-of        Export the catalog of --model as of a date (YYYY-MM-DD) or time (YYYY-MM-DDTHH:MM:SS, UTC)
+  --seen         Export when each entry of --model was first and last listed
+  --output, -o   With --as-of or --seen: CSV file to write to (default: print it)
+  --stats        Show what the store holds
+  --help, -h     Show this help message and exit
+
+Every (model, URL, filename) is stored once, with the runs of consecutive exports that listed it, so the catalog as of a date is exactly the latest export on or before it, and first and last seen times come from the runs. Ingested files are tracked by path, size and mtime, so a rerun only reads new or changed exports; a changed export replaces the rows it listed before.
+
+In-process use: ingest_exports() loads files, and open_history_store() with iter_catalog(), iter_entry_history() or iter_store_links() query the store.
+"""
+import argparse
+import csv
+import glob
+import os
+import re
+import sqlite3
+import sys
+from datetime import datetime, timezone
+
+from recurdump.utils.paths import default_data_dir
+from recurdump.utils.profiling import timed_phase
+
+STORE_FILENAME = 'rdump-history.sqlite'
+# The extension appends '_<milliseconds since epoch>' to export filenames
+EXPORT_TIMESTAMP = re.compile(r'_(\d{13})\.csv\Z', re.IGNORECASE)
+URL_COLUMNS = ('URL', 'reurb_link')
+TIME_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+SEEN_COLUMNS = ('URL', 'Filename', 'First Seen', 'Last Seen', 'Runs')
+STORE_VERSION = 1
+
+HELP_TEXT = """
+rdump ingest - Load RecurTrack CSV exports into one deduplicated SQLite history store.
+
+Arguments:
+  --dir, -d      Directory (scanned recursively) or glob of RecurTrack
+                 '*_Database_*.csv' files; may be repeated
+  --store        Path to the history store
+                 (default: 'data/rdump-history.sqlite')
+  --model, -m    With --as-of or --seen: the model to export
+  --as-of        Export the catalog of --model as of a date (YYYY-MM-DD) or a
+                 UTC time (YYYY-MM-DDTHH:MM:SS)
+  --seen         Export when each entry of --model was first and last listed
+  --output, -o   With --as-of or --seen: CSV file to write to
+                 (default: print it)
+  --stats        Show what the store holds
+  --help, -h     Show this help message and exit
+
+Every (model, URL, filename) is stored once, with the runs of consecutive
+exports of its model that listed it: a run only ends when an export no longer
+lists the entry. The export time of a file is the timestamp the extension
+appends to its name, else the newest 'Extracted At' in it, else its mtime.
+Ingested files are tracked by path, size and mtime, so a rerun only reads new
+or changed exports; a changed export replaces the rows it listed before.
+
+The catalog of a model as of a date is exactly what its latest export on or
+before that date contained, with the earliest 'Extracted At' of each row's
+run. --seen lists every entry the model ever had with the first and last
+export time it was listed at, and the number of runs (more than one: it
+disappeared from the exports in between). Each export is taken to be a full
+listing of the model; files of a model with the same export time count as
+one export.
+
+'rdump sync --model NAME' and 'rdump merge --from-store' read the store
+instead of re-parsing the CSV files.
+
+Example usage:
+  rdump ingest --dir ./exports
+  rdump ingest -d ./exports -d "/backup/*_Database_2024-*.csv"
+  rdump ingest --model my_model --as-of 2025-07-20 --output my_model_2025-07-20.csv
+  rdump ingest --model my_model --seen --output my_model_seen.csv
+  rdump ingest --stats
+"""
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Load RecurTrack CSV exports into one deduplicated SQLite history store.",
+        add_help=False,
+        usage=HELP_TEXT
+    )
+    parser.add_argument('--dir', '-d', action='append', default=[], help='Directory or glob of *_Database_*.csv files; may be repeated')
+    parser.add_argument('--store', default=None, help='Path to the history store (default: data/rdump-history.sqlite)')
+    parser.add_argument('--model', '-m', default=None, help='Model to export with --as-of or --seen')
+    parser.add_argument('--as-of', default=None, help='Export the catalog of --model as of this date or UTC time')
+    parser.add_argument('--seen', action='store_true', help='Export when each entry of --model was first and last listed')
+    parser.add_argument('--output', '-o', default=None, help='CSV file to write to')
+    parser.add_argument('--stats', action='store_true', help='Show what the store holds')
+    parser.add_argument('--help', '-h', action='store_true', help='Show this help message and exit')
+    args = parser.parse_args(argv)
+    if args.help or not (args.dir or args.stats or (args.model and (args.as_of or args.seen))):
+        print(HELP_TEXT)
+        sys.exit(0)
+    return args
+
+def default_store_path():
+    return os.path.join(default_data_dir(), STORE_FILENAME)
+
+def extract_model_name(db_filename):
+    # Example: my_model_Database_07-20-2025.csv -> my_model
+    base = os.path.basename(db_filename)
+    if "_Database_" in base:
+        return base.split("_Database_")[0]
+    return os.path.splitext(base)[0]
+
+STORE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS models (
+        id INTEGER PRIMARY KEY,
+        name TEXT UNIQUE NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS files (
+        id INTEGER PRIMARY KEY,
+        path TEXT UNIQUE NOT NULL,
+        size INTEGER NOT NULL,
+        mtime_ns INTEGER NOT NULL,
+        model_id INTEGER NOT NULL REFERENCES models(id),
+        exported_at TEXT NOT NULL,
+        rows INTEGER NOT NULL,
+        ingested_at TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS files_model ON files (model_id, exported_at);
+    CREATE TABLE IF NOT EXISTS entries (
+        id INTEGER PRIMARY KEY,
+        model_id INTEGER NOT NULL REFERENCES models(id),
+        url TEXT NOT NULL,
+        filename TEXT NOT NULL,
+        UNIQUE (model_id, url, filename)
+    );
+    CREATE INDEX IF NOT EXISTS entries_filename ON entries (filename);
+    -- Every export of the entry's model from first_seen to last_seen listed it;
+    -- extracted_at is the earliest 'Extracted At' (else export time) in the run,
+    -- or in the run it was split from by an export ingested later
+    CREATE TABLE IF NOT EXISTS runs (
+        entry_id INTEGER NOT NULL REFERENCES entries(id),
+        first_seen TEXT NOT NULL,
+        last_seen TEXT NOT NULL,
+        extracted_at TEXT NOT NULL,
+        PRIMARY KEY (entry_id, first_seen)
+    ) WITHOUT ROWID;
+"""
+
+def open_history_store(store_path=None):
+    conn = sqlite3.connect(store_path or default_store_path())
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    if conn.execute("PRAGMA user_version").fetchone()[0] < STORE_VERSION:
+        conn.executescript(STORE_SCHEMA + f"PRAGMA user_version={STORE_VERSION};")
+    return conn
+
+def format_time(dt):
+    return dt.astimezone(timezone.utc).strftime(TIME_FORMAT)
+
+def parse_time(value, end_of_day=False):
+    # Accepts YYYY-MM-DD, ISO times as written by the extension ('...Z'), or
+    # naive times (taken as UTC). Returns the store's time format, or None.
+    value = (value or '').strip()
+    if not value:
+        return None
+    try:
+        if len(value) == 10:
+            dt = datetime.strptime(value, '%Y-%m-%d')
+            if end_of_day:
+                dt = dt.replace(hour=23, minute=59, second=59)
+        else:
+            dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return format_time(dt)
+
+def find_exports(inputs):
+    # Each input is a directory (walked recursively) or a glob pattern
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, files in os.walk(item):
+                for name in files:
+                    if '_Database_' in name and name.lower().endswith('.csv'):
+                        paths.add(os.path.abspath(os.path.join(root, name)))
+        else:
+            paths.update(os.path.abspath(p) for p in glob.glob(item) if os.path.isfile(p))
+    return sorted(paths)
+
+def model_id_for(conn, name):
+    conn.execute("INSERT OR IGNORE INTO models (name) VALUES (?)", (name,))
+    return conn.execute("SELECT id FROM models WHERE name=?", (name,)).fetchone()[0]
+
+def iter_export_rows(csv_path, newest):
+    # Yields (url, filename, extracted_at) rows. newest[0] is raised to the
+    # latest 'Extracted At' seen. The extension may use ',', ';', tab or '|'.
+    with open(csv_path, newline='', encoding='utf-8') as csvfile:
+        try:
+            dialect = csv.Sniffer().sniff(csvfile.readline(), delimiters=',;\t|')
+        except csv.Error:
+            dialect = csv.excel
+        csvfile.seek(0)
+        reader = csv.reader(csvfile, dialect=dialect)
+        header = next(reader, [])
+        url_column = next((c for c in URL_COLUMNS if c in header), None)
+        if url_column is None:
+            print(f"Skipping (no URL column): {csv_path}")
+            return
+        # Plain rows with column positions; DictReader costs a dict per row
+        url_index = header.index(url_column)
+        filename_index = header.index('Filename') if 'Filename' in header else None
+        time_index = header.index('Extracted At') if 'Extracted At' in header else None
+        for row in reader:
+            if len(row) <= url_index:
+                continue
+            url = row[url_index].strip()
+            if not url:
+                continue
+            extracted_at = None
+            if time_index is not None and time_index < len(row):
+                extracted_at = row[time_index] or None
+                if extracted_at and (newest[0] is None or extracted_at > newest[0]):
+                    newest[0] = extracted_at
+            filename = row[filename_index].strip() if filename_index is not None and filename_index < len(row) else ''
+            yield url, filename, extracted_at
+
+def create_staging(conn):
+    conn.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS staging (
+            url TEXT NOT NULL,
+            filename TEXT NOT NULL,
+            extracted_at TEXT,
+            PRIMARY KEY (url, filename)
+        ) WITHOUT ROWID
+    """)
+    # Entries of the staged rows that their export did not list yet
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS listed (entry_id INTEGER PRIMARY KEY, extracted_at TEXT NOT NULL)")
+
+def stage_rows(conn, rows):
+    # Replace the staging table with the given (url, filename, extracted_at)
+    # rows; returns the distinct count. A repeated row keeps its first time.
+    conn.execute("DELETE FROM staging")
+    conn.executemany("INSERT OR IGNORE INTO staging (url, filename, extracted_at) VALUES (?, ?, ?)", rows)
+    return conn.execute("SELECT count(*) FROM staging").fetchone()[0]
+
+def neighbour_exports(conn, model_id, exported_at):
+    # Export times of the model just before and just after exported_at (or None)
+    return conn.execute("""
+        SELECT (SELECT max(exported_at) FROM files WHERE model_id = :model AND exported_at < :at),
+               (SELECT min(exported_at) FROM files WHERE model_id = :model AND exported_at > :at)
+    """, {'model': model_id, 'at': exported_at}).fetchone()
+
+def clear_export(conn, model_id, exported_at):
+    # Take the model's export at exported_at out of the runs, as if it listed
+    # nothing: runs through it are split around it, runs starting or ending at
+    # it are shortened, and entries left without a run are dropped
+    prev_at, next_at = neighbour_exports(conn, model_id, exported_at)
+    params = {'model': model_id, 'at': exported_at, 'prev': prev_at, 'next': next_at}
+    in_model = "entry_id IN (SELECT id FROM entries WHERE model_id = :model)"
+    conn.execute(f"""
+        INSERT INTO runs (entry_id, first_seen, last_seen, extracted_at)
+        SELECT entry_id, :next, last_seen, extracted_at FROM runs WHERE {in_model} AND first_seen < :at AND last_seen > :at
+    """, params)
+    conn.execute(f"UPDATE runs SET last_seen = :prev WHERE {in_model} AND first_seen < :at AND last_seen >= :at", params)
+    conn.execute(f"DELETE FROM runs WHERE {in_model} AND first_seen = :at AND last_seen = :at", params)
+    conn.execute(f"UPDATE runs SET first_seen = :next WHERE {in_model} AND first_seen = :at", params)
+    conn.execute("DELETE FROM entries WHERE model_id = :model AND NOT EXISTS (SELECT 1 FROM runs WHERE entry_id = entries.id)", params)
+
+def record_export(conn, path, size, mtime_ns, model_id, exported_at, replace=True):
+    # Insert or update the files row of an export and make room for its rows;
+    # returns its id. With replace, an export read before first forgets the
+    # rows it listed; a new export time before the model's latest splits the
+    # runs through it.
+    old = conn.execute("SELECT model_id, exported_at FROM files WHERE path=?", (path,)).fetchone()
+    if old is not None and replace:
+        clear_export(conn, *old)
+    if (not conn.execute("SELECT 1 FROM files WHERE model_id=? AND exported_at=?", (model_id, exported_at)).fetchone()
+            and neighbour_exports(conn, model_id, exported_at)[1] is not None):
+        clear_export(conn, model_id, exported_at)
+    conn.execute("""
+        INSERT INTO files (path, size, mtime_ns, model_id, exported_at, rows, ingested_at) VALUES (?, ?, ?, ?, ?, 0, ?)
+        ON CONFLICT (path) DO UPDATE SET size = excluded.size, mtime_ns = excluded.mtime_ns, model_id = excluded.model_id,
+            exported_at = excluded.exported_at, rows = CASE WHEN ? THEN 0 ELSE rows END, ingested_at = excluded.ingested_at
+    """, (path, size, mtime_ns, model_id, exported_at, format_time(datetime.now(timezone.utc)), replace))
+    return conn.execute("SELECT id FROM files WHERE path=?", (path,)).fetchone()[0]
+
+def merge_staged(conn, file_id):
+    # Record the staged rows as listed by the export file_id: a run ending at
+    # the model's export before it or starting at the one after it is
+    # extended (or both are joined), else a run starts. Returns the rows the
+    # export now lists that no file sharing its time listed before.
+    model_id, exported_at = conn.execute("SELECT model_id, exported_at FROM files WHERE id=?", (file_id,)).fetchone()
+    prev_at, next_at = neighbour_exports(conn, model_id, exported_at)
+    params = {'model': model_id, 'at': exported_at, 'prev': prev_at, 'next': next_at}
+    conn.execute("INSERT OR IGNORE INTO entries (model_id, url, filename) SELECT :model, url, filename FROM staging", params)
+    conn.execute("DELETE FROM listed")
+    # CROSS JOIN keeps staging as the outer loop: a native batch is a few
+    # rows, while the model may have many entries
+    conn.execute("""
+        INSERT INTO listed (entry_id, extracted_at)
+        SELECT e.id, coalesce(s.extracted_at, :at) FROM staging s
+        CROSS JOIN entries e ON e.model_id = :model AND e.url = s.url AND e.filename = s.filename
+        WHERE NOT EXISTS (SELECT 1 FROM runs r WHERE r.entry_id = e.id AND r.first_seen <= :at AND r.last_seen >= :at)
+    """, params)
+    listed = "entry_id IN (SELECT entry_id FROM listed)"
+    earliest = "min(extracted_at, (SELECT l.extracted_at FROM listed l WHERE l.entry_id = runs.entry_id))"
+    if next_at is not None:
+        # Listed by the exports on both sides: the run after is joined to the one before
+        conn.execute(f"""
+            UPDATE runs SET
+                last_seen = (SELECT n.last_seen FROM runs n WHERE n.entry_id = runs.entry_id AND n.first_seen = :next),
+                extracted_at = min({earliest},
+                                   (SELECT n.extracted_at FROM runs n WHERE n.entry_id = runs.entry_id AND n.first_seen = :next))
+            WHERE last_seen = :prev AND {listed}
+            AND EXISTS (SELECT 1 FROM runs n WHERE n.entry_id = runs.entry_id AND n.first_seen = :next)
+        """, params)
+        conn.execute(f"""
+            DELETE FROM runs WHERE first_seen = :next AND {listed}
+            AND EXISTS (SELECT 1 FROM runs p WHERE p.entry_id = runs.entry_id AND p.first_seen < :next AND p.last_seen >= :next)
+        """, params)
+        conn.execute(f"UPDATE runs SET first_seen = :at, extracted_at = {earliest} WHERE first_seen = :next AND {listed}", params)
+    conn.execute(f"UPDATE runs SET last_seen = :at, extracted_at = {earliest} WHERE last_seen = :prev AND {listed}", params)
+    conn.execute("""
+        INSERT INTO runs (entry_id, first_seen, last_seen, extracted_at)
+        SELECT l.entry_id, :at, :at, l.extracted_at FROM listed l
+        WHERE NOT EXISTS (SELECT 1 FROM runs r WHERE r.entry_id = l.entry_id AND r.first_seen <= :at AND r.last_seen >= :at)
+    """, params)
+    added = conn.execute("SELECT count(*) FROM listed").fetchone()[0]
+    conn.execute("UPDATE files SET rows = rows + ? WHERE id=?", (added, file_id))
+    return added
+
+@timed_phase(count=int)
+def ingest_file(conn, csv_path, st):
+    # Load one export in a single transaction. Rows are staged first because
+    # the export time may only be known once the whole file has been read.
+    # A file ingested before is replaced, rows it no longer lists included.
+    model_id = model_id_for(conn, extract_model_name(csv_path))
+    newest = [None]
+    rows = stage_rows(conn, iter_export_rows(csv_path, newest))
+    match = EXPORT_TIMESTAMP.search(csv_path)
+    if match:
+        exported_at = format_time(datetime.fromtimestamp(int(match.group(1)) / 1000, timezone.utc))
+    else:
+        exported_at = parse_time(newest[0]) or format_time(datetime.fromtimestamp(st.st_mtime, timezone.utc))
+    file_id = record_export(conn, csv_path, st.st_size, st.st_mtime_ns, model_id, exported_at)
+    merge_staged(conn, file_id)
+    return rows
+
+@timed_phase(count=lambda result: result[1])
+def ingest_exports(inputs, store_path=None):
+    # Ingest every export found under inputs. Returns (files ingested, rows, files skipped).
+    paths = find_exports(inputs)
+    conn = open_history_store(store_path)
+    create_staging(conn)
+    known = {path: (size, mtime_ns) for path, size, mtime_ns in conn.execute("SELECT path, size, mtime_ns FROM files")}
+    ingested = rows = skipped = 0
+    try:
+        for path in paths:
+            st = os.stat(path)
+            if known.get(path) == (st.st_size, st.st_mtime_ns):
+                skipped += 1
+                continue
+            try:
+                with conn:
+                    rows += ingest_file(conn, path, st)
+                ingested += 1
+            except (OSError, UnicodeDecodeError, csv.Error) as e:
+                print(f"Skipping (error reading file): {path} ({e})")
+    finally:
+        conn.close()
+    print(f"Ingested {ingested} files ({rows} rows), {skipped} unchanged")
+    return ingested, rows, skipped
+
+def latest_export_time(conn, model, as_of=None):
+    # Export time of the model's latest export on or before as_of (or ever)
+    row = conn.execute("""
+        SELECT max(f.exported_at) FROM files f JOIN models m ON m.id = f.model_id
+        WHERE m.name = ? AND (? IS NULL OR f.exported_at <= ?)
+    """, (model, as_of, as_of)).fetchone()
+    return row[0]
+
+@timed_phase()
+def iter_catalog(conn, model, as_of=None):
+    # Rows of the model's latest export on or before as_of (default: latest
+    # ever), in the extension's CSV columns. 'Extracted At' is the earliest
+    # one of the row's run of exports, else the export time.
+    exported_at = latest_export_time(conn, model, as_of)
+    if exported_at is None:
+        return
+    cur = conn.execute("""
+        SELECT e.url, e.filename, r.extracted_at
+        FROM models m JOIN entries e ON e.model_id = m.id JOIN runs r ON r.entry_id = e.id
+        WHERE m.name = :model AND r.first_seen <= :at AND r.last_seen >= :at
+        ORDER BY e.url, e.filename
+    """, {'model': model, 'at': exported_at})
+    for url, filename, extracted_at in cur:
+        yield {'URL': url, 'Filename': filename, 'Extracted At': extracted_at}
+
+@timed_phase()
+def iter_entry_history(conn, model):
+    # Every entry the model ever had, with the first and last export time it
+    # was listed at and the number of runs of consecutive exports listing it
+    cur = conn.execute("""
+        SELECT e.url, e.filename, min(r.first_seen), max(r.last_seen), count(*)
+        FROM models m JOIN entries e ON e.model_id = m.id JOIN runs r ON r.entry_id = e.id
+        WHERE m.name = ?
+        GROUP BY e.id
+        ORDER BY e.url, e.filename
+    """, (model,))
+    for url, filename, first_seen, last_seen, runs in cur:
+        yield {'URL': url, 'Filename': filename, 'First Seen': first_seen, 'Last Seen': last_seen, 'Runs': runs}
+
+def iter_store_links(conn, model=None):
+    # Every distinct URL in the store, optionally for one model
+    if model is None:
+        cur = conn.execute("SELECT DISTINCT url FROM entries")
+    else:
+        cur = conn.execute("SELECT DISTINCT e.url FROM entries e JOIN models m ON m.id = e.model_id WHERE m.name = ?", (model,))
+    for (url,) in cur:
+        yield url
+
+def print_store_stats(conn):
+    totals = conn.execute("""
+        SELECT (SELECT count(*) FROM models), (SELECT count(*) FROM files), (SELECT count(*) FROM entries), (SELECT count(*) FROM runs)
+    """).fetchone()
+    print(f"{totals[0]} models, {totals[1]} exports, {totals[2]} unique entries in {totals[3]} runs")
+    cur = conn.execute("""
+        SELECT m.name, count(*), min(f.exported_at), max(f.exported_at) FROM files f JOIN models m ON m.id = f.model_id
+        GROUP BY m.id ORDER BY m.name
+    """)
+    for name, exports, first, last in cur:
+        print(f"  {name}: {exports} exports, {first} .. {last}")
+
+@timed_phase()
+def write_catalog(rows, output_path, fieldnames=('URL', 'Filename', 'Extracted At')):
+    if output_path:
+        with open(output_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            count = 0
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        print(f"Exported {count} rows: {output_path}")
+    else:
+        writer = csv.DictWriter(sys.stdout, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def main(argv=None):
+    args = parse_args(argv)
+    store_path = args.store or default_store_path()
+    if (args.as_of or args.seen) and not args.model:
+        print("Error: --as-of and --seen need --model")
+        sys.exit(1)
+    if args.as_of and args.seen:
+        print("Error: Use either --as-of or --seen")
+        sys.exit(1)
+    if args.dir:
+        for item in args.dir:
+            if not os.path.exists(item) and not glob.glob(item):
+                print(f"Error: No such directory or files: {item}")
+                sys.exit(1)
+        ingest_exports(args.dir, store_path)
+    if not (args.stats or args.as_of or args.seen):
+        sys.exit(0)
+    if not os.path.isfile(store_path):
+        print(f"Error: History store not found: {store_path}")
+        sys.exit(1)
+    conn = open_history_store(store_path)
+    try:
+        if args.stats:
+            print_store_stats(conn)
+        if args.as_of:
+            as_of = parse_time(args.as_of, end_of_day=True)
+            if as_of is None:
+                print(f"Error: Not a date or time: {args.as_of}")
+                sys.exit(1)
+            if latest_export_time(conn, args.model, as_of) is None:
+                print(f"Error: No export of '{args.model}' on or before {as_of}")
+                sys.exit(1)
+            write_catalog(iter_catalog(conn, args.model, as_of), args.output)
+        if args.seen:
+            if latest_export_time(conn, args.model) is None:
+                print(f"Error: No export of '{args.model}' in the store")
+                sys.exit(1)
+            write_catalog(iter_entry_history(conn, args.model), args.output, SEEN_COLUMNS)
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
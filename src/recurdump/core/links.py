@@ -0,0 +1,306 @@
+"""
+Compact link store for RecurTrack video URLs.
+
+Nearly every link the tools handle has the form '<host>/<model>/video/<id>',
+optionally followed by a short path such as '/play' (the same '/<model>/video/'
+pattern the extension collects). LinkStore interns each distinct prefix and
+suffix once as a "shape" and keeps the video IDs of each shape in a sorted
+array('q') column, 8 bytes per link instead of a str object plus a set slot.
+Links that do not fit the pattern are kept as plain strings.
+
+Set operations (|, -, &) run column by column on the integer IDs, so merging
+and diffing large link sets does not hash or compare URL strings.
+"""
+import bisect
+import itertools
+import json
+import operator
+import struct
+import sys
+from array import array
+
+VIDEO_MARKER = '/video/'
+ID_MAX = (1 << 63) - 1
+# Serialized form: header length, JSON header, then the raw ID columns in header order
+BLOB_HEADER = struct.Struct('<I')
+# Pending IDs are sorted into the columns once they reach this many or the
+# number of stored IDs, whichever is larger, so adding n links costs O(n log n)
+FLUSH_MIN = 1 << 16
+# Set operations look IDs up with bisect when one column is this many times
+# longer than the other, and walk both columns in step otherwise
+SPARSE_RATIO = 16
+
+class LinkParts:
+    __slots__ = ('prefix', 'video_id', 'suffix')
+
+    def __init__(self, prefix, video_id, suffix=''):
+        self.prefix = prefix
+        self.video_id = video_id
+        self.suffix = suffix
+
+    def __str__(self):
+        return f"{self.prefix}{self.video_id}{self.suffix}"
+
+    def __repr__(self):
+        return f"LinkParts({self.prefix!r}, {self.video_id!r}, {self.suffix!r})"
+
+def split_link(link):
+    # Returns (prefix, video_id, suffix) for '<prefix>/video/<id>[/<letters>]'
+    # links, else None. The ID must round-trip, so no leading zeros.
+    head, marker, tail = link.rpartition(VIDEO_MARKER)
+    if not marker or not head:
+        return None
+    digits, slash, word = tail.partition('/')
+    if not (digits.isascii() and digits.isdigit()) or digits[0] == '0':
+        return None
+    if slash and not (word == '' or (word.isascii() and word.isalpha())):
+        return None
+    video_id = int(digits)
+    if video_id > ID_MAX:
+        return None
+    return head + marker, video_id, slash + word
+
+def parse_link(link):
+    # Returns LinkParts for a video link, else None
+    parts = split_link(link)
+    return LinkParts(*parts) if parts else None
+
+def _merge_column(column, extra):
+    # Sorted, deduplicated union of a sorted column and an array of new IDs
+    if len(column) > SPARSE_RATIO * len(extra):
+        # Few new IDs: place each with bisect and copy the stored IDs across
+        # in slices between them
+        merged = array('q')
+        start = 0
+        last = None
+        for video_id in sorted(extra):
+            if video_id == last:
+                continue
+            last = video_id
+            i = bisect.bisect_left(column, video_id, start)
+            if i < len(column) and column[i] == video_id:
+                continue
+            merged.extend(column[start:i])
+            merged.append(video_id)
+            start = i
+        merged.extend(column[start:])
+        return merged
+    # The column is one sorted run, which the sort merges with the sorted new
+    # IDs in a single linear pass; groupby then drops the repeats
+    ids = sorted(itertools.chain(column, extra))
+    return array('q', map(operator.itemgetter(0), itertools.groupby(ids)))
+
+def _common_positions(column, theirs):
+    # Ascending indexes in column of the IDs also in theirs (both sorted and
+    # deduplicated), without building a set of either
+    if len(theirs) > SPARSE_RATIO * len(column):
+        # Look each ID up in the much longer array, each search starting
+        # where the previous one ended
+        positions = []
+        lo = 0
+        for i, video_id in enumerate(column):
+            lo = bisect.bisect_left(theirs, video_id, lo)
+            if lo == len(theirs):
+                break
+            if theirs[lo] == video_id:
+                positions.append(i)
+        return positions
+    if len(column) > SPARSE_RATIO * len(theirs):
+        positions = []
+        lo = 0
+        for video_id in theirs:
+            lo = bisect.bisect_left(column, video_id, lo)
+            if lo == len(column):
+                break
+            if column[lo] == video_id:
+                positions.append(lo)
+        return positions
+    # Comparable sizes: one linear pass over both
+    positions = []
+    others = iter(theirs)
+    other = next(others, None)
+    if other is None:
+        return positions
+    for i, video_id in enumerate(column):
+        while other < video_id:
+            other = next(others, None)
+            if other is None:
+                return positions
+        if other == video_id:
+            positions.append(i)
+    return positions
+
+class LinkStore:
+    __slots__ = ('_columns', '_pending', '_pending_count', '_size', '_other')
+
+    def __init__(self, links=()):
+        self._columns = {}      # (prefix, suffix) -> sorted array of video IDs
+        self._pending = {}      # (prefix, suffix) -> unsorted array of new IDs
+        self._pending_count = 0
+        self._size = 0
+        self._other = set()
+        self.update(links)
+
+    def _flush(self):
+        if not self._pending:
+            return
+        for shape, ids in self._pending.items():
+            column = self._columns.get(shape)
+            merged = _merge_column(column or (), ids)
+            self._size += len(merged) - (len(column) if column else 0)
+            self._columns[shape] = merged
+        self._pending.clear()
+        self._pending_count = 0
+
+    def _pending_column(self, prefix, suffix):
+        shape = (prefix, suffix)
+        pending = self._pending.get(shape)
+        if pending is None:
+            if shape not in self._columns:
+                shape = (sys.intern(prefix), sys.intern(suffix))
+            pending = self._pending[shape] = array('q')
+        return pending
+
+    def _check_flush(self):
+        if self._pending_count >= max(FLUSH_MIN, self._size):
+            self._flush()
+
+    def add(self, link):
+        self.update((link,))
+
+    def update(self, links):
+        if isinstance(links, LinkStore):
+            links._flush()
+            for (prefix, suffix), column in links._columns.items():
+                self._pending_column(prefix, suffix).extend(column)
+                self._pending_count += len(column)
+            self._other |= links._other
+            self._check_flush()
+            return
+        # Hot loop for plain strings; locals avoid attribute lookups per link
+        pending = self._pending
+        other = self._other
+        for link in links:
+            parts = split_link(link)
+            if parts is None:
+                other.add(link)
+                continue
+            prefix, video_id, suffix = parts
+            column = pending.get((prefix, suffix))
+            if column is None:
+                column = self._pending_column(prefix, suffix)
+            column.append(video_id)
+            self._pending_count += 1
+            if self._pending_count >= FLUSH_MIN and self._pending_count >= self._size:
+                self._flush()
+
+    def __contains__(self, link):
+        parts = split_link(link)
+        if parts is None:
+            return link in self._other
+        prefix, video_id, suffix = parts
+        self._flush()
+        column = self._columns.get((prefix, suffix))
+        if not column:
+            return False
+        i = bisect.bisect_left(column, video_id)
+        return i < len(column) and column[i] == video_id
+
+    def __len__(self):
+        self._flush()
+        return self._size + len(self._other)
+
+    def __iter__(self):
+        # Packed links column by column, then the remaining strings
+        self._flush()
+        for (prefix, suffix), column in self._columns.items():
+            for video_id in column:
+                yield f"{prefix}{video_id}{suffix}"
+        yield from self._other
+
+    def sorted_links(self):
+        # Links in plain string order, as written by --sort
+        return sorted(self)
+
+    def _derive(self, columns, other):
+        result = LinkStore()
+        result._columns = {shape: column for shape, column in columns.items() if column}
+        result._size = sum(len(column) for column in result._columns.values())
+        result._other = other
+        return result
+
+    def copy(self):
+        self._flush()
+        return self._derive({shape: array('q', column) for shape, column in self._columns.items()}, set(self._other))
+
+    def union(self, other):
+        result = self.copy()
+        result.update(other)
+        return result
+
+    def difference(self, other):
+        if not isinstance(other, LinkStore):
+            other = LinkStore(other)
+        self._flush()
+        other._flush()
+        columns = {}
+        for shape, column in self._columns.items():
+            theirs = other._columns.get(shape)
+            if theirs is None:
+                columns[shape] = array('q', column)
+            else:
+                # Mask out the common IDs; the order is kept
+                keep = bytearray(b'\x01') * len(column)
+                for i in _common_positions(column, theirs):
+                    keep[i] = 0
+                columns[shape] = array('q', itertools.compress(column, keep))
+        return self._derive(columns, self._other - other._other)
+
+    def intersection(self, other):
+        if not isinstance(other, LinkStore):
+            other = LinkStore(other)
+        self._flush()
+        other._flush()
+        columns = {}
+        for shape, column in self._columns.items():
+            theirs = other._columns.get(shape)
+            if theirs is not None:
+                columns[shape] = array('q', map(column.__getitem__, _common_positions(column, theirs)))
+        return self._derive(columns, self._other & other._other)
+
+    __or__ = union
+    __sub__ = difference
+    __and__ = intersection
+
+    def dumps(self):
+        # Compact bytes for caching: the ID columns are written as raw arrays
+        self._flush()
+        header = {
+            'shapes': [[prefix, suffix, len(column)] for (prefix, suffix), column in self._columns.items()],
+            'other': sorted(self._other),
+        }
+        header = json.dumps(header, separators=(',', ':')).encode('utf-8')
+        return b''.join([BLOB_HEADER.pack(len(header)), header] + [column.tobytes() for column in self._columns.values()])
+
+    @classmethod
+    def loads(cls, data):
+        (header_size,) = BLOB_HEADER.unpack_from(data, 0)
+        offset = BLOB_HEADER.size
+        header = json.loads(data[offset:offset + header_size].decode('utf-8'))
+        offset += header_size
+        columns = {}
+        for prefix, suffix, count in header['shapes']:
+            column = array('q')
+            column.frombytes(data[offset:offset + count * column.itemsize])
+            offset += count * column.itemsize
+            columns[(sys.intern(prefix), sys.intern(suffix))] = column
+        store = cls()
+        return store._derive(columns, set(header['other']))
+
+    def nbytes(self):
+        # Approximate payload size: ID columns plus the interned shapes and strings
+        self._flush()
+        size = sum(column.itemsize * len(column) for column in self._columns.values())
+        size += sum(sys.getsizeof(prefix) + sys.getsizeof(suffix) for prefix, suffix in self._columns)
+        size += sum(sys.getsizeof(link) for link in self._other)
+        return size
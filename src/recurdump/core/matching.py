@@ -0,0 +1,153 @@
+"""
+Filename matching for rdump sync beyond exact names.
+
+Post-processing changes names: recordings are remuxed ('.ts' to '.mp4'), get a
+suffix (' (1)', '_remux') or change case, and an exact comparison then reports
+them as missing. FilenameMatcher looks a database filename up in the library
+in two steps:
+
+  normalized  same stem ignoring case, and extensions in the same equivalence
+              group ('mp4', 'ts', 'mkv', ...) count as equal; score 1.0
+  fuzzy       near matches; the score is the Dice coefficient of the trigram
+              sets of the two stems
+
+A fuzzy match must keep the numbers of the database name (date, time, video
+ID) in the same order at the start of its own numbers: names of the same model
+a few minutes apart are similar, but they are different videos. The library is
+therefore indexed by the numbers in each stem, kept as sorted keys, so the
+candidates for a name are one bisect range (a prefix search, as in a trie)
+instead of a pass over the library. Names without numbers fall back to a
+trigram index that only reads the postings of the rarest trigrams.
+"""
+import bisect
+import re
+from array import array
+from collections import namedtuple
+
+MATCH_MODES = ('exact', 'normalized', 'fuzzy')
+DEFAULT_EXT_GROUPS = (('mp4', 'm4v', 'ts', 'mkv', 'mov', 'webm'),)
+DEFAULT_MIN_SCORE = 0.8
+# Trigrams of a name used to collect fuzzy candidates (the rarest ones)
+QUERY_GRAMS = 8
+# Candidates scored per lookup
+MAX_CANDIDATES = 64
+DIGITS = re.compile(r'\d+')
+# Ends every number in a number key, so that '1' is not a prefix of '12'
+NUMBER_END = '\x1f'
+
+# mode: one of MATCH_MODES; ext_groups: iterables of equivalent extensions
+MatchOptions = namedtuple('MatchOptions', 'mode ext_groups min_score')
+MatchOptions.__new__.__defaults__ = ('exact', DEFAULT_EXT_GROUPS, DEFAULT_MIN_SCORE)
+
+# kind: 'normalized' or 'fuzzy'
+Match = namedtuple('Match', 'filename kind score')
+
+def parse_ext_groups(values):
+    # ['mp4,ts,mkv', 'jpg,jpeg'] -> (('mp4', 'ts', 'mkv'), ('jpg', 'jpeg'))
+    groups = []
+    for value in values or ():
+        group = tuple(ext.strip().lower().lstrip('.') for ext in value.split(',') if ext.strip())
+        if group:
+            groups.append(group)
+    return tuple(groups)
+
+def split_name(filename):
+    # 'Model_2025-01-01_12-00.TS' -> ('model_2025-01-01_12-00', 'ts')
+    stem, dot, ext = filename.rpartition('.')
+    if not dot or not stem:
+        return filename.casefold(), ''
+    return stem.casefold(), ext.lower()
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def number_key(stem):
+    # '2025-01-01_12-00 (1)' -> '2025|01|01|12|00|1|' with NUMBER_END as '|'
+    return ''.join(number + NUMBER_END for number in DIGITS.findall(stem))
+
+class FilenameMatcher:
+    def __init__(self, filenames, options=None):
+        options = options or MatchOptions('normalized')
+        self.fuzzy = options.mode == 'fuzzy'
+        self.min_score = options.min_score
+        self.ext_group = {}
+        for number, group in enumerate(options.ext_groups or ()):
+            for ext in group:
+                self.ext_group.setdefault(ext, f"\0{number}")
+        self.by_key = {}
+        for filename in filenames:
+            stem, ext = split_name(filename)
+            self.by_key.setdefault((stem, self.ext_group.get(ext, ext)), filename)
+        self.names = []
+        self.keys = []
+        self.number_keys = []
+        self.number_ids = array('I')
+        self.postings = None
+        if self.fuzzy:
+            for key, filename in self.by_key.items():
+                self.names.append(filename)
+                self.keys.append(key)
+            order = sorted(range(len(self.keys)), key=lambda file_id: number_key(self.keys[file_id][0]))
+            self.number_keys = [number_key(self.keys[file_id][0]) for file_id in order]
+            self.number_ids = array('I', order)
+
+    def build_postings(self):
+        # Trigram index of the stems, only needed for names without numbers
+        self.postings = {}
+        for file_id, (stem, _) in enumerate(self.keys):
+            for gram in trigrams(stem):
+                postings = self.postings.get(gram)
+                if postings is None:
+                    postings = self.postings[gram] = array('I')
+                postings.append(file_id)
+
+    def number_candidates(self, query_key):
+        # Files whose numbers start with the query's numbers: one range of the sorted keys
+        start = bisect.bisect_left(self.number_keys, query_key)
+        end = min(start + MAX_CANDIDATES, len(self.number_keys))
+        for i in range(start, end):
+            if not self.number_keys[i].startswith(query_key):
+                break
+            yield self.number_ids[i]
+
+    def trigram_candidates(self, grams):
+        if self.postings is None:
+            self.build_postings()
+        lists = sorted((self.postings[g] for g in grams if g in self.postings), key=len)[:QUERY_GRAMS]
+        if not lists:
+            return []
+        hits = {}
+        for postings in lists:
+            for file_id in postings:
+                hits[file_id] = hits.get(file_id, 0) + 1
+        # A candidate scoring min_score shares most trigrams, so it is in most of the rarest lists
+        needed = max(1, int(len(lists) * self.min_score))
+        candidates = sorted((count, file_id) for file_id, count in hits.items() if count >= needed)
+        return [file_id for _, file_id in candidates[-MAX_CANDIDATES:]]
+
+    def match(self, filename):
+        # Returns a Match for filename, or None when nothing in the library is close enough
+        stem, ext = split_name(filename)
+        group = self.ext_group.get(ext, ext)
+        found = self.by_key.get((stem, group))
+        if found is not None:
+            return Match(found, 'normalized', 1.0)
+        if not self.fuzzy:
+            return None
+        grams = trigrams(stem)
+        query_key = number_key(stem)
+        candidates = self.number_candidates(query_key) if query_key else self.trigram_candidates(grams)
+        best = None
+        for file_id in candidates:
+            candidate_stem, candidate_group = self.keys[file_id]
+            if candidate_group != group:
+                continue
+            candidate_grams = trigrams(candidate_stem)
+            total = len(grams) + len(candidate_grams)
+            if not total:
+                # Both stems are too short for trigrams; equal ones were matched above
+                continue
+            score = 2 * len(grams & candidate_grams) / total
+            if score >= self.min_score and (best is None or score > best.score):
+                best = Match(self.names[file_id], 'fuzzy', round(score, 3))
+        return best
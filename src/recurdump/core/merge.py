@@ -0,0 +1,474 @@
+"""
+rdump merge (also available as scripts/rdump-merge-models.py)
+
+Scan a directory (and subdirectories) for CSV files, extract all unique links from the 'reurb_link' column, and export them to a text file (one link per line).
+
+Required arguments:
+  --dir, -d      Path to the directory to scan for CSV files (use '.' for current directory)
+  --output, -o   Path (and filename) for the output text file
+
+Optional arguments:
+  --sort, -s     Sort the output links alphabetically
+  --jobs, -j     Number of worker processes used to parse CSV files (default: CPU count)
+  --from-store   Merge the links of the 'rdump ingest' history store instead of scanning --dir
+  --store        Path to the history store (default: 'data/rdump-history.sqlite')
+  --help, -h     Show this help message and exit
+
+If a CSV file does not contain the 'reurb_link' column or cannot be read, it will be skipped.
+The output file will contain one link per line, with no duplicates and no trailing commas.
+
+Links extracted from each CSV are cached under 'data/cache/' keyed by path, size and mtime, so a rerun only parses new or changed files.
+
+In-process use: merge_models() runs the merge and returns the number of links written.
+"""
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import csv
+import sqlite3
+
+from recurdump.core.ingest import default_store_path, iter_store_links, open_history_store
+from recurdump.core.links import LinkStore
+from recurdump.utils.paths import default_cache_dir
+from recurdump.utils.profiling import timed_phase
+
+CACHE_FILENAME = 'rdump-merge-cache.sqlite'
+# Bumped when the cache layout changes; older caches are dropped and rebuilt
+CACHE_VERSION = 2
+
+HELP_TEXT = """
+rdump merge
+
+Merge all unique 'reurb_link' links from CSV files in a directory (recursively)
+into a text file, or add links from a single CSV file to a text file.
+
+Required arguments (for merge mode):
+  --dir, -d      Directory to scan for CSV files (use '.' for current directory)
+  --output, -o   Path (and filename) for the output text file
+
+Optional arguments:
+  --sort, -s     Sort the output links alphabetically
+  --jobs, -j     Number of worker processes used to parse CSV files
+                 (default: CPU count)
+  --add-csv      Path to a single CSV file to add links from (reurb_link column)
+  --add-to-txt   Path to a text file to add links to (one link per line, no duplicates)
+  --append       With --add-csv/--add-to-txt: append only new links, using a
+                 '<text file>.idx' sidecar index instead of rewriting the file
+  --compact      Path to a text file to deduplicate, sort and reindex in place
+  --from-store   Merge the links recorded by 'rdump ingest' instead of
+                 scanning --dir
+  --store        Path to the history store
+                 (default: 'data/rdump-history.sqlite')
+  --help, -h     Show this help message and exit
+
+If --add-csv and --add-to-txt are both used, the script will add all unique
+links from the CSV's 'reurb_link' column to the specified text file, avoiding
+duplicates. If --sort is used, the resulting text file will be sorted.
+
+With --append, membership is checked against a memory-mapped hash index kept
+next to the text file, and only the new links are appended, so the cost of an
+add depends on the CSV rather than the size of the master file. --sort does
+not apply; run --compact to sort the file when needed.
+
+In merge mode, the links of every CSV are cached under 'data/cache/' keyed by
+path, size and mtime, so a rerun only parses new or changed files.
+
+With --from-store, the links come from the history store, so no CSV file is
+read at all.
+
+Examples:
+  rdump merge --dir ./my_exports --output merged_links.txt
+  rdump merge --add-csv my_links.csv --add-to-txt master_links.txt --sort
+  rdump merge --add-csv my_links.csv --add-to-txt master_links.txt --append
+  rdump merge --compact master_links.txt
+  rdump merge --from-store --output merged_links.txt --sort
+"""
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Merge all unique 'reurb_link' links from CSV files in a directory (recursively) into a text file, or add links from a CSV to a text file.",
+        add_help=False,
+        usage=HELP_TEXT
+    )
+    parser.add_argument('--dir', '-d', required=False, help='Directory to scan for CSV files (use "." for current directory)')
+    parser.add_argument('--output', '-o', required=False, help='Path (and filename) for the output text file')
+    parser.add_argument('--sort', '-s', action='store_true', help='Sort the output links alphabetically')
+    parser.add_argument('--jobs', '-j', type=int, default=None, help='Number of worker processes used to parse CSV files (default: CPU count)')
+    parser.add_argument('--help', '-h', action='store_true', help='Show this help message and exit')
+    parser.add_argument('--add-csv', required=False, help='Path to a single CSV file to add links from (reurb_link column)')
+    parser.add_argument('--add-to-txt', required=False, help='Path to a text file to add links to (one link per line, no duplicates)')
+    parser.add_argument('--append', action='store_true', help='Append only new links using a sidecar index instead of rewriting the text file')
+    parser.add_argument('--from-store', action='store_true', help='Merge the links of the history store instead of scanning --dir')
+    parser.add_argument('--store', required=False, help='Path to the history store (default: data/rdump-history.sqlite)')
+    parser.add_argument('--compact', required=False, help='Path to a text file to deduplicate, sort and reindex in place')
+    return parser.parse_args(argv)
+
+def find_csv_files(directory):
+    for root, _, files in os.walk(directory):
+        for file in files:
+            if file.lower().endswith('.csv'):
+                yield os.path.join(root, file)
+
+@timed_phase(count=len)
+def extract_links_from_csv(csv_path):
+    links = set()
+    try:
+        with open(csv_path, newline='', encoding='utf-8') as csvfile:
+            reader = csv.DictReader(csvfile)
+            if 'reurb_link' not in reader.fieldnames:
+                print(f"Skipping (no 'reurb_link' column): {csv_path}")
+                return links
+            for row in reader:
+                link = row.get('reurb_link', '').strip()
+                if link:
+                    links.add(link)
+    except Exception as e:
+        print(f"Skipping (error reading file): {csv_path} ({e})")
+    return links
+
+def open_link_cache(cache_path):
+    conn = sqlite3.connect(cache_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    if conn.execute("PRAGMA user_version").fetchone()[0] != CACHE_VERSION:
+        conn.executescript(f"""
+            DROP TABLE IF EXISTS links;
+            DROP TABLE IF EXISTS files;
+            PRAGMA user_version={CACHE_VERSION};
+        """)
+    # The links of each file are stored as one LinkStore blob
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS files (
+            path TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            links BLOB NOT NULL
+        )
+    """)
+    return conn
+
+def _parse_csv_file(csv_path):
+    # Worker entry point: a LinkStore pickles as a few arrays instead of one string per link
+    return csv_path, LinkStore(extract_links_from_csv(csv_path))
+
+@timed_phase(count=len)
+def collect_links(dir_path, jobs=None):
+    # Returns the union of links (a LinkStore) from every CSV under dir_path. Files whose
+    # (path, size, mtime) match the cache are read from it; the rest are
+    # parsed in a process pool and written back to the cache.
+    conn = open_link_cache(os.path.join(default_cache_dir(), CACHE_FILENAME))
+    all_links = LinkStore()
+    hits = 0
+    to_parse = []
+    seen = {}
+    for csv_file in find_csv_files(dir_path):
+        csv_file = os.path.abspath(csv_file)
+        st = os.stat(csv_file)
+        seen[csv_file] = (st.st_size, st.st_mtime_ns)
+        row = conn.execute("SELECT size, mtime_ns, links FROM files WHERE path=?", (csv_file,)).fetchone()
+        if row is not None and row[:2] == (st.st_size, st.st_mtime_ns):
+            all_links.update(LinkStore.loads(row[2]))
+            hits += 1
+        else:
+            to_parse.append(csv_file)
+    if to_parse:
+        from concurrent.futures import ProcessPoolExecutor
+        workers = jobs or os.cpu_count() or 1
+        chunksize = max(1, len(to_parse) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers) as pool, conn:
+            for csv_file, links in pool.map(_parse_csv_file, to_parse, chunksize=chunksize):
+                all_links.update(links)
+                size, mtime_ns = seen[csv_file]
+                conn.execute("INSERT OR REPLACE INTO files (path, size, mtime_ns, links) VALUES (?, ?, ?, ?)",
+                             (csv_file, size, mtime_ns, links.dumps()))
+    # Forget files under this directory that no longer exist
+    prefix = os.path.join(os.path.abspath(dir_path), '')
+    stale = [path for (path,) in conn.execute("SELECT path FROM files WHERE substr(path, 1, ?) = ?", (len(prefix), prefix)) if path not in seen]
+    if stale:
+        with conn:
+            conn.executemany("DELETE FROM files WHERE path=?", ((path,) for path in stale))
+    conn.close()
+    print(f"Scanned {len(seen)} CSV files: {hits} cache hits, {len(to_parse)} parsed")
+    return all_links
+
+@timed_phase()
+def write_links_to_file(links, output_path):
+    with open(output_path, 'w', encoding='utf-8') as f:
+        for link in links:
+            f.write(link + '\n')
+    print(f"Exported: {output_path}")
+
+@timed_phase()
+def add_csv_links_to_txt(csv_path, txt_path, sort_links):
+    import csv
+    # Read links from CSV
+    links = LinkStore()
+    with open(csv_path, newline='', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile)
+        if 'reurb_link' not in reader.fieldnames:
+            print(f"Error: 'reurb_link' column not found in {csv_path}")
+            return
+        for row in reader:
+            link = row.get('reurb_link', '').strip()
+            if link:
+                links.add(link)
+    # Read existing links from txt file
+    existing = LinkStore()
+    if os.path.exists(txt_path):
+        with open(txt_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                l = line.strip()
+                if l:
+                    existing.add(l)
+    # Merge and deduplicate
+    all_links = existing | links
+    total = len(all_links)
+    all_links = all_links.sorted_links() if sort_links else all_links
+    # Write back to txt file
+    with open(txt_path, 'w', encoding='utf-8') as f:
+        for link in all_links:
+            f.write(link + '\n')
+    print(f"Added {len(links - existing)} new links to {txt_path} (total: {total})")
+
+# Sidecar index for append mode: an open-addressing hash set of 64-bit link
+# hashes, memory-mapped from '<master>.idx'. The header records how many bytes
+# of the master file are indexed plus a digest of the bytes just before that
+# offset, so appends made by other tools are picked up from the tail and any
+# rewrite of the file triggers a rebuild.
+INDEX_MAGIC = b'RDLIDX01'
+INDEX_HEADER = struct.Struct('<8sQQQ16s')  # magic, capacity, count, covered_size, anchor
+INDEX_HEADER_SIZE = 64
+INDEX_SLOT = struct.Struct('<Q')
+INDEX_ANCHOR_BYTES = 4096
+INDEX_MIN_CAPACITY = 1 << 12
+
+def link_hash(link):
+    # 0 marks an empty slot, so it is never used as a hash
+    return int.from_bytes(hashlib.blake2b(link.encode('utf-8'), digest_size=8).digest(), 'little') or 1
+
+def file_anchor(path, size):
+    # Digest of the last INDEX_ANCHOR_BYTES bytes before 'size'; unchanged by appends
+    if size == 0:
+        return hashlib.blake2b(b'', digest_size=16).digest()
+    with open(path, 'rb') as f:
+        f.seek(max(0, size - INDEX_ANCHOR_BYTES))
+        return hashlib.blake2b(f.read(min(size, INDEX_ANCHOR_BYTES)), digest_size=16).digest()
+
+class LinkIndex:
+    def __init__(self, path):
+        self.path = path
+        self._load()
+
+    def _load(self):
+        self._file = open(self.path, 'r+b')
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, self.capacity, self.count, self.covered_size, self.anchor = INDEX_HEADER.unpack_from(self._map, 0)
+        if magic != INDEX_MAGIC or len(self._map) != INDEX_HEADER_SIZE + self.capacity * INDEX_SLOT.size:
+            self.close()
+            raise ValueError(f"Not a valid link index: {self.path}")
+
+    @classmethod
+    def create(cls, path, capacity=INDEX_MIN_CAPACITY):
+        capacity = max(INDEX_MIN_CAPACITY, 1 << (capacity - 1).bit_length())
+        with open(path, 'wb') as f:
+            header = INDEX_HEADER.pack(INDEX_MAGIC, capacity, 0, 0, file_anchor(None, 0))
+            f.write(header.ljust(INDEX_HEADER_SIZE, b'\0'))
+            # Extend with zeros (sparse on most filesystems)
+            f.truncate(INDEX_HEADER_SIZE + capacity * INDEX_SLOT.size)
+        return cls(path)
+
+    def _probe(self, h):
+        # Returns (slot offset, found) using linear probing
+        mask = self.capacity - 1
+        slot = h & mask
+        while True:
+            offset = INDEX_HEADER_SIZE + slot * INDEX_SLOT.size
+            value = INDEX_SLOT.unpack_from(self._map, offset)[0]
+            if value == h:
+                return offset, True
+            if value == 0:
+                return offset, False
+            slot = (slot + 1) & mask
+
+    def __contains__(self, h):
+        return self._probe(h)[1]
+
+    def add(self, h):
+        offset, found = self._probe(h)
+        if not found:
+            INDEX_SLOT.pack_into(self._map, offset, h)
+            self.count += 1
+        return not found
+
+    def reserve(self, extra):
+        # Keep the load factor at or below one half
+        if (self.count + extra) * 2 <= self.capacity:
+            return
+        tmp_path = self.path + '.tmp'
+        grown = LinkIndex.create(tmp_path, (self.count + extra) * 4)
+        for slot in range(self.capacity):
+            value = INDEX_SLOT.unpack_from(self._map, INDEX_HEADER_SIZE + slot * INDEX_SLOT.size)[0]
+            if value:
+                grown.add(value)
+        grown.covered_size, grown.anchor = self.covered_size, self.anchor
+        grown.close()
+        self.close()
+        os.replace(tmp_path, self.path)
+        self._load()
+
+    def close(self):
+        if self._map is not None and not self._map.closed:
+            INDEX_HEADER.pack_into(self._map, 0, INDEX_MAGIC, self.capacity, self.count, self.covered_size, self.anchor)
+            self._map.flush()
+            self._map.close()
+        self._file.close()
+
+def index_lines(index, txt_path, offset):
+    # Add every line of txt_path from byte 'offset' onward to the index
+    with open(txt_path, 'rb') as f:
+        f.seek(offset)
+        for raw in f:
+            link = raw.decode('utf-8').strip()
+            if link:
+                index.reserve(1)
+                index.add(link_hash(link))
+
+@timed_phase(count=lambda index: index.count)
+def sync_link_index(txt_path):
+    # Returns an up-to-date LinkIndex for txt_path, catching up on appended
+    # lines or rebuilding from scratch when the file was rewritten
+    index_path = txt_path + '.idx'
+    size = os.path.getsize(txt_path) if os.path.exists(txt_path) else 0
+    index = None
+    if os.path.exists(index_path):
+        try:
+            index = LinkIndex(index_path)
+        except ValueError:
+            index = None
+    if index is not None and (index.covered_size > size or file_anchor(txt_path, index.covered_size) != index.anchor):
+        index.close()
+        index = None
+    if index is None:
+        print(f"Building link index: {index_path}")
+        # Roughly 40 bytes per link; reserve() grows the table if this is low
+        index = LinkIndex.create(index_path, size // 20)
+    if index.covered_size < size:
+        index_lines(index, txt_path, index.covered_size)
+        index.covered_size = size
+        index.anchor = file_anchor(txt_path, size)
+    return index
+
+@timed_phase()
+def append_csv_links_to_txt(csv_path, txt_path):
+    # Append only links not already in txt_path; cost scales with the CSV, not the master file
+    links = extract_links_from_csv(csv_path)
+    index = sync_link_index(txt_path)
+    try:
+        new_links = sorted(link for link in links if link_hash(link) not in index)
+        if new_links:
+            with open(txt_path, 'ab+') as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        f.write(b'\n')
+                f.write(''.join(link + '\n' for link in new_links).encode('utf-8'))
+                f.flush()
+                os.fsync(f.fileno())
+            # Index only after the links are durably in the file
+            index.reserve(len(new_links))
+            for link in new_links:
+                index.add(link_hash(link))
+            size = os.path.getsize(txt_path)
+            index.covered_size = size
+            index.anchor = file_anchor(txt_path, size)
+        total = index.count
+    finally:
+        index.close()
+    print(f"Appended {len(new_links)} new links to {txt_path} (total: {total})")
+
+@timed_phase()
+def compact_txt(txt_path):
+    # Deduplicate and sort the master file in one full rewrite, then rebuild its index
+    links = LinkStore()
+    with open(txt_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            link = line.strip()
+            if link:
+                links.add(link)
+    tmp_path = txt_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for link in links.sorted_links():
+            f.write(link + '\n')
+    os.replace(tmp_path, txt_path)
+    if os.path.exists(txt_path + '.idx'):
+        os.remove(txt_path + '.idx')
+    sync_link_index(txt_path).close()
+    print(f"Compacted {txt_path}: {len(links)} unique links, sorted")
+
+def merge_models(dir_path, output_path, sort_links=False, jobs=None):
+    # Merge the links of every CSV under dir_path into output_path. Returns the
+    # number of links written; nothing is written when no links are found.
+    all_links = collect_links(dir_path, jobs)
+    if not all_links:
+        return 0
+    write_links_to_file(all_links.sorted_links() if sort_links else all_links, output_path)
+    return len(all_links)
+
+@timed_phase(count=int)
+def merge_store_links(output_path, sort_links=False, store_path=None):
+    # Like merge_models(), reading every URL of the history store instead of the CSV files
+    conn = open_history_store(store_path)
+    try:
+        all_links = LinkStore(iter_store_links(conn))
+    finally:
+        conn.close()
+    if not all_links:
+        return 0
+    write_links_to_file(all_links.sorted_links() if sort_links else all_links, output_path)
+    return len(all_links)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.help or (not args.dir and not args.add_csv and not args.compact and not args.from_store):
+        print(HELP_TEXT)
+        sys.exit(0)
+    if args.compact:
+        if not os.path.isfile(args.compact):
+            print(f"Error: File not found: {args.compact}")
+            sys.exit(1)
+        compact_txt(args.compact)
+        sys.exit(0)
+    # New functionality: add links from a CSV to a text file
+    if args.add_csv and args.add_to_txt:
+        if args.append:
+            append_csv_links_to_txt(args.add_csv, args.add_to_txt)
+        else:
+            add_csv_links_to_txt(args.add_csv, args.add_to_txt, args.sort)
+        sys.exit(0)
+    if args.from_store:
+        store_path = args.store or default_store_path()
+        if not args.output:
+            print("Error: --from-store needs --output")
+            sys.exit(1)
+        if not os.path.isfile(store_path):
+            print(f"Error: History store not found: {store_path} (run 'rdump ingest' first)")
+            sys.exit(1)
+        if not merge_store_links(args.output, args.sort, store_path):
+            print("No links found in the history store.")
+        sys.exit(0)
+    dir_path = args.dir
+    if dir_path == ".":
+        dir_path = os.getcwd()
+    if not os.path.isdir(dir_path):
+        print(f"Error: Directory not found: {dir_path}")
+        print(HELP_TEXT)
+        sys.exit(1)
+    if not merge_models(dir_path, args.output, args.sort, args.jobs):
+        print("No links found in any CSV files.")
+        sys.exit(0)
+
+if __name__ == "__main__":
+    main() 
\ No newline at end of file
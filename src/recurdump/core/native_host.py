@@ -0,0 +1,207 @@
+"""
+rdump native-host (started by Firefox through scripts/rdump-native-host.py)
+Native-messaging host that writes RecurTrack extraction results straight into the history store.
+
+Arguments:
+  --install      Write the host manifest so Firefox can start this host
+  --store        Path to the history store (default: 'data/rdump-history.sqlite')
+  --help, -h     Show this help message and exit
+
+The extension connects with browser.runtime.connectNative('recurdump_ingest'). Each message, in both directions, is UTF-8 JSON preceded by its length as a 32-bit unsigned integer in native byte order. Every 'records' message is written in one transaction, and each extraction session is recorded like an ingested export, so 'rdump ingest --as-of' and 'rdump sync --model' see it without any CSV file.
+
+In-process use: serve() runs the host over any pair of binary streams; read_message() and write_message() implement the framing for stub clients.
+"""
+import argparse
+import json
+import os
+import struct
+import sys
+from datetime import datetime, timezone
+
+from recurdump import __version__
+from recurdump.core.ingest import (create_staging, default_store_path, format_time, merge_staged, model_id_for,
+                                   open_history_store, parse_time, record_export, stage_rows)
+from recurdump.utils.paths import REPO_ROOT
+from recurdump.utils.profiling import timed_phase
+
+HOST_NAME = 'recurdump_ingest'
+EXTENSION_ID = 'recurtrack@recurdump'
+HOST_SCRIPT = os.path.join(REPO_ROOT, 'scripts', 'rdump-native-host.py')
+# Length prefix of every message: 32-bit unsigned, native byte order
+MESSAGE_HEADER = struct.Struct('=I')
+
+HELP_TEXT = """
+rdump native-host - Write RecurTrack extraction results straight into the history store.
+
+Arguments:
+  --install      Write the host manifest so Firefox can start this host
+  --store        Path to the history store
+                 (default: 'data/rdump-history.sqlite')
+  --help, -h     Show this help message and exit
+
+Firefox starts the host when the extension has "Stream results to RecurDump"
+enabled. Run 'rdump native-host --install' once to register it; the manifest
+points Firefox at scripts/rdump-native-host.py in this checkout.
+
+Protocol: each message is UTF-8 JSON preceded by its length as a 32-bit
+unsigned integer in native byte order.
+  {"type": "hello"}
+  {"type": "records", "id": 1, "session": "...", "model": "...",
+   "startedAt": "<ISO time>", "records": [{"url": "...", "filename": "...",
+   "extractedAt": "..."}, ...]}
+  {"type": "end", "id": 2, "session": "..."}
+Replies are {"type": "hello", ...}, {"type": "ack", "id": 1, "stored": N,
+"total": N} or {"type": "error", "id": 1, "message": "..."}. A message that is
+not valid JSON gets an error with "id": null, and the host keeps reading.
+
+Every records message is one transaction. A session is stored like an
+ingested export named 'native:<session>' with its start time as export time;
+each record keeps its extractedAt as the row's 'Extracted At'.
+
+Example usage:
+  rdump native-host --install
+  python benchmarks/bench_native_host.py --records 20000
+"""
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Native-messaging host for the RecurTrack extension.",
+        add_help=False,
+        usage=HELP_TEXT
+    )
+    parser.add_argument('--install', action='store_true', help='Write the host manifest so Firefox can start this host')
+    parser.add_argument('--store', default=None, help='Path to the history store (default: data/rdump-history.sqlite)')
+    parser.add_argument('--help', '-h', action='store_true', help='Show this help message and exit')
+    # Firefox passes the manifest path and the extension ID as extra arguments
+    args, _ = parser.parse_known_args(argv)
+    if args.help:
+        print(HELP_TEXT)
+        sys.exit(0)
+    return args
+
+def read_message(stream):
+    # Returns the next decoded message, or None once the stream is closed.
+    # Raises ValueError for a frame that is not UTF-8 JSON; the frame is
+    # consumed, so the next one can still be read.
+    header = stream.read(MESSAGE_HEADER.size)
+    if len(header) < MESSAGE_HEADER.size:
+        return None
+    (length,) = MESSAGE_HEADER.unpack(header)
+    data = stream.read(length)
+    if len(data) < length:
+        return None
+    return json.loads(data.decode('utf-8'))
+
+def write_message(stream, message):
+    data = json.dumps(message, separators=(',', ':')).encode('utf-8')
+    stream.write(MESSAGE_HEADER.pack(len(data)) + data)
+    stream.flush()
+
+def iter_record_rows(records):
+    for record in records or ():
+        if not isinstance(record, dict):
+            continue
+        url = str(record.get('url') or '').strip()
+        if url:
+            yield url, str(record.get('filename') or '').strip(), str(record.get('extractedAt') or '').strip() or None
+
+@timed_phase(count=lambda result: result[0])
+def store_records(conn, sessions, message):
+    # Write one batch in one transaction; returns (rows stored, rows in the session so far)
+    session = str(message.get('session') or '')
+    model = str(message.get('model') or '').strip()
+    if not session or not model:
+        raise ValueError("'records' messages need 'session' and 'model'")
+    exported_at = sessions.get(session)
+    if exported_at is None:
+        exported_at = parse_time(message.get('startedAt')) or format_time(datetime.now(timezone.utc))
+        sessions[session] = exported_at
+    with conn:
+        model_id = model_id_for(conn, model)
+        stored = stage_rows(conn, iter_record_rows(message.get('records')))
+        file_id = record_export(conn, f"native:{session}", 0, 0, model_id, exported_at, replace=False)
+        merge_staged(conn, file_id)
+        total = conn.execute("SELECT rows FROM files WHERE id=?", (file_id,)).fetchone()[0]
+    return stored, total
+
+def handle_message(conn, sessions, message, store_path):
+    kind = message.get('type') if isinstance(message, dict) else None
+    if kind == 'hello':
+        return {'type': 'hello', 'version': __version__, 'store': store_path}
+    if kind == 'records':
+        stored, total = store_records(conn, sessions, message)
+        return {'type': 'ack', 'id': message.get('id'), 'stored': stored, 'total': total}
+    if kind == 'end':
+        session = str(message.get('session') or '')
+        sessions.pop(session, None)
+        row = conn.execute("SELECT rows FROM files WHERE path=?", (f"native:{session}",)).fetchone()
+        return {'type': 'ack', 'id': message.get('id'), 'stored': 0, 'total': row[0] if row else 0}
+    raise ValueError(f"Unknown message type: {kind}")
+
+def serve(instream, outstream, store_path=None):
+    # Answer messages until the extension closes the connection; returns the number handled
+    store_path = store_path or default_store_path()
+    conn = open_history_store(store_path)
+    create_staging(conn)
+    sessions = {}
+    handled = 0
+    try:
+        while True:
+            try:
+                message = read_message(instream)
+            except ValueError as e:
+                write_message(outstream, {'type': 'error', 'id': None, 'message': f"Malformed message: {e}"})
+                print(f"rdump native-host: malformed message: {e}", file=sys.stderr)
+                handled += 1
+                continue
+            if message is None:
+                break
+            try:
+                reply = handle_message(conn, sessions, message, store_path)
+            except Exception as e:
+                reply = {'type': 'error', 'id': message.get('id') if isinstance(message, dict) else None, 'message': str(e)}
+                print(f"rdump native-host: {e}", file=sys.stderr)
+            write_message(outstream, reply)
+            handled += 1
+    finally:
+        conn.close()
+    return handled
+
+def native_hosts_dir():
+    if sys.platform == 'darwin':
+        return os.path.expanduser('~/Library/Application Support/Mozilla/NativeMessagingHosts')
+    return os.path.expanduser('~/.mozilla/native-messaging-hosts')
+
+def install_manifest(target_dir=None):
+    # Write the host manifest Firefox looks up by HOST_NAME; returns its path
+    target_dir = target_dir or native_hosts_dir()
+    os.makedirs(target_dir, exist_ok=True)
+    manifest = {
+        'name': HOST_NAME,
+        'description': 'RecurDump history store ingest host',
+        'path': HOST_SCRIPT,
+        'type': 'stdio',
+        'allowed_extensions': [EXTENSION_ID],
+    }
+    manifest_path = os.path.join(target_dir, f"{HOST_NAME}.json")
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest_path
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.install:
+        if sys.platform == 'win32':
+            print("Error: On Windows the manifest must be registered in the registry; see the Firefox native messaging documentation.")
+            sys.exit(1)
+        manifest_path = install_manifest()
+        print(f"Installed native messaging host manifest: {manifest_path}")
+        print(f"Host: {HOST_SCRIPT}")
+        sys.exit(0)
+    # stdout carries the protocol; anything printed by accident goes to stderr instead
+    outstream = sys.stdout.buffer
+    sys.stdout = sys.stderr
+    serve(sys.stdin.buffer, outstream, args.store)
+
+if __name__ == "__main__":
+    main()
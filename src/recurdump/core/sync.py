@@ -0,0 +1,802 @@
+"""
+rdump sync (also available as scripts/rdump-sync.py)
+Synchronize a RecurTrack CSV database with a directory of video files.
+
+Required arguments:
+  --db, -d      Path to the RecurTrack CSV database file (exported from the Firefox extension)
+  --dir, -p     Path to the directory containing your video files (use '.' for current directory); repeat to check several directories
+
+Batch mode (replaces --db):
+  --batch, -B   Directory or glob of RecurTrack '*_Database_*.csv' files to check in one pass
+  --jobs, -j    Number of worker processes used to parse the databases (default: CPU count)
+
+History store mode (replaces --db):
+  --model, -m   Check the latest catalog of this model in the 'rdump ingest' history store
+  --store       Path to the history store (default: 'data/rdump-history.sqlite')
+
+Optional arguments:
+  --backup, -b          Backup the input database file before processing
+  --output, -o          Specify a different output directory and/or filename for the exported CSV
+  --sort, -s            Sort the output CSV by a specified column (URL, Filename, or Extracted At); large outputs are sorted on disk
+  --desc, -D            Sort in descending order (default is ascending)
+  --reindex             Ignore the cached directory index and rescan the video directory
+  --watch, -w           Keep running and update the output as files appear or the database changes (Linux, with --db)
+  --match               How database filenames are compared with the files: exact (default), normalized or fuzzy
+  --ext-equiv           Comma-separated extensions that count as the same file; repeat for more groups (default: mp4,m4v,ts,mkv,mov,webm)
+  --min-score           Lowest similarity (0-1) accepted as a fuzzy match (default: 0.8)
+  --duplicates          Read an 'rdump dedupe' report (default: 'data/rdump-duplicates.csv'); a file of a duplicate group counts as present when any file of the group is
+  --help, -h            Show this help message and exit
+
+Recursive scan:
+  --recursive, -r       Also count files in subfolders of every --dir, walking them on a thread pool
+  --max-depth           Deepest subfolder level walked (0: the directories themselves; default: no limit)
+  --include             Glob of files to count, matched against the name or, with a '/', the relative path (repeatable)
+  --exclude             Glob of files or folders to skip (repeatable)
+  --ext                 Comma-separated extensions to count (default: all files)
+  --scan-threads        Directories listed in parallel (default: 16)
+
+Directory listings are cached in an SQLite index under 'data/cache/'. A directory is only rescanned when its mtime has changed since the last run.
+
+With --watch the database and directory are read once; inotify events on the video directory and on the database then update the missing list in place. Changes are debounced and the output is rewritten (atomically) within a second, and only when its content changes; it then lists no rows once every file is present. Idle watching uses no CPU.
+
+Files renamed by post-processing count as present with --match normalized (same stem ignoring case, equivalent extension) or --match fuzzy (also near names such as added suffixes, found through a trigram index of the directory). A fuzzy match must keep the numbers of the database name (date, time) in order. Every match under another name is listed with its score in '[MODEL NAME]_matched-files_MM-DD-YY.csv' next to the output.
+
+With --recursive the directories are walked in parallel instead of read from the index: on NAS mounts each listing is a network round trip, and listing many folders at once hides that latency. A file counts as present when its name appears anywhere under one of the directories. Outputs go to the first --dir.
+
+If any filenames in the database are not found in the directory, a new CSV is exported with only those missing entries, formatted like the input. The output file is named '[MODEL NAME]_need-to-download_MM-DD-YY.csv' by default, saved in the input directory unless overridden.
+
+With --model, rows come from the history store built by 'rdump ingest' instead of a CSV file: the model's latest export as recorded there, without re-reading any export.
+
+In batch mode the directory is scanned once and every database is checked against it. Databases of the same model are merged, one need-to-download CSV is written per model, and a 'batch-summary_MM-DD-YY.csv' lists the results for all models. --output must be a directory in batch mode.
+
+In-process use: sync_database() and sync_batch() run the same checks as the command line and return their results.
+"""
+import argparse
+import csv
+import glob
+import hashlib
+import heapq
+import io
+import itertools
+import os
+import sys
+import shutil
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+
+from recurdump.core.dedupe import default_report_path, read_duplicate_groups
+from recurdump.core.ingest import default_store_path, extract_model_name, iter_catalog, latest_export_time, open_history_store
+from recurdump.core.matching import DEFAULT_EXT_GROUPS, DEFAULT_MIN_SCORE, MATCH_MODES, FilenameMatcher, MatchOptions, parse_ext_groups
+from recurdump.utils.paths import default_cache_dir
+from recurdump.utils.profiling import timed_phase
+from recurdump.utils.walker import DEFAULT_THREADS, WalkOptions, walk_files
+
+INDEX_FILENAME = 'rdump-sync-index.sqlite'
+# Directories modified this recently may still change within the same mtime tick
+MTIME_SETTLE_NS = 2 * 1_000_000_000
+# Rows held in memory per sorted run before --sort spills to a temp file
+SORT_CHUNK_ROWS = 200_000
+
+HELP_TEXT = """
+rdump sync - Synchronize a RecurTrack CSV database with a directory of video files.
+
+Required arguments:
+  --db, -d      Path to the RecurTrack CSV database file (exported from the Firefox extension)
+  --dir, -p     Path to the directory containing your video files (use "." for current directory);
+                repeat to check several directories
+
+Batch mode (replaces --db):
+  --batch, -B   Directory or glob of RecurTrack '*_Database_*.csv' files to check in one pass
+  --jobs, -j    Number of worker processes used to parse the databases (default: CPU count)
+
+History store mode (replaces --db):
+  --model, -m   Check the latest catalog of this model in the 'rdump ingest' history store
+  --store       Path to the history store (default: 'data/rdump-history.sqlite')
+
+Optional arguments:
+  --backup, -b          Backup the input database file before processing
+  --output, -o          Specify a different output directory and/or filename for the exported CSV
+  --sort, -s            Sort the output CSV by a specified column (URL, Filename, or Extracted At); large outputs are sorted on disk
+  --desc, -D            Sort in descending order (default is ascending)
+  --reindex             Ignore the cached directory index and rescan the video directory
+  --watch, -w           Keep running and update the output as files appear or
+                        the database changes (Linux only, with --db)
+  --match               How database filenames are compared with the files:
+                        exact (default), normalized or fuzzy
+  --ext-equiv           Comma-separated extensions that count as the same file;
+                        repeat for more groups (default: mp4,m4v,ts,mkv,mov,webm)
+  --min-score           Lowest similarity (0-1) accepted as a fuzzy match
+                        (default: 0.8)
+  --duplicates [REPORT] Count the copies listed in an 'rdump dedupe' report as
+                        present (default: 'data/rdump-duplicates.csv')
+  --help, -h            Show this help message and exit
+
+Recursive scan:
+  --recursive, -r       Also count files in subfolders of every --dir
+  --max-depth           Deepest subfolder level walked (0: the directories
+                        themselves; default: no limit)
+  --include             Glob of files to count; globs with a '/' match the path
+                        relative to the --dir (repeatable)
+  --exclude             Glob of files or folders to skip (repeatable)
+  --ext                 Comma-separated extensions to count (default: all files)
+  --scan-threads        Directories listed in parallel (default: 16)
+
+Directory listings are cached in an SQLite index under 'data/cache/'. A
+directory is only rescanned when its mtime has changed since the last run.
+
+With --recursive the folders are walked on a thread pool instead of read from
+the index, so that on NAS mounts many listings wait on the network at once. A
+file counts as present when its name appears anywhere under one of the --dir
+directories; outputs go to the first one.
+
+With --watch the database and directory are read once, then inotify events
+keep the list of missing files up to date. The output is rewritten within a
+second of a change, and only when its content changes; once every file is
+present it holds just the header. Stop watching with Ctrl+C.
+
+Files renamed after download can still count as present:
+  --match normalized  same stem ignoring case, extensions of one --ext-equiv
+                      group are equal ('Model_x.TS' matches 'model_x.mp4')
+  --match fuzzy       also near names, such as added suffixes ('model_x (1).mp4'),
+                      looked up in a trigram index of the directory; the numbers
+                      of the name (date, time) must stay the same
+Matches under another name are listed with their score in
+'[MODEL NAME]_matched-files_MM-DD-YY.csv' next to the output.
+
+In batch mode the directory is scanned once, databases of the same model are
+merged, one need-to-download CSV is written per model and a
+'batch-summary_MM-DD-YY.csv' lists the results for all models. --output must
+be a directory in batch mode.
+
+With --model, rows come from the history store built by 'rdump ingest': the
+model's latest export as recorded there, without re-reading any CSV file.
+
+Example usage:
+  rdump sync --db my_model_Database_07-20-2025.csv --dir /path/to/videos
+  rdump sync -d my_model_Database_07-20-2025.csv -p . --backup --sort Filename --desc
+  rdump sync --batch ./exports --dir /path/to/videos --output ./todo
+  rdump sync -B "./exports/*_Database_07-*.csv" -p . -j 8
+  rdump sync --model my_model --dir /path/to/videos
+  rdump sync --db my_model_Database_07-20-2025.csv --dir /path/to/videos --watch
+  rdump sync --db my_model_Database_07-20-2025.csv --dir /path/to/videos --match fuzzy --ext-equiv mp4,ts
+  rdump sync --db my_model_Database_07-20-2025.csv -p /mnt/nas1/videos -p /mnt/nas2/videos --recursive --ext mp4,ts --exclude '@eaDir'
+"""
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Synchronize a RecurTrack CSV database with a directory of video files.",
+        add_help=False,
+        usage=HELP_TEXT
+    )
+    parser.add_argument('--db', '-d', required=False, help='Path to the RecurTrack CSV database file')
+    parser.add_argument('--batch', '-B', required=False, help='Directory or glob of RecurTrack *_Database_*.csv files to check in one pass')
+    parser.add_argument('--jobs', '-j', type=int, default=None, help='Number of worker processes for batch mode (default: CPU count)')
+    parser.add_argument('--model', '-m', required=False, help="Check the model's latest catalog in the history store")
+    parser.add_argument('--store', required=False, help='Path to the history store (default: data/rdump-history.sqlite)')
+    parser.add_argument('--dir', '-p', action='append', required=False, help='Path to the directory containing your video files (use "." for current directory); repeatable')
+    parser.add_argument('--backup', '-b', action='store_true', help='Backup the input database file before processing')
+    parser.add_argument('--output', '-o', help='Specify a different output directory and/or filename for the exported CSV')
+    parser.add_argument('--sort', '-s', choices=['URL', 'Filename', 'Extracted At'], help='Sort the output CSV by a specified column')
+    parser.add_argument('--desc', '-D', action='store_true', help='Sort in descending order (default is ascending)')
+    parser.add_argument('--reindex', action='store_true', help='Ignore the cached directory index and rescan the video directory')
+    parser.add_argument('--watch', '-w', action='store_true', help='Keep running and update the output as files appear or the database changes')
+    parser.add_argument('--match', choices=MATCH_MODES, default='exact', help='How database filenames are compared with the files')
+    parser.add_argument('--ext-equiv', action='append', help='Comma-separated extensions that count as the same file (repeatable)')
+    parser.add_argument('--min-score', type=float, default=DEFAULT_MIN_SCORE, help='Lowest similarity accepted as a fuzzy match')
+    parser.add_argument('--recursive', '-r', action='store_true', help='Also count files in subfolders, walking them in parallel')
+    parser.add_argument('--max-depth', type=int, default=None, help='Deepest subfolder level walked with --recursive')
+    parser.add_argument('--include', action='append', help='Glob of files to count with --recursive (repeatable)')
+    parser.add_argument('--exclude', action='append', help='Glob of files or folders to skip with --recursive (repeatable)')
+    parser.add_argument('--ext', action='append', help='Comma-separated extensions to count with --recursive')
+    parser.add_argument('--scan-threads', type=int, default=DEFAULT_THREADS, help='Directories listed in parallel with --recursive')
+    parser.add_argument('--duplicates', nargs='?', const='', default=None, help="Count copies listed in an 'rdump dedupe' report as present")
+    parser.add_argument('--help', '-h', action='store_true', help='Show this help message and exit')
+    args = parser.parse_args(argv)
+    if args.help or not ((args.db or args.batch or args.model) and args.dir):
+        print(HELP_TEXT)
+        sys.exit(0)
+    return args
+
+def backup_file(filepath):
+    backup_path = filepath + ".bak"
+    shutil.copy2(filepath, backup_path)
+    print(f"Backup created: {backup_path}")
+
+def read_csv_fieldnames(csv_path):
+    with open(csv_path, newline='', encoding='utf-8') as csvfile:
+        return csv.DictReader(csvfile).fieldnames
+
+@timed_phase()
+def iter_csv_database(csv_path):
+    # Stream rows one at a time instead of loading the whole database
+    with open(csv_path, newline='', encoding='utf-8') as csvfile:
+        yield from csv.DictReader(csvfile)
+
+def get_filenames_from_db(rows):
+    return set(row['Filename'] for row in rows if row['Filename'])
+
+@timed_phase(count=len)
+def scan_directory_for_files(directory):
+    files = set()
+    for entry in os.scandir(directory):
+        if entry.is_file():
+            files.add(entry.name)
+    return files
+
+def open_file_index(index_path):
+    conn = sqlite3.connect(index_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS directories (
+            path TEXT PRIMARY KEY,
+            mtime_ns INTEGER NOT NULL,
+            scanned_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS entries (
+            directory TEXT NOT NULL,
+            name TEXT NOT NULL,
+            PRIMARY KEY (directory, name)
+        ) WITHOUT ROWID;
+    """)
+    return conn
+
+@timed_phase(count=lambda result: len(result[0]))
+def scan_directory_indexed(conn, directory, reindex=False):
+    # Returns (files, stats). The directory listing is reused from the index when
+    # the directory's mtime is unchanged; otherwise it is rescanned and stored.
+    directory = os.path.abspath(directory)
+    stats = {'reused': 0, 'rescanned': 0, 'entries_reused': 0, 'entries_scanned': 0}
+    # Stat before listing so a change made during the scan is caught next run
+    mtime_ns = os.stat(directory).st_mtime_ns
+    row = conn.execute("SELECT mtime_ns FROM directories WHERE path=?", (directory,)).fetchone()
+    if not reindex and row and row[0] == mtime_ns:
+        files = set(name for (name,) in conn.execute("SELECT name FROM entries WHERE directory=?", (directory,)))
+        stats['reused'] += 1
+        stats['entries_reused'] += len(files)
+        return files, stats
+    files = scan_directory_for_files(directory)
+    stats['rescanned'] += 1
+    stats['entries_scanned'] += len(files)
+    now = time.time()
+    if now * 1_000_000_000 - mtime_ns < MTIME_SETTLE_NS:
+        # Too fresh to trust: force a rescan next time
+        mtime_ns = -1
+    with conn:
+        conn.execute("DELETE FROM entries WHERE directory=?", (directory,))
+        conn.executemany("INSERT INTO entries (directory, name) VALUES (?, ?)", ((directory, name) for name in files))
+        conn.execute("INSERT OR REPLACE INTO directories (path, mtime_ns, scanned_at) VALUES (?, ?, ?)", (directory, mtime_ns, now))
+    return files, stats
+
+def print_index_stats(stats, elapsed):
+    total_dirs = stats['reused'] + stats['rescanned']
+    print(f"Index: reused {stats['reused']}/{total_dirs} directories ({stats['entries_reused']} entries), "
+          f"rescanned {stats['rescanned']} ({stats['entries_scanned']} entries) in {elapsed:.2f}s")
+
+@timed_phase(count=len)
+def load_present_files(dir_path, reindex=False):
+    index_path = os.path.join(default_cache_dir(), INDEX_FILENAME)
+    start = time.perf_counter()
+    try:
+        conn = open_file_index(index_path)
+    except sqlite3.Error as e:
+        print(f"Warning: Could not open directory index {index_path} ({e}); scanning without it")
+        return scan_directory_for_files(dir_path)
+    try:
+        files, stats = scan_directory_indexed(conn, dir_path, reindex)
+    finally:
+        conn.close()
+    print_index_stats(stats, time.perf_counter() - start)
+    return files
+
+def as_dir_list(dir_path):
+    return [dir_path] if isinstance(dir_path, str) else list(dir_path)
+
+def add_duplicate_names(files, report_path):
+    # Names of an 'rdump dedupe' group count as present when one of them is
+    groups = read_duplicate_groups(report_path)
+    added = set()
+    for names in groups:
+        if not names.isdisjoint(files):
+            added |= names - files
+    print(f"Duplicates: {len(added)} names count as present through {len(groups)} groups in {report_path}")
+    return files | added
+
+def load_library_files(dir_path, reindex=False, walk=None, duplicates=None):
+    # Names of the files in dir_path (one directory or a list). Each directory
+    # is listed through the index; with walk (WalkOptions) every directory is
+    # walked recursively on a thread pool instead, and files in subfolders
+    # count by name. duplicates: path of an 'rdump dedupe' report.
+    files = list_library_files(as_dir_list(dir_path), reindex, walk)
+    if duplicates:
+        files = add_duplicate_names(files, duplicates)
+    return files
+
+def list_library_files(dir_paths, reindex=False, walk=None):
+    if walk is None:
+        files = set()
+        for path in dir_paths:
+            files |= load_present_files(path, reindex)
+        return files
+    start = time.perf_counter()
+    files = set()
+    records = 0
+    for record in walk_files(dir_paths, *walk, with_stat=False):
+        files.add(os.path.basename(record.path))
+        records += 1
+    print(f"Walked {len(dir_paths)} directories recursively: {records} files ({len(files)} names) "
+          f"in {time.perf_counter() - start:.2f}s")
+    return files
+
+def row_key_hash(row):
+    # 64-bit digest of (URL, Filename, Extracted At); far smaller than a tuple of strings
+    key = '\x1f'.join((row['URL'] or '', row['Filename'] or '', row['Extracted At'] or ''))
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+
+@timed_phase()
+def filter_missing_files(rows, present_files, matcher=None, matches=None):
+    # Lazily yield rows whose 'Filename' is not in present_files, dropping duplicates.
+    # With a matcher, names it finds under another name count as present and are
+    # recorded in matches (filename -> Match).
+    seen = set()
+    for row in rows:
+        filename = row['Filename']
+        if filename in present_files:
+            continue
+        if matcher is not None and filename:
+            if filename in matches:
+                continue
+            found = matcher.match(filename)
+            if found is not None:
+                matches[filename] = found
+                continue
+        key = row_key_hash(row)
+        if key not in seen:
+            seen.add(key)
+            yield row
+
+@timed_phase(count=lambda matcher: matcher and len(matcher.by_key))
+def build_matcher(present_files, match=None):
+    # None for exact matching, else a FilenameMatcher over the directory listing
+    if match is None or match.mode == 'exact':
+        return None
+    return FilenameMatcher(present_files, match)
+
+def default_report_name(model_name):
+    date_str = datetime.now().strftime("%m-%d-%y")
+    return f"{model_name}_matched-files_{date_str}.csv"
+
+def write_match_report(matches, output_dir, model_name):
+    # CSV of the database names matched to differently named files, weakest
+    # match first; returns its path, or None when there were no such matches
+    if not matches:
+        return None
+    report_path = os.path.join(output_dir, default_report_name(model_name))
+    rows = sorted(matches.items(), key=lambda item: (item[1].score, item[0]))
+    with open(report_path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(['Filename', 'Matched File', 'Match', 'Score'])
+        for filename, found in rows:
+            writer.writerow([filename, found.filename, found.kind, f"{found.score:.3f}"])
+    fuzzy = sum(1 for found in matches.values() if found.kind == 'fuzzy')
+    print(f"Matched {len(matches)} files under other names ({fuzzy} fuzzy, lowest score {rows[0][1].score:.3f}): {report_path}")
+    return report_path
+
+def _spill_sorted_run(chunk, key, descending, fieldnames, tmp_dir, run_number):
+    chunk.sort(key=key, reverse=descending)
+    run_path = os.path.join(tmp_dir, f"run-{run_number:05d}.csv")
+    with open(run_path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(chunk)
+    return run_path
+
+@timed_phase()
+def sort_rows(rows, sort_col, descending, fieldnames, chunk_rows=SORT_CHUNK_ROWS):
+    # External merge sort: sorted runs of chunk_rows are spilled to temp files and
+    # merged lazily, so memory stays bounded no matter how many rows there are
+    key = lambda r: r.get(sort_col) or ''
+    chunk = []
+    run_paths = []
+    with tempfile.TemporaryDirectory(prefix='rdump-sort-') as tmp_dir:
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_rows:
+                run_paths.append(_spill_sorted_run(chunk, key, descending, fieldnames, tmp_dir, len(run_paths)))
+                chunk = []
+        if not run_paths:
+            # Everything fit in one chunk: no need to touch the disk
+            chunk.sort(key=key, reverse=descending)
+            yield from chunk
+            return
+        if chunk:
+            run_paths.append(_spill_sorted_run(chunk, key, descending, fieldnames, tmp_dir, len(run_paths)))
+            chunk = []
+        runs = [iter_csv_database(run_path) for run_path in run_paths]
+        yield from heapq.merge(*runs, key=key, reverse=descending)
+
+def peek_rows(rows):
+    # Returns (has_rows, rows) without buffering more than the first row
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return False, iter(())
+    return True, itertools.chain([first], rows)
+
+@timed_phase(count=int)
+def write_csv(rows, fieldnames, output_path):
+    count = 0
+    with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    print(f"Exported: {output_path}")
+    return count
+
+def default_output_name(model_name):
+    date_str = datetime.now().strftime("%m-%d-%y")
+    return f"{model_name}_need-to-download_{date_str}.csv"
+
+def resolve_output_path(output, dir_path, model_name):
+    # --output may be a directory or a file; by default the output goes next to the videos
+    output_name = default_output_name(model_name)
+    if output:
+        return os.path.join(output, output_name) if os.path.isdir(output) else output
+    return os.path.join(dir_path, output_name)
+
+def find_batch_databases(batch_arg):
+    # Accept either a directory (scanned for *_Database_*.csv) or a glob pattern
+    if os.path.isdir(batch_arg):
+        pattern = os.path.join(batch_arg, '*_Database_*.csv')
+    else:
+        pattern = batch_arg
+    return sorted(p for p in glob.glob(pattern) if os.path.isfile(p))
+
+def group_databases_by_model(db_paths):
+    groups = {}
+    for db_path in db_paths:
+        groups.setdefault(extract_model_name(db_path), []).append(db_path)
+    return groups
+
+# Present-file set and matcher shared by batch workers; set once per process by the pool initializer
+_batch_present_files = None
+_batch_matcher = None
+
+def _init_batch_worker(present_files, match=None):
+    global _batch_present_files, _batch_matcher
+    _batch_present_files = present_files
+    _batch_matcher = build_matcher(present_files, match)
+
+@timed_phase(count=lambda summary: summary['Rows'])
+def process_model_databases(model_name, db_paths, output_dir, sort_col, descending):
+    # Runs in a worker process: stream, filter and export one model's databases
+    fieldnames = read_csv_fieldnames(db_paths[0])
+    counts = {'rows': 0}
+    def iter_rows():
+        for db_path in db_paths:
+            for row in iter_csv_database(db_path):
+                counts['rows'] += 1
+                yield row
+    matches = {}
+    missing_rows = filter_missing_files(iter_rows(), _batch_present_files, _batch_matcher, matches)
+    if sort_col:
+        missing_rows = sort_rows(missing_rows, sort_col, descending, fieldnames)
+    has_missing, missing_rows = peek_rows(missing_rows)
+    output_path = None
+    missing_count = 0
+    if has_missing:
+        output_path = os.path.join(output_dir, default_output_name(model_name))
+        missing_count = write_csv(missing_rows, fieldnames, output_path)
+    write_match_report(matches, output_dir, model_name)
+    return {
+        'Model': model_name,
+        'Databases': len(db_paths),
+        'Rows': counts['rows'],
+        'Missing': missing_count,
+        'Matched': len(matches),
+        'Output': output_path or '',
+    }
+
+@timed_phase(count=len)
+def sync_batch(db_paths, dir_path, output_dir, sort_col=None, descending=False, reindex=False, jobs=None, match=None, walk=None, duplicates=None):
+    # Check many databases against one scan of dir_path. Returns one summary
+    # dict per model and writes the batch summary CSV to output_dir.
+    groups = group_databases_by_model(db_paths)
+    print(f"Batch: {len(db_paths)} databases for {len(groups)} models")
+    present_files = load_library_files(dir_path, reindex, walk, duplicates)
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_batch_worker, initargs=(present_files, match)) as pool:
+        futures = [
+            pool.submit(process_model_databases, model_name, paths, output_dir, sort_col, descending)
+            for model_name, paths in sorted(groups.items())
+        ]
+        summary = [future.result() for future in futures]
+    summary_path = os.path.join(output_dir, f"batch-summary_{datetime.now().strftime('%m-%d-%y')}.csv")
+    write_csv(summary, ['Model', 'Databases', 'Rows', 'Missing', 'Matched', 'Output'], summary_path)
+    complete = sum(1 for s in summary if not s['Missing'])
+    total_missing = sum(s['Missing'] for s in summary)
+    print(f"Batch complete: {complete}/{len(summary)} models fully present, {total_missing} files to download")
+    return summary
+
+def sync_database(db_path, dir_path, output=None, sort_col=None, descending=False, reindex=False, match=None, walk=None, duplicates=None):
+    # Export the rows of db_path whose files are missing from dir_path (one
+    # directory or a list). Returns the output path, or None when every file is
+    # present. 'match' (MatchOptions) also accepts files under normalized or
+    # similar names; 'walk' (WalkOptions) scans the directories recursively and
+    # 'duplicates' (an 'rdump dedupe' report) counts copies under other names.
+    fieldnames = read_csv_fieldnames(db_path)
+    present_files = load_library_files(dir_path, reindex, walk, duplicates)
+    matcher = build_matcher(present_files, match)
+    matches = {}
+    # Rows stream from the database through the filter (and sort) straight into the output
+    missing_rows = filter_missing_files(iter_csv_database(db_path), present_files, matcher, matches)
+    # Sorting
+    if sort_col:
+        missing_rows = sort_rows(missing_rows, sort_col, descending, fieldnames)
+    has_missing, missing_rows = peek_rows(missing_rows)
+    model_name = extract_model_name(db_path)
+    output_path = resolve_output_path(output, as_dir_list(dir_path)[0], model_name)
+    if has_missing:
+        write_csv(missing_rows, fieldnames, output_path)
+    write_match_report(matches, os.path.dirname(output_path), model_name)
+    return output_path if has_missing else None
+
+def sync_model(model, dir_path, output=None, sort_col=None, descending=False, reindex=False, store_path=None, match=None, walk=None, duplicates=None):
+    # Like sync_database(), with the model's latest catalog from the history store as input
+    fieldnames = ['URL', 'Filename', 'Extracted At']
+    present_files = load_library_files(dir_path, reindex, walk, duplicates)
+    matcher = build_matcher(present_files, match)
+    matches = {}
+    conn = open_history_store(store_path)
+    try:
+        missing_rows = filter_missing_files(iter_catalog(conn, model), present_files, matcher, matches)
+        if sort_col:
+            missing_rows = sort_rows(missing_rows, sort_col, descending, fieldnames)
+        has_missing, missing_rows = peek_rows(missing_rows)
+        output_path = resolve_output_path(output, as_dir_list(dir_path)[0], model)
+        if has_missing:
+            write_csv(missing_rows, fieldnames, output_path)
+    finally:
+        conn.close()
+    write_match_report(matches, os.path.dirname(output_path), model)
+    return output_path if has_missing else None
+
+# Watch mode collects changes until WATCH_DEBOUNCE seconds pass without events,
+# but holds them at most WATCH_MAX_DELAY, so a burst of downloads costs one rewrite
+WATCH_DEBOUNCE = 0.2
+WATCH_MAX_DELAY = 0.8
+
+class MissingFiles:
+    # The database rows and which of their files are present. Files appearing or
+    # disappearing update the missing set through a filename -> rows index, so a
+    # change costs as much as the rows naming that file, not the whole database.
+    def __init__(self, present_files):
+        self.present = set(present_files)
+        self.fieldnames = []
+        self.rows = []
+        self.rows_by_filename = {}
+        self.missing = set()    # indices into rows
+
+    def load_database(self, db_path):
+        fieldnames = read_csv_fieldnames(db_path)
+        rows = []
+        seen = set()
+        for row in iter_csv_database(db_path):
+            key = row_key_hash(row)
+            if key not in seen:
+                seen.add(key)
+                rows.append(row)
+        self.fieldnames = fieldnames
+        self.rows = rows
+        self.rows_by_filename = {}
+        for i, row in enumerate(rows):
+            self.rows_by_filename.setdefault(row['Filename'], []).append(i)
+        self.refresh_missing()
+
+    def refresh_missing(self):
+        self.missing = set(i for i, row in enumerate(self.rows) if row['Filename'] not in self.present)
+
+    def set_present(self, present_files):
+        self.present = set(present_files)
+        self.refresh_missing()
+
+    def add_file(self, name):
+        self.present.add(name)
+        self.missing.difference_update(self.rows_by_filename.get(name, ()))
+
+    def remove_file(self, name):
+        self.present.discard(name)
+        self.missing.update(self.rows_by_filename.get(name, ()))
+
+    def render(self, sort_col=None, descending=False):
+        # The output CSV as bytes, rows in database order unless sorted
+        rows = [self.rows[i] for i in sorted(self.missing)]
+        if sort_col:
+            rows.sort(key=lambda r: r.get(sort_col) or '', reverse=descending)
+        buffer = io.StringIO(newline='')
+        writer = csv.DictWriter(buffer, fieldnames=self.fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+        return buffer.getvalue().encode('utf-8')
+
+def file_digest(path):
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.blake2b(f.read()).digest()
+    except OSError:
+        return None
+
+def write_if_changed(data, output_path, last_digest):
+    # Atomically replace output_path with data unless it already holds it; returns the new digest
+    digest = hashlib.blake2b(data).digest()
+    if digest == last_digest:
+        return digest
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, output_path)
+    return digest
+
+def watch_database(db_path, dir_path, output=None, sort_col=None, descending=False, reindex=False):
+    # Build the state once, then follow inotify events on the video directory and
+    # the database until interrupted, rewriting the output only when it changes
+    from recurdump.utils import inotify
+    db_path = os.path.abspath(db_path)
+    dir_path = os.path.abspath(dir_path)
+    db_dir, db_name = os.path.split(db_path)
+    output_path = os.path.abspath(resolve_output_path(output, dir_path, extract_model_name(db_path)))
+    # The database is watched through its directory: exports replace the file
+    masks = {dir_path: inotify.IN_CREATE | inotify.IN_MOVED_TO | inotify.IN_DELETE | inotify.IN_MOVED_FROM
+             | inotify.IN_DELETE_SELF | inotify.IN_MOVE_SELF | inotify.IN_ONLYDIR}
+    masks[db_dir] = masks.get(db_dir, 0) | inotify.IN_CLOSE_WRITE | inotify.IN_MOVED_TO | inotify.IN_ONLYDIR
+    with inotify.Inotify() as watcher:
+        for path, mask in masks.items():
+            watcher.add_watch(path, mask)
+        # Watches first, then the initial state, so no change in between is lost
+        state = MissingFiles(load_present_files(dir_path, reindex))
+        state.load_database(db_path)
+        last_digest = write_if_changed(state.render(sort_col, descending), output_path, file_digest(output_path))
+        print(f"Watching {dir_path} and {db_path}: {len(state.missing)} files missing, list in {output_path}")
+        print("Press Ctrl+C to stop.")
+        pending_since = None
+        reload_db = rescan = False
+        while True:
+            if pending_since is None:
+                timeout = None
+            else:
+                timeout = max(0.0, min(WATCH_DEBOUNCE, pending_since + WATCH_MAX_DELAY - time.monotonic()))
+            events = watcher.read_events(timeout)
+            for event in events:
+                if event.mask & inotify.IN_Q_OVERFLOW:
+                    # Events were dropped: start over from the directory and the database
+                    rescan = reload_db = True
+                    continue
+                if event.path == dir_path:
+                    if event.mask & (inotify.IN_DELETE_SELF | inotify.IN_MOVE_SELF):
+                        raise FileNotFoundError(f"Directory was removed or moved: {dir_path}")
+                    if not event.mask & inotify.IN_ISDIR:
+                        if event.mask & (inotify.IN_CREATE | inotify.IN_MOVED_TO):
+                            state.add_file(event.name)
+                        elif event.mask & (inotify.IN_DELETE | inotify.IN_MOVED_FROM):
+                            state.remove_file(event.name)
+                if event.path == db_dir and event.name == db_name and event.mask & (inotify.IN_CLOSE_WRITE | inotify.IN_MOVED_TO):
+                    reload_db = True
+            if events and pending_since is None:
+                pending_since = time.monotonic()
+            if pending_since is None or (events and time.monotonic() - pending_since < WATCH_MAX_DELAY):
+                continue
+            pending_since = None
+            if rescan:
+                state.set_present(scan_directory_for_files(dir_path))
+                rescan = False
+            if reload_db:
+                reload_db = False
+                try:
+                    state.load_database(db_path)
+                except (OSError, UnicodeDecodeError, csv.Error) as e:
+                    print(f"Warning: Could not reload {db_path} ({e}); keeping the previous rows")
+            digest = write_if_changed(state.render(sort_col, descending), output_path, last_digest)
+            if digest != last_digest:
+                last_digest = digest
+                print(f"{datetime.now():%H:%M:%S} Updated {output_path}: {len(state.missing)} files missing")
+
+def check_directories(dir_paths):
+    for path in dir_paths:
+        if not os.path.isdir(path):
+            print(f"Error: Directory not found: {path}")
+            print(HELP_TEXT)
+            sys.exit(1)
+
+def main(argv=None):
+    args = parse_args(argv)
+    db_path = args.db
+    dir_paths = [os.getcwd() if path == "." else path for path in args.dir]
+    # Outputs go to the first directory unless --output says otherwise
+    dir_path = dir_paths[0]
+    if args.watch and not args.db:
+        print("Error: --watch works with --db only")
+        sys.exit(1)
+    if args.watch and (args.recursive or len(dir_paths) > 1):
+        print("Error: --watch follows a single directory; --recursive and repeated --dir cannot be combined with it")
+        sys.exit(1)
+    if args.watch and args.match != 'exact':
+        print("Error: --watch compares filenames exactly; --match cannot be combined with it")
+        sys.exit(1)
+    if args.watch and args.duplicates is not None:
+        print("Error: --duplicates cannot be combined with --watch")
+        sys.exit(1)
+    duplicates = None
+    if args.duplicates is not None:
+        duplicates = args.duplicates or default_report_path()
+        if not os.path.isfile(duplicates):
+            print(f"Error: Duplicate report not found: {duplicates} (run 'rdump dedupe' first)")
+            sys.exit(1)
+    if not 0 < args.min_score <= 1:
+        print("Error: --min-score must be between 0 and 1")
+        sys.exit(1)
+    match = MatchOptions(args.match, parse_ext_groups(args.ext_equiv) or DEFAULT_EXT_GROUPS, args.min_score)
+    if not args.recursive and (args.max_depth is not None or args.include or args.exclude or args.ext):
+        print("Error: --max-depth, --include, --exclude and --ext work with --recursive only")
+        sys.exit(1)
+    if (args.max_depth is not None and args.max_depth < 0) or args.scan_threads < 1:
+        print("Error: --max-depth must be 0 or more and --scan-threads 1 or more")
+        sys.exit(1)
+    walk = None
+    if args.recursive:
+        extensions = [ext.strip() for value in args.ext or () for ext in value.split(',') if ext.strip()] or None
+        walk = WalkOptions(args.max_depth, args.include or (), args.exclude or (), extensions, args.scan_threads)
+    if args.batch:
+        check_directories(dir_paths)
+        db_paths = find_batch_databases(args.batch)
+        if not db_paths:
+            print(f"Error: No '*_Database_*.csv' files found for: {args.batch}")
+            sys.exit(1)
+        output_dir = args.output or dir_path
+        if not os.path.isdir(output_dir):
+            print(f"Error: Output must be an existing directory in batch mode: {output_dir}")
+            sys.exit(1)
+        if args.backup:
+            for path in db_paths:
+                backup_file(path)
+        sync_batch(db_paths, dir_paths, output_dir, args.sort, args.desc, args.reindex, args.jobs, match, walk, duplicates)
+        sys.exit(0)
+    if args.model:
+        store_path = args.store or default_store_path()
+        check_directories(dir_paths)
+        if not os.path.isfile(store_path):
+            print(f"Error: History store not found: {store_path} (run 'rdump ingest' first)")
+            sys.exit(1)
+        conn = open_history_store(store_path)
+        known = latest_export_time(conn, args.model) is not None
+        conn.close()
+        if not known:
+            print(f"Error: No exports of '{args.model}' in the history store: {store_path}")
+            sys.exit(1)
+        if sync_model(args.model, dir_paths, args.output, args.sort, args.desc, args.reindex, store_path, match, walk, duplicates) is None:
+            print(f"All files of '{args.model}' in the history store are present in the directory. No export needed.")
+        sys.exit(0)
+    if not os.path.isfile(db_path):
+        print(f"Error: Database file not found: {db_path}")
+        print(HELP_TEXT)
+        sys.exit(1)
+    check_directories(dir_paths)
+    if args.backup:
+        backup_file(db_path)
+    if args.watch:
+        try:
+            watch_database(db_path, dir_path, args.output, args.sort, args.desc, args.reindex)
+        except KeyboardInterrupt:
+            print("Stopped watching.")
+        except OSError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        sys.exit(0)
+    if sync_database(db_path, dir_paths, args.output, args.sort, args.desc, args.reindex, match, walk, duplicates) is None:
+        print("All files in the database are present in the directory. No export needed.")
+        sys.exit(0)
+
+if __name__ == "__main__":
+    main()
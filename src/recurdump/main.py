@@ -0,0 +1,118 @@
+"""
+rdump - RecurDump command line
+
+Dispatches 'rdump <command> [options]' to the command modules in recurdump.core.
+Only the module of the requested command is imported, so 'rdump --help' and the
+startup of each command do not pay for the imports of the others. For the same
+reason, command modules import concurrent.futures (~15 ms) inside the function
+that starts a pool, not at module level.
+
+In-process use: run('sync', ['--db', 'model_Database.csv', '--dir', '.']) runs a
+command without spawning a new interpreter and returns its exit code.
+
+'rdump --profile <command>' (or RECURDUMP_PROFILE=1) logs the time, CPU time,
+peak RSS and item count of every phase to data/logs/; see recurdump.utils.profiling.
+"""
+import importlib
+import os
+import sys
+
+from recurdump import __version__
+from recurdump.utils import profiling
+
+# command -> (module, one-line description)
+COMMANDS = {
+    'bmarks': ('recurdump.core.bmarks', 'Export a Firefox bookmark folder to JSON or compare links against it'),
+    'sync': ('recurdump.core.sync', 'List the database entries whose files are missing from a directory'),
+    'merge': ('recurdump.core.merge', 'Merge the reurb_link columns of CSV files into a text file'),
+    'ingest': ('recurdump.core.ingest', 'Load CSV exports into the SQLite history store and query it'),
+    'dedupe': ('recurdump.core.dedupe', 'Find duplicate videos across library directories'),
+    'native-host': ('recurdump.core.native_host', 'Receive extraction results from the extension (native messaging)'),
+}
+
+def help_text():
+    lines = [
+        "",
+        "rdump - RecurDump command line",
+        "",
+        "Usage:",
+        "  rdump [--profile | --profile-phase PHASE] <command> [options]",
+        "  rdump <command> --help",
+        "",
+        "Commands:",
+    ]
+    width = max(len(name) for name in COMMANDS)
+    for name, (_, description) in COMMANDS.items():
+        lines.append(f"  {name:<{width}}  {description}")
+    lines += [
+        "",
+        "Options:",
+        "  --help, -h     Show this help message and exit",
+        "  --version      Show the version and exit",
+        "  --profile      Log the wall time, CPU time, peak RSS and item count of",
+        "                 every phase to data/logs/rdump-profile-<date>.jsonl",
+        "                 (also enabled by RECURDUMP_PROFILE=1)",
+        "  --profile-phase PHASE",
+        "                 Like --profile, and also dump a cProfile of PHASE (for",
+        "                 example write_csv) to data/logs/",
+        "",
+    ]
+    return "\n".join(lines)
+
+def load_command(command):
+    module_name, _ = COMMANDS[command]
+    return importlib.import_module(module_name)
+
+def run(command, argv=()):
+    # Run a command in-process; returns its exit code instead of exiting
+    if command not in COMMANDS:
+        raise ValueError(f"Unknown command: {command}")
+    profile = profiling.enabled()
+    if profile:
+        profiling.start_run(command)
+    code = 1
+    try:
+        load_command(command).main(list(argv))
+        code = 0
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            code = e.code or 0
+        else:
+            print(e.code, file=sys.stderr)
+    finally:
+        if profile:
+            log_path = profiling.finish_run(code)
+            if log_path:
+                print(f"Profile written to: {log_path}", file=sys.stderr)
+    return code
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv or argv[0] in ('--help', '-h'):
+        print(help_text())
+        sys.exit(0)
+    if argv[0] == '--version':
+        print(f"RecurDump {__version__}")
+        sys.exit(0)
+    while argv and argv[0] in ('--profile', '--profile-phase'):
+        os.environ[profiling.PROFILE_ENV] = '1'
+        if argv[0] == '--profile-phase':
+            if len(argv) < 2:
+                print("Error: --profile-phase needs a phase name")
+                sys.exit(2)
+            os.environ[profiling.PHASE_ENV] = argv[1]
+            argv = argv[1:]
+        argv = argv[1:]
+    if not argv:
+        print(help_text())
+        sys.exit(2)
+    command = argv[0]
+    if command not in COMMANDS:
+        print(f"Error: Unknown command: {command}")
+        print(help_text())
+        sys.exit(2)
+    sys.exit(run(command, argv[1:]))
+
+if __name__ == "__main__":
+    main()
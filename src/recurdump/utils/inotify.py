@@ -0,0 +1,112 @@
+"""
+Minimal Linux inotify binding (ctypes, no third-party packages).
+
+  watcher = Inotify()
+  watcher.add_watch('/videos', IN_CREATE | IN_MOVED_TO)
+  for event in watcher.read_events(timeout=None):
+      print(event.path, event.name, event.mask)
+
+read_events() blocks in select() until events arrive, so an idle watcher uses
+no CPU. Other platforms raise OSError when an Inotify is created.
+"""
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+from collections import namedtuple
+
+IN_ACCESS = 0x00000001
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_UNMOUNT = 0x00002000
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# struct inotify_event: int wd; uint32_t mask, cookie, len; char name[len]
+EVENT_HEADER = struct.Struct('iIII')
+READ_SIZE = 64 * 1024
+
+InotifyEvent = namedtuple('InotifyEvent', 'path name mask cookie')
+
+_libc = None
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        if not sys.platform.startswith('linux'):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        _libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        _libc.inotify_init1.argtypes = [ctypes.c_int]
+        _libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        _libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    return _libc
+
+class Inotify:
+    def __init__(self):
+        libc = _load_libc()
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_init1: {os.strerror(err)}")
+        self.fd = fd
+        self.paths = {}     # watch descriptor -> path
+
+    def fileno(self):
+        return self.fd
+
+    def add_watch(self, path, mask):
+        # Watching the same path again replaces its mask; returns the watch descriptor
+        wd = _libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_add_watch: {os.strerror(err)}", path)
+        self.paths[wd] = path
+        return wd
+
+    def read_events(self, timeout=None):
+        # Events queued so far, waiting up to 'timeout' seconds (None: forever)
+        # for the first one; returns an empty list on timeout
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, READ_SIZE)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            events.append(InotifyEvent(self.paths.get(wd), name, mask, cookie))
+            if mask & IN_IGNORED:
+                self.paths.pop(wd, None)
+        return events
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,35 @@
+"""
+Filesystem locations shared by the rdump commands.
+"""
+import os
+
+# src/recurdump/utils/paths.py -> repository root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+def default_cache_dir():
+    # RECURDUMP_CACHE_DIR wins; else the repository's data/cache directory when
+    # available, else ~/.cache/recurdump
+    override = os.environ.get('RECURDUMP_CACHE_DIR')
+    if override:
+        os.makedirs(override, exist_ok=True)
+        return override
+    repo_cache = os.path.join(REPO_ROOT, 'data', 'cache')
+    if os.path.isdir(repo_cache):
+        return repo_cache
+    user_cache = os.path.join(os.path.expanduser('~'), '.cache', 'recurdump')
+    os.makedirs(user_cache, exist_ok=True)
+    return user_cache
+
+def default_data_dir():
+    # RECURDUMP_DATA_DIR wins; else the repository's data directory when
+    # available, else ~/.local/share/recurdump
+    override = os.environ.get('RECURDUMP_DATA_DIR')
+    if override:
+        os.makedirs(override, exist_ok=True)
+        return override
+    repo_data = os.path.join(REPO_ROOT, 'data')
+    if os.path.isdir(repo_data):
+        return repo_data
+    user_data = os.path.join(os.path.expanduser('~'), '.local', 'share', 'recurdump')
+    os.makedirs(user_data, exist_ok=True)
+    return user_data
@@ -0,0 +1,234 @@
+"""
+Phase-level timing and memory instrumentation shared by the rdump commands.
+
+Off by default; 'rdump --profile <command>' or RECURDUMP_PROFILE=1 turns it on.
+Every call of a phase then appends one JSON line to
+data/logs/rdump-profile-<YYYY-MM-DD>.jsonl:
+
+  {"ts": "...", "run": "...", "command": "sync", "phase": "write_csv", "pid": 123,
+   "wall_s": 0.8, "cpu_s": 0.7, "items": 50000, "peak_rss_kb": 61234,
+   "rss_growth_kb": 2048, "error": null}
+
+'items' is what the phase reports (rows, files, links). Peak RSS is the process
+high-water mark after the phase; 'rss_growth_kb' is how much the phase raised it.
+Phases that are generators are timed while they are consumed, and nested phases
+are included in the time of the phase that calls them. When the command ends, a
+'total' line for the whole run is written.
+
+'rdump --profile-phase NAME <command>' (or RECURDUMP_PROFILE_PHASE=NAME) also
+runs every call of that phase under cProfile and dumps the stats to
+data/logs/rdump-profile-<run>-<NAME>.prof (read them with pstats or snakeviz).
+
+The settings travel in the environment, so worker processes log their phases
+under the same run.
+"""
+import functools
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from recurdump.utils.paths import default_data_dir
+
+try:
+    import resource
+except ImportError:
+    # Windows: no getrusage, RSS is not recorded
+    resource = None
+
+# inspect.CO_GENERATOR, without importing inspect at every command start
+CO_GENERATOR = 0x20
+PROFILE_ENV = 'RECURDUMP_PROFILE'
+PHASE_ENV = 'RECURDUMP_PROFILE_PHASE'
+RUN_ENV = 'RECURDUMP_PROFILE_RUN'
+COMMAND_ENV = 'RECURDUMP_PROFILE_COMMAND'
+
+# Per-process state: log file, cProfile of the selected phase, start of the run
+_state = {'log': None, 'profiler': None, 'started': None}
+
+def enabled():
+    return os.environ.get(PROFILE_ENV, '') not in ('', '0')
+
+def log_dir():
+    path = os.path.join(default_data_dir(), 'logs')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+def run_id():
+    run = os.environ.get(RUN_ENV)
+    if not run:
+        run = f"{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}"
+        os.environ[RUN_ENV] = run
+    return run
+
+def start_run(command, cprofile_phase=None):
+    # Enable profiling for this process and the workers it starts
+    os.environ[PROFILE_ENV] = '1'
+    os.environ[COMMAND_ENV] = command
+    os.environ.pop(RUN_ENV, None)
+    if cprofile_phase:
+        os.environ[PHASE_ENV] = cprofile_phase
+    run_id()
+    _state['started'] = (time.perf_counter(), time.process_time(), peak_rss_kb())
+
+def finish_run(exit_code=0):
+    # Write the 'total' line and the cProfile dump; returns the log path
+    if not enabled() or _state['started'] is None:
+        return None
+    wall_start, cpu_start, rss_start = _state['started']
+    _state['started'] = None
+    record = make_record('total', time.perf_counter() - wall_start, time.process_time() - cpu_start, None, rss_start)
+    record['exit_code'] = exit_code
+    write_record(record)
+    profiler = _state['profiler']
+    if profiler is not None:
+        _state['profiler'] = None
+        phase_name = os.environ.get(PHASE_ENV)
+        dump_path = os.path.join(log_dir(), f"rdump-profile-{run_id()}-{phase_name}.prof")
+        profiler.dump_stats(dump_path)
+        print(f"Profile of phase '{phase_name}' written to: {dump_path}", file=sys.stderr)
+    log = _state['log']
+    _state['log'] = None
+    if log is not None:
+        log.close()
+        return log.name
+    return None
+
+def make_record(name, wall, cpu, items, rss_before, error=None):
+    peak = peak_rss_kb()
+    return {
+        'ts': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+        'run': run_id(),
+        'command': os.environ.get(COMMAND_ENV) or os.path.basename(sys.argv[0]),
+        'phase': name,
+        'pid': os.getpid(),
+        'wall_s': round(wall, 6),
+        'cpu_s': round(cpu, 6),
+        'items': items,
+        'peak_rss_kb': peak,
+        'rss_growth_kb': peak - rss_before if peak is not None and rss_before is not None else None,
+        'error': error,
+    }
+
+def write_record(record):
+    log = _state['log']
+    if log is None or log.closed:
+        path = os.path.join(log_dir(), f"rdump-profile-{datetime.now():%Y-%m-%d}.jsonl")
+        # Line-buffered append: processes of one run share the file line by line
+        log = open(path, 'a', encoding='utf-8', buffering=1)
+        _state['log'] = log
+    log.write(json.dumps(record, separators=(',', ':')) + '\n')
+
+class Phase:
+    # Measurement of one phase call; callers set 'items' when they know the count
+    def __init__(self, name):
+        self.name = name
+        self.items = None
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.rss_before = peak_rss_kb()
+        self.cprofile = os.environ.get(PHASE_ENV) == name
+
+    def resume(self):
+        # Start (or continue) timing; generator phases resume once per value
+        if self.cprofile:
+            if _state['profiler'] is None:
+                import cProfile
+                _state['profiler'] = cProfile.Profile()
+            _state['profiler'].enable()
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+
+    def pause(self):
+        self.wall += time.perf_counter() - self.wall_start
+        self.cpu += time.process_time() - self.cpu_start
+        if self.cprofile:
+            _state['profiler'].disable()
+
+    def write(self, error=None):
+        write_record(make_record(self.name, self.wall, self.cpu, self.items, self.rss_before, error))
+
+@contextmanager
+def phase(name, items=None):
+    # with phase('sort_rows') as p: ...; p.items = n
+    current = Phase(name)
+    if not enabled():
+        yield current
+        return
+    current.items = items
+    error = None
+    current.resume()
+    try:
+        yield current
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        current.pause()
+        current.write(error)
+
+def _count_items(count, result):
+    try:
+        return count(result)
+    except TypeError:
+        return None
+
+def timed_phase(name=None, count=None):
+    # Decorator: record every call of the function as a phase (named after the
+    # function by default). count(result) gives 'items'; generator functions are
+    # timed across their iteration and 'items' is the number of values yielded.
+    def decorate(fn):
+        phase_name = name or fn.__name__
+        if fn.__code__.co_flags & CO_GENERATOR:
+            @functools.wraps(fn)
+            def generator_wrapper(*args, **kwargs):
+                if not enabled():
+                    return fn(*args, **kwargs)
+                return _timed_generator(phase_name, fn(*args, **kwargs))
+            return generator_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not enabled():
+                return fn(*args, **kwargs)
+            with phase(phase_name) as current:
+                result = fn(*args, **kwargs)
+                if count is not None:
+                    current.items = _count_items(count, result)
+            return result
+        return wrapper
+    return decorate
+
+def _timed_generator(name, gen):
+    current = Phase(name)
+    current.items = 0
+    error = None
+    try:
+        while True:
+            current.resume()
+            try:
+                value = next(gen)
+            except StopIteration:
+                return
+            finally:
+                current.pause()
+            current.items += 1
+            yield value
+    except GeneratorExit:
+        # The consumer stopped early
+        gen.close()
+        raise
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        current.write(error)
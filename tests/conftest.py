@@ -0,0 +1,73 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+
+# Run against the checkout without installing it, as the benchmarks do
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+@pytest.fixture(autouse=True)
+def isolated_dirs(tmp_path, monkeypatch):
+    # Caches, stores and profile logs go to the test's own directory, not data/
+    monkeypatch.setenv('RECURDUMP_CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setenv('RECURDUMP_DATA_DIR', str(tmp_path / 'data'))
+    monkeypatch.delenv('RECURDUMP_PROFILE', raising=False)
+
+@pytest.fixture
+def write_csv():
+    # write_csv(path, header, rows) -> str(path); values must not need quoting
+    def write(path, header, rows):
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            f.write(','.join(header) + '\n')
+            for row in rows:
+                f.write(','.join(row) + '\n')
+        return str(path)
+    return write
+
+class Places:
+    # Minimal places.sqlite: add folders and bookmarks, then hand 'path' to bmarks
+    def __init__(self, path):
+        self.path = str(path)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript("""
+            CREATE TABLE moz_places (id INTEGER PRIMARY KEY, url LONGVARCHAR, title LONGVARCHAR, url_hash INTEGER DEFAULT 0 NOT NULL);
+            CREATE TABLE moz_bookmarks (id INTEGER PRIMARY KEY, type INTEGER, fk INTEGER DEFAULT NULL, parent INTEGER,
+                                        position INTEGER, title LONGVARCHAR, dateAdded INTEGER, lastModified INTEGER);
+        """)
+        self.next_id = 1
+        self.root = self.folder(0, '')
+        self.menu = self.folder(self.root, 'menu')
+
+    def _item(self, item_type, parent, title, url=None, stamp=None):
+        item_id = self.next_id
+        self.next_id += 1
+        stamp = stamp or item_id * 1000
+        fk = None
+        if url is not None:
+            self.conn.execute("INSERT INTO moz_places (id, url, title) VALUES (?, ?, ?)", (item_id, url, title))
+            fk = item_id
+        self.conn.execute(
+            "INSERT INTO moz_bookmarks (id, type, fk, parent, position, title, dateAdded, lastModified) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (item_id, item_type, fk, parent, item_id, title, stamp, stamp))
+        self.conn.commit()
+        return item_id
+
+    def folder(self, parent, title):
+        return self._item(2, parent, title)
+
+    def bookmark(self, parent, title, url, stamp=None):
+        return self._item(1, parent, title, url, stamp)
+
+    def remove(self, item_id):
+        self.conn.execute("DELETE FROM moz_bookmarks WHERE id=?", (item_id,))
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+@pytest.fixture
+def places(tmp_path):
+    db = Places(tmp_path / 'places.sqlite')
+    yield db
+    db.close()
@@ -0,0 +1,115 @@
+import json
+import os
+
+import pytest
+
+from recurdump.core import bmarks
+
+@pytest.fixture
+def tree(places):
+    # menu/RECURBATE/{2024, 2025, 2025, 2025/sub}; the two '2025' folders share a path
+    top = places.folder(places.menu, 'RECURBATE')
+    folders = {
+        'top': top,
+        '2024': places.folder(top, '2024'),
+        '2025': places.folder(top, '2025'),
+        '2025 again': places.folder(top, '2025'),
+    }
+    folders['sub'] = places.folder(folders['2025'], 'sub')
+    for name, folder_id in folders.items():
+        places.bookmark(folder_id, f'video {name}', f'https://recu.me/m/video/{folder_id}')
+    return folders
+
+def read_ndjson(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+def test_glob_selects_sibling_folders_sharing_a_path(places, tree):
+    conn, _ = bmarks.open_places_db(places.path)
+    try:
+        index = bmarks.open_search_index(places.path, conn=conn)
+        try:
+            assert bmarks.find_folders_by_glob(index, 'Bookmarks Menu/RECURBATE/2025*') == [tree['2025'], tree['2025 again']]
+            # Subfolders of a selected folder are exported with it, not again
+            assert bmarks.find_folders_by_glob(index, 'Bookmarks Menu/RECURBATE*') == [tree['top']]
+            assert bmarks.find_folders_by_glob(index, '*/sub') == [tree['sub']]
+            assert bmarks.find_folders_by_glob(index, 'Bookmarks Menu/Nothing*') == []
+        finally:
+            index.close()
+    finally:
+        conn.close()
+
+def test_export_by_glob_writes_each_bookmark_once(places, tree, tmp_path):
+    assert bmarks.export_bookmarks(None, str(tmp_path), 'out', places_path=places.path, output_format='ndjson',
+                                   folder_pattern='Bookmarks Menu/RECURBATE/2025*')
+    titles = sorted(bm['title'] for bm in read_ndjson(tmp_path / 'out.ndjson'))
+    assert titles == ['video 2025', 'video 2025 again', 'video sub']
+    assert not bmarks.export_bookmarks(None, str(tmp_path), 'out', places_path=places.path, folder_pattern='Nope*')
+
+def test_search_index_follows_the_database(places, tree, tmp_path):
+    assert bmarks.export_search_results('video', str(tmp_path), 'out', places_path=places.path) == 5
+    places.bookmark(tree['2024'], 'another video', 'https://recu.me/m/video/99')
+    assert bmarks.export_search_results('another', str(tmp_path), 'out', places_path=places.path) == 1
+    assert [bm['url'] for bm in read_ndjson(tmp_path / 'out_search.ndjson')] == ['https://recu.me/m/video/99']
+
+def test_failed_export_leaves_no_partial_file(places, tree, tmp_path, monkeypatch):
+    def fail(*args):
+        raise OSError('disk full')
+    monkeypatch.setattr(bmarks, 'write_folder_json', fail)
+    with pytest.raises(OSError):
+        bmarks.export_bookmarks('RECURBATE', str(tmp_path), 'out', places_path=places.path)
+    assert os.listdir(tmp_path) == ['places.sqlite']
+
+def test_incremental_deltas_compact_into_a_snapshot(places, tree, tmp_path):
+    out = tmp_path / 'exports'
+    out.mkdir()
+
+    def export():
+        bmarks.export_bookmarks('2024', str(out), 'bm', places_path=places.path, incremental=True)
+
+    export()
+    added = places.bookmark(tree['2024'], 'new', 'https://recu.me/m/video/100')
+    export()
+    # No change: no delta file
+    export()
+    places.remove(added)
+    newer = places.bookmark(tree['2024'], 'newer', 'https://recu.me/m/video/101')
+    export()
+    assert sorted(name for name in os.listdir(out) if '_delta_' in name) == [
+        'bm_delta_00001.json', 'bm_delta_00002.json', 'bm_delta_00003.json']
+    bmarks.compact_deltas(str(out), 'bm')
+    assert sorted(os.listdir(out)) == ['bm_snapshot.json', 'bm_state.json']
+    with open(out / 'bm_snapshot.json', encoding='utf-8') as f:
+        snapshot = json.load(f)
+    assert snapshot['sequence'] == 3
+    [folder] = snapshot['folders']
+    assert folder['id'] == tree['2024']
+    assert [bm['title'] for bm in folder['bookmarks']] == ['video 2024', 'newer']
+    assert folder['bookmarks'][1]['id'] == newer
+    # Later deltas are applied on top of the snapshot
+    places.bookmark(tree['2024'], 'latest', 'https://recu.me/m/video/102')
+    export()
+    bmarks.compact_deltas(str(out), 'bm')
+    with open(out / 'bm_snapshot.json', encoding='utf-8') as f:
+        snapshot = json.load(f)
+    assert snapshot['sequence'] == 4
+    assert [bm['title'] for bm in snapshot['folders'][0]['bookmarks']] == ['video 2024', 'newer', 'latest']
+
+def test_compaction_orders_deltas_numerically_and_ignores_other_names(tmp_path):
+    def delta(name, sequence, bookmark_id):
+        fd = {'id': 1, 'title': 'A', 'watermark': sequence, 'added': [{'id': bookmark_id, 'title': str(sequence)}],
+              'modified': [], 'removed': [] if sequence < 100000 else [5]}
+        with open(tmp_path / name, 'w', encoding='utf-8') as f:
+            json.dump({'sequence': sequence, 'folders': [fd]}, f)
+
+    delta('bm_delta_99999.json', 99999, 5)
+    delta('bm_delta_100000.json', 100000, 6)
+    delta('bm.old_delta_00001.json', 1, 7)
+    delta('bm_delta_00002.json.bak', 2, 8)
+    bmarks.compact_deltas(str(tmp_path), 'bm')
+    with open(tmp_path / 'bm_snapshot.json', encoding='utf-8') as f:
+        snapshot = json.load(f)
+    # 99999 is applied before 100000, which removes its bookmark
+    assert snapshot['sequence'] == 100000
+    assert [bm['id'] for bm in snapshot['folders'][0]['bookmarks']] == [6]
+    assert sorted(os.listdir(tmp_path)) == ['bm.old_delta_00001.json', 'bm_delta_00002.json.bak', 'bm_snapshot.json']
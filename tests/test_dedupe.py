@@ -0,0 +1,97 @@
+import os
+import random
+
+import pytest
+
+from recurdump.core import dedupe
+
+SIZE = 1024 * 1024
+# Between the first and the second sampled chunk: only a full hash reads it
+UNSAMPLED = dedupe.PARTIAL_CHUNK_BYTES + 1000
+
+def write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return str(path)
+
+def changed(data, offset):
+    return data[:offset] + bytes([data[offset] ^ 1]) + data[offset + 1:]
+
+@pytest.fixture
+def library(tmp_path):
+    data = random.Random(1).randbytes(SIZE)
+    root = tmp_path / 'library'
+    paths = {
+        'a': write(root / 'one' / 'a.mp4', data),
+        'b': write(root / 'two' / 'b.mp4', data),
+        # Same size and partial hash as a, other content
+        'c': write(root / 'two' / 'c.mp4', changed(data, UNSAMPLED)),
+        # Same size, other head: settled by the partial hash
+        'd': write(root / 'two' / 'd.mp4', changed(data, 0)),
+        'unique': write(root / 'one' / 'unique.mp4', data[:-1]),
+    }
+    return str(root), paths
+
+def hashed(out):
+    # 'Hashed N files (step): C from cache, R read' -> {step: (N, C, R)}
+    steps = {}
+    for line in out.splitlines():
+        if line.startswith('Hashed '):
+            words = line.replace('(', '').replace(')', '').replace(':', '').replace(',', '').split()
+            steps[words[3]] = (int(words[1]), int(words[4]), int(words[7]))
+    return steps
+
+def find(root, tmp_path, **kwargs):
+    return dedupe.find_duplicates([root], jobs=1, min_size=1, cache_path=str(tmp_path / 'hashes.sqlite'), **kwargs)
+
+def test_size_partial_full_narrowing(library, tmp_path, capsys):
+    root, paths = library
+    groups = find(root, tmp_path)
+    assert [[path for path, _, _ in group] for group in groups] == [[paths['a'], paths['b']]]
+    assert groups[0][0][1] == SIZE and groups[0][0][2] == groups[0][1][2]
+    # The unique size is never hashed; d drops out after the partial hash
+    assert hashed(capsys.readouterr().out) == {'partial': (4, 0, 4), 'full': (3, 0, 3)}
+
+def test_cache_is_reused_and_invalidated_by_changes(library, tmp_path, capsys):
+    root, paths = library
+    find(root, tmp_path)
+    capsys.readouterr()
+    find(root, tmp_path)
+    assert hashed(capsys.readouterr().out) == {'partial': (4, 4, 0), 'full': (3, 3, 0)}
+    # A new mtime means new content as far as the cache is concerned
+    st = os.stat(paths['b'])
+    os.utime(paths['b'], ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    assert len(find(root, tmp_path)) == 1
+    assert hashed(capsys.readouterr().out) == {'partial': (4, 3, 1), 'full': (3, 2, 1)}
+    find(root, tmp_path, rehash=True)
+    assert hashed(capsys.readouterr().out) == {'partial': (4, 0, 4), 'full': (3, 0, 3)}
+
+def test_hard_links_are_one_file(library, tmp_path):
+    root, paths = library
+    os.link(paths['a'], os.path.join(root, 'one', 'z-link.mp4'))
+    # Kept once, under the first of its paths
+    groups = find(root, tmp_path)
+    assert [[path for path, _, _ in group] for group in groups] == [[paths['a'], paths['b']]]
+
+def test_cache_without_device_column_is_replaced(tmp_path):
+    cache_path = str(tmp_path / 'hashes.sqlite')
+    conn = dedupe.open_hash_cache(cache_path)
+    conn.executescript("""
+        DROP TABLE hashes;
+        CREATE TABLE hashes (inode INTEGER, size INTEGER, mtime_ns INTEGER, partial TEXT, full TEXT,
+                             PRIMARY KEY (inode, size, mtime_ns)) WITHOUT ROWID;
+        PRAGMA user_version=0;
+    """)
+    conn.close()
+    conn = dedupe.open_hash_cache(cache_path)
+    try:
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(hashes)")]
+        assert columns[:4] == ['dev', 'inode', 'size', 'mtime_ns']
+    finally:
+        conn.close()
+
+def test_report_round_trip(library, tmp_path):
+    root, paths = library
+    report_path = str(tmp_path / 'duplicates.csv')
+    dedupe.write_report(find(root, tmp_path), report_path)
+    assert dedupe.read_duplicate_groups(report_path) == [{'a.mp4', 'b.mp4'}]
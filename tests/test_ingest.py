@@ -0,0 +1,112 @@
+import csv
+
+import pytest
+
+from recurdump.core import ingest
+
+HEADER = ['URL', 'Filename', 'Extracted At']
+# Export times the extension appends to filenames (ms): Jan 1, Feb 1, Mar 1 2025
+JAN, FEB, MAR = 1735689600000, 1738368000000, 1740787200000
+
+@pytest.fixture
+def exports(tmp_path, write_csv):
+    # write(when, rows) -> path of the model's export taken at 'when'
+    root = tmp_path / 'exports'
+    root.mkdir()
+
+    def write(when, rows, model='m'):
+        return write_csv(root / f'{model}_Database_{when}.csv', HEADER, rows)
+    write.root = str(root)
+    return write
+
+@pytest.fixture
+def store_path(tmp_path):
+    return str(tmp_path / 'history.sqlite')
+
+def history(store_path, model='m'):
+    conn = ingest.open_history_store(store_path)
+    try:
+        return [(row['URL'], row['First Seen'], row['Last Seen'], row['Runs']) for row in ingest.iter_entry_history(conn, model)]
+    finally:
+        conn.close()
+
+def catalog(store_path, as_of=None, model='m'):
+    conn = ingest.open_history_store(store_path)
+    try:
+        as_of = ingest.parse_time(as_of, end_of_day=True) if as_of else None
+        return [(row['URL'], row['Extracted At']) for row in ingest.iter_catalog(conn, model, as_of)]
+    finally:
+        conn.close()
+
+def test_as_of_returns_exactly_the_latest_export_before_the_date(exports, store_path):
+    exports(JAN, [('u1', 'f1', 't1'), ('u2', 'f2', 't2')])
+    exports(FEB, [('u1', 'f1', 't3')])
+    exports(MAR, [('u1', 'f1', 't4'), ('u2', 'f2', 't5')])
+    assert ingest.ingest_exports([exports.root], store_path) == (3, 5, 0)
+    # A row keeps the 'Extracted At' of the first export of its run
+    assert catalog(store_path, '2025-01-15') == [('u1', 't1'), ('u2', 't2')]
+    # u2 was seen in January and March, but not in the February export
+    assert catalog(store_path, '2025-02-15') == [('u1', 't1')]
+    assert catalog(store_path) == [('u1', 't1'), ('u2', 't5')]
+    assert catalog(store_path, '2024-12-31') == []
+
+def test_exports_ingested_out_of_order(exports, store_path):
+    exports(JAN, [('u1', 'f1', 't1'), ('u2', 'f2', 't2')])
+    exports(MAR, [('u1', 'f1', 't4'), ('u2', 'f2', 't5')])
+    ingest.ingest_exports([exports.root], store_path)
+    assert history(store_path) == [('u1', '2025-01-01T00:00:00Z', '2025-03-01T00:00:00Z', 1),
+                                   ('u2', '2025-01-01T00:00:00Z', '2025-03-01T00:00:00Z', 1)]
+    # A February export found later splits the run of the row it no longer lists
+    exports(FEB, [('u1', 'f1', 't3'), ('u3', 'f3', 't6')])
+    ingest.ingest_exports([exports.root], store_path)
+    assert catalog(store_path, '2025-02-15') == [('u1', 't1'), ('u3', 't6')]
+    # Both halves keep the time of the run that was split
+    assert catalog(store_path) == [('u1', 't1'), ('u2', 't2')]
+    assert history(store_path) == [('u1', '2025-01-01T00:00:00Z', '2025-03-01T00:00:00Z', 1),
+                                   ('u2', '2025-01-01T00:00:00Z', '2025-03-01T00:00:00Z', 2),
+                                   ('u3', '2025-02-01T00:00:00Z', '2025-02-01T00:00:00Z', 1)]
+    # Listed again in February: the two runs of u2 are joined
+    exports(FEB, [('u1', 'f1', 't3'), ('u2', 'f2', 't0')])
+    ingest.ingest_exports([exports.root], store_path)
+    assert catalog(store_path) == [('u1', 't1'), ('u2', 't0')]
+    assert [runs for _, _, _, runs in history(store_path)] == [1, 1]
+
+def test_rerun_skips_unchanged_exports(exports, store_path):
+    exports(JAN, [('u1', 'f1', 't1')])
+    ingest.ingest_exports([exports.root], store_path)
+    assert ingest.ingest_exports([exports.root], store_path) == (0, 0, 1)
+
+def test_reingest_replaces_the_rows_of_a_changed_export(exports, store_path):
+    exports(JAN, [('u1', 'f1', 't1'), ('u2', 'f2', 't2')])
+    ingest.ingest_exports([exports.root], store_path)
+    exports(JAN, [('u1', 'f1', 't1'), ('u3', 'f3', 't3'), ('u3', 'f3', 'again')])
+    assert ingest.ingest_exports([exports.root], store_path)[:2] == (1, 2)
+    assert catalog(store_path) == [('u1', 't1'), ('u3', 't3')]
+    conn = ingest.open_history_store(store_path)
+    try:
+        # u2 is listed by no export any more
+        assert sorted(ingest.iter_store_links(conn)) == ['u1', 'u3']
+    finally:
+        conn.close()
+
+def test_rows_without_extracted_at_use_the_export_time(exports, store_path, write_csv):
+    write_csv(f'{exports.root}/m_Database_01-01-2025_{JAN}.csv', ['URL', 'Filename'], [('u1', 'f1')])
+    ingest.ingest_exports([exports.root], store_path)
+    assert catalog(store_path) == [('u1', '2025-01-01T00:00:00Z')]
+
+def test_seen_lists_first_and_last_export_of_each_entry(exports, store_path, tmp_path):
+    exports(JAN, [('u1', 'f1', 't1'), ('u2', 'f2', 't2')])
+    exports(FEB, [('u1', 'f1', 't3')])
+    output = str(tmp_path / 'seen.csv')
+    ingest.main(['--dir', exports.root, '--store', store_path, '--model', 'm', '--seen', '--output', output])
+    with open(output, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert [(r['URL'], r['First Seen'], r['Last Seen'], r['Runs']) for r in rows] == [
+        ('u1', '2025-01-01T00:00:00Z', '2025-02-01T00:00:00Z', '1'),
+        ('u2', '2025-01-01T00:00:00Z', '2025-01-01T00:00:00Z', '1')]
+
+def test_parse_time():
+    assert ingest.parse_time('2025-07-20') == '2025-07-20T00:00:00Z'
+    assert ingest.parse_time('2025-07-20', end_of_day=True) == '2025-07-20T23:59:59Z'
+    assert ingest.parse_time('2025-07-20T10:11:12.345Z') == '2025-07-20T10:11:12Z'
+    assert ingest.parse_time('not a date') is None
@@ -0,0 +1,69 @@
+import random
+
+from recurdump.core import links
+from recurdump.core.links import LinkStore, parse_link, split_link
+
+def video(model, video_id, suffix=''):
+    return f'https://recu.me/{model}/video/{video_id}{suffix}'
+
+def random_links(rng, count, ids):
+    result = [video(f'm{rng.randrange(3)}', rng.randrange(1, ids), rng.choice(['', '/play'])) for _ in range(count)]
+    return result + [f'https://example.com/{rng.randrange(5)}' for _ in range(3)]
+
+def test_split_link():
+    assert split_link(video('m', 42, '/play')) == ('https://recu.me/m/video/', 42, '/play')
+    assert split_link(video('m', 42)) == ('https://recu.me/m/video/', 42, '')
+    # IDs must round-trip, and only a short word may follow
+    assert split_link(video('m', '042')) is None
+    assert split_link(video('m', 42, '/play/2')) is None
+    assert split_link('https://recu.me/m/photos/42') is None
+    assert str(parse_link(video('m', 7, '/play'))) == video('m', 7, '/play')
+
+def test_store_keeps_links_once():
+    store = LinkStore([video('m', 2), video('m', 1), video('m', 2), 'plain text', 'plain text'])
+    assert len(store) == 3
+    assert video('m', 1) in store and 'plain text' in store
+    assert video('m', 3) not in store and video('n', 1) not in store
+    assert store.sorted_links() == sorted([video('m', 1), video('m', 2), 'plain text'])
+
+def test_set_operations_match_python_sets():
+    rng = random.Random(1)
+    for _ in range(200):
+        ids = rng.choice([20, 500])
+        a = random_links(rng, rng.choice([0, 3, 200]), ids)
+        b = random_links(rng, rng.choice([0, 2, 200]), ids)
+        store_a, store_b = LinkStore(a), LinkStore(b)
+        assert set(store_a | store_b) == set(a) | set(b)
+        assert set(store_a - store_b) == set(a) - set(b)
+        assert set(store_b - store_a) == set(b) - set(a)
+        assert set(store_a & store_b) == set(a) & set(b)
+        assert len(store_a - store_b) == len(set(a) - set(b))
+        # Operands are plain iterables too
+        assert set(store_a - b) == set(a) - set(b)
+
+def test_sparse_and_dense_columns():
+    # Both the bisect lookups and the linear walks over both columns are used
+    big = LinkStore(video('m', i) for i in range(2, 4002, 2))
+    small = LinkStore(video('m', i) for i in (2, 3, 10, 4000, 5000))
+    dense = LinkStore(video('m', i) for i in range(3, 4002, 3))
+    assert sorted(parse_link(l).video_id for l in big & small) == [2, 10, 4000]
+    assert sorted(parse_link(l).video_id for l in small - big) == [3, 5000]
+    assert len(big - small) == 2000 - 3
+    assert len(big & dense) == len(range(6, 4002, 6))
+    assert len(big - dense) == 2000 - len(range(6, 4002, 6))
+
+def test_flush_merges_pending_ids_into_sorted_columns(monkeypatch):
+    monkeypatch.setattr(links, 'FLUSH_MIN', 4)
+    store = LinkStore()
+    for video_id in [9, 3, 7, 3, 1, 8, 2, 9, 5, 4, 6, 10]:
+        store.add(video('m', video_id))
+    store.update([video('m', 5), video('m', 11)])
+    assert len(store) == 11
+    for column in store._columns.values():
+        assert list(column) == sorted(set(column))
+
+def test_dumps_loads_round_trip():
+    store = LinkStore([video('m', 1), video('m', 2, '/play'), video('n', 5), 'other'])
+    loaded = LinkStore.loads(store.dumps())
+    assert set(loaded) == set(store)
+    assert len(loaded) == 4
@@ -0,0 +1,73 @@
+import os
+
+from recurdump.core import merge
+from recurdump.core.merge import LinkIndex, link_hash
+
+def read_lines(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read().splitlines()
+
+def test_append_adds_only_new_links(tmp_path, write_csv):
+    txt_path = str(tmp_path / 'links.txt')
+    first = write_csv(tmp_path / 'a.csv', ['reurb_link'], [('l2',), ('l1',), ('l2',)])
+    second = write_csv(tmp_path / 'b.csv', ['reurb_link'], [('l3',), ('l1',)])
+    merge.append_csv_links_to_txt(first, txt_path)
+    merge.append_csv_links_to_txt(second, txt_path)
+    assert read_lines(txt_path) == ['l1', 'l2', 'l3']
+    index = LinkIndex(txt_path + '.idx')
+    try:
+        assert index.count == 3
+        assert index.covered_size == os.path.getsize(txt_path)
+        assert all(link_hash(link) in index for link in ('l1', 'l2', 'l3'))
+        assert link_hash('l4') not in index
+    finally:
+        index.close()
+
+def test_index_catches_up_on_lines_appended_by_others(tmp_path):
+    txt_path = tmp_path / 'links.txt'
+    txt_path.write_text('l1\nl2\n')
+    merge.sync_link_index(str(txt_path)).close()
+    with open(txt_path, 'a') as f:
+        f.write('l3\n')
+    index = merge.sync_link_index(str(txt_path))
+    try:
+        assert index.count == 3 and link_hash('l3') in index
+    finally:
+        index.close()
+
+def test_index_is_rebuilt_when_the_file_is_rewritten(tmp_path):
+    txt_path = tmp_path / 'links.txt'
+    txt_path.write_text('l1\nl2\n')
+    merge.sync_link_index(str(txt_path)).close()
+    # Same size, other content: the anchor digest no longer matches
+    txt_path.write_text('l8\nl9\n')
+    index = merge.sync_link_index(str(txt_path))
+    try:
+        assert index.count == 2
+        assert link_hash('l8') in index and link_hash('l1') not in index
+    finally:
+        index.close()
+
+def test_index_grows_past_its_capacity(tmp_path):
+    index = LinkIndex.create(str(tmp_path / 'links.idx'))
+    capacity = index.capacity
+    try:
+        for n in range(capacity):
+            index.reserve(1)
+            index.add(link_hash(f'l{n}'))
+        assert index.capacity > capacity
+        assert index.count == capacity
+        assert all(link_hash(f'l{n}') in index for n in range(0, capacity, 97))
+    finally:
+        index.close()
+
+def test_compact_sorts_deduplicates_and_reindexes(tmp_path):
+    txt_path = tmp_path / 'links.txt'
+    txt_path.write_text('l2\nl1\nl2\n\nl3\n')
+    merge.compact_txt(str(txt_path))
+    assert read_lines(txt_path) == ['l1', 'l2', 'l3']
+    index = LinkIndex(str(txt_path) + '.idx')
+    try:
+        assert index.count == 3
+    finally:
+        index.close()
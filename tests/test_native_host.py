@@ -0,0 +1,57 @@
+import io
+
+from recurdump.core import ingest, native_host
+
+def exchange(store_path, messages):
+    # Replies of a host served the given messages (bytes: a raw frame) over in-memory streams
+    instream = io.BytesIO()
+    for message in messages:
+        if isinstance(message, bytes):
+            instream.write(native_host.MESSAGE_HEADER.pack(len(message)) + message)
+        else:
+            native_host.write_message(instream, message)
+    instream.seek(0)
+    outstream = io.BytesIO()
+    assert native_host.serve(instream, outstream, store_path) == len(messages)
+    outstream.seek(0)
+    replies = []
+    while (reply := native_host.read_message(outstream)) is not None:
+        replies.append(reply)
+    return replies
+
+def records(message_id, *rows, **fields):
+    return {'type': 'records', 'id': message_id, 'session': 's1', 'model': 'm', **fields,
+            'records': [dict(zip(('url', 'filename', 'extractedAt'), row)) for row in rows]}
+
+def test_session_is_stored_with_record_times(tmp_path):
+    store_path = str(tmp_path / 'history.sqlite')
+    replies = exchange(store_path, [
+        {'type': 'hello'},
+        records(1, ('u1', 'f1', '2025-05-01T00:00:05.123Z'), ('u2', 'f2'), startedAt='2025-05-01T00:00:00.000Z'),
+        records(2, ('u1', 'f1', '2025-05-01T00:09:00.000Z'), ('u3', 'f3', '2025-05-01T00:01:00.000Z')),
+        {'type': 'bogus', 'id': 3},
+        {'type': 'end', 'id': 4, 'session': 's1'},
+    ])
+    assert replies[0]['type'] == 'hello' and replies[0]['store'] == store_path
+    assert [(r['type'], r.get('stored'), r.get('total')) for r in replies[1:]] == [
+        ('ack', 2, 2), ('ack', 2, 3), ('error', None, None), ('ack', 0, 3)]
+    conn = ingest.open_history_store(store_path)
+    try:
+        rows = [(row['URL'], row['Extracted At']) for row in ingest.iter_catalog(conn, 'm')]
+    finally:
+        conn.close()
+    # A record keeps its first extractedAt; one without falls back to the session start
+    assert rows == [('u1', '2025-05-01T00:00:05.123Z'), ('u2', '2025-05-01T00:00:00Z'), ('u3', '2025-05-01T00:01:00.000Z')]
+
+def test_message_framing_round_trip():
+    stream = io.BytesIO()
+    native_host.write_message(stream, {'type': 'hello', 'text': 'é'})
+    stream.seek(0)
+    assert native_host.read_message(stream) == {'type': 'hello', 'text': 'é'}
+    assert native_host.read_message(stream) is None
+
+def test_malformed_message_is_answered_and_skipped(tmp_path):
+    store_path = str(tmp_path / 'history.sqlite')
+    replies = exchange(store_path, [b'{"type": "rec', b'\xff\xfe', records(1, ('u1', 'f1'))])
+    assert [(r['type'], r['id']) for r in replies] == [('error', None), ('error', None), ('ack', 1)]
+    assert replies[0]['message'].startswith('Malformed message')
@@ -0,0 +1,116 @@
+import csv
+import os
+
+from recurdump.core import sync
+from recurdump.core.matching import FilenameMatcher, MatchOptions
+from recurdump.utils.walker import WalkOptions
+
+HEADER = ['URL', 'Filename', 'Extracted At']
+
+def row(n, filename=None):
+    return {'URL': f'https://recu.me/m/video/{n}', 'Filename': filename or f'm_{n}.mp4', 'Extracted At': f'2025-01-{n:02d}'}
+
+def read_rows(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+def test_filter_missing_files_streams_rows():
+    consumed = []
+
+    def rows():
+        for n in range(1, 1001):
+            consumed.append(n)
+            yield row(n)
+
+    missing = sync.filter_missing_files(rows(), {'m_1.mp4', 'm_2.mp4'})
+    assert next(missing)['Filename'] == 'm_3.mp4'
+    # Only the rows up to the first missing one have been read
+    assert consumed == [1, 2, 3]
+    assert sum(1 for _ in missing) == 997
+
+def test_filter_missing_files_drops_duplicate_rows():
+    rows = [row(1), row(2), row(1), dict(row(2), **{'Extracted At': 'later'})]
+    missing = list(sync.filter_missing_files(rows, set()))
+    assert missing == [row(1), row(2), dict(row(2), **{'Extracted At': 'later'})]
+
+def test_sort_rows_spills_runs_and_merges_them(tmp_path, monkeypatch):
+    spilled = []
+    spill = sync._spill_sorted_run
+    monkeypatch.setattr(sync, '_spill_sorted_run', lambda *args: spilled.append(args[-1]) or spill(*args))
+    rows = [row(n, f'f{(n * 7) % 23:02d}.mp4') for n in range(1, 24)]
+    expected = sorted(r['Filename'] for r in rows)
+    result = [r['Filename'] for r in sync.sort_rows(iter(rows), 'Filename', False, HEADER, chunk_rows=5)]
+    assert result == expected
+    assert spilled == [0, 1, 2, 3, 4]
+    descending = [r['Filename'] for r in sync.sort_rows(iter(rows), 'Filename', True, HEADER, chunk_rows=5)]
+    assert descending == expected[::-1]
+
+def test_sort_rows_in_memory_when_one_chunk(monkeypatch):
+    monkeypatch.setattr(sync, '_spill_sorted_run', None)
+    rows = [row(3), row(1), row(2)]
+    assert [r['URL'] for r in sync.sort_rows(iter(rows), 'URL', False, HEADER)] == sorted(r['URL'] for r in rows)
+
+def test_sync_database_exact(tmp_path, write_csv):
+    library = tmp_path / 'library'
+    library.mkdir()
+    for name in ('m_1.mp4', 'm_3.mp4'):
+        (library / name).touch()
+    db_path = write_csv(tmp_path / 'm_Database_01-01-2025.csv', HEADER,
+                        [(r['URL'], r['Filename'], r['Extracted At']) for r in map(row, (4, 1, 2, 3))])
+    output = str(tmp_path / 'missing.csv')
+    assert sync.sync_database(db_path, str(library), output, sort_col='URL') == output
+    assert [r['Filename'] for r in read_rows(output)] == ['m_2.mp4', 'm_4.mp4']
+    (library / 'm_2.mp4').touch()
+    (library / 'm_4.mp4').touch()
+    assert sync.sync_database(db_path, str(library), str(tmp_path / 'none.csv')) is None
+
+def test_sync_database_recursive_walk(tmp_path, write_csv):
+    library = tmp_path / 'library'
+    (library / '2025' / 'skip').mkdir(parents=True)
+    (library / '2025' / 'm_1.mp4').touch()
+    (library / '2025' / 'skip' / 'm_2.mp4').touch()
+    db_path = write_csv(tmp_path / 'm_Database_01-01-2025.csv', HEADER,
+                        [(r['URL'], r['Filename'], r['Extracted At']) for r in map(row, (1, 2))])
+    output = str(tmp_path / 'missing.csv')
+    sync.sync_database(db_path, str(library), output, walk=WalkOptions(exclude=('skip',)))
+    assert [r['Filename'] for r in read_rows(output)] == ['m_2.mp4']
+
+def test_normalized_matching_ignores_case_and_equivalent_extensions():
+    matcher = FilenameMatcher(['Bob_2025-02-01_11-30.MP4'], MatchOptions('normalized'))
+    found = matcher.match('bob_2025-02-01_11-30.ts')
+    assert (found.filename, found.kind, found.score) == ('Bob_2025-02-01_11-30.MP4', 'normalized', 1.0)
+    assert matcher.match('bob_2025-02-01_11-30.txt') is None
+    assert matcher.match('bob_2025-02-01_11-30 (1).mp4') is None
+
+def test_fuzzy_matching_keeps_the_numbers():
+    library = ['alice_2025-01-01_10-00 (1).mp4', 'alice_2025-01-01_10-05.mp4']
+    matcher = FilenameMatcher(library, MatchOptions('fuzzy'))
+    found = matcher.match('alice_2025-01-01_10-00.mp4')
+    assert found.filename == 'alice_2025-01-01_10-00 (1).mp4'
+    assert found.kind == 'fuzzy' and found.score >= 0.8
+    # Similar name, but another recording time: a different video
+    assert matcher.match('alice_2025-01-01_10-07.mp4') is None
+
+def test_fuzzy_matching_short_stems():
+    # Stems below three characters have no trigrams to compare
+    matcher = FilenameMatcher(['1a.mp4', '1.MP4'], MatchOptions('fuzzy'))
+    assert matcher.match('1.mp4').filename == '1.MP4'
+    assert matcher.match('12.mp4') is None
+    assert FilenameMatcher(['1a.mp4'], MatchOptions('fuzzy')).match('1.mp4') is None
+
+def test_sync_database_fuzzy_writes_match_report(tmp_path, write_csv):
+    library = tmp_path / 'library'
+    library.mkdir()
+    (library / 'm_2025-01-01_10-00_remux.mp4').touch()
+    db_path = write_csv(tmp_path / 'm_Database_01-01-2025.csv', HEADER, [
+        ('https://recu.me/m/video/1', 'm_2025-01-01_10-00.mp4', '2025-01-01'),
+        ('https://recu.me/m/video/2', 'm_2025-01-01_12-00.mp4', '2025-01-01'),
+    ])
+    output = str(tmp_path / 'missing.csv')
+    sync.sync_database(db_path, str(library), output, match=MatchOptions('fuzzy'))
+    assert [r['Filename'] for r in read_rows(output)] == ['m_2025-01-01_12-00.mp4']
+    reports = [name for name in os.listdir(tmp_path) if '_matched-files_' in name]
+    assert len(reports) == 1
+    report = read_rows(tmp_path / reports[0])
+    assert [(r['Filename'], r['Matched File'], r['Match']) for r in report] == [
+        ('m_2025-01-01_10-00.mp4', 'm_2025-01-01_10-00_remux.mp4', 'fuzzy')]